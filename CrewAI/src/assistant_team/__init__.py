@@ -12,18 +12,65 @@ __version__ = "0.4.0"
 __author__ = "Assistant Team Developer"
 __email__ = "developer@assistantteam.com"
 
-from .main import (
-    kickoff,
-    kickoff_with_calendar_state,
-    plot,
-    CalendarState,
-    CalendarFlow
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+# Exports are resolved on first attribute access so that importing the
+# package (or a light submodule such as utils) does not pull in CrewAI.
+_LAZY_EXPORTS = {
+    "kickoff": ".main",
+    "kickoff_with_calendar_state": ".main",
+    "stream_with_calendar_state": ".main",
+    "kickoff_for_user": ".main",
+    "kickoff_many": ".main",
+    "get_batch_stats": ".main",
+    "plot": ".main",
+    "CalendarFlow": ".main",
+    "CalendarState": ".state",
+    "BatchItemResult": ".state",
+    "BatchStats": ".state",
+    "get_metrics": ".metrics",
+}
+
+if TYPE_CHECKING:
+    from .main import (
+        kickoff,
+        kickoff_with_calendar_state,
+        stream_with_calendar_state,
+        kickoff_for_user,
+        kickoff_many,
+        get_batch_stats,
+        plot,
+        CalendarFlow,
+    )
+    from .state import CalendarState, BatchItemResult, BatchStats
+    from .metrics import get_metrics
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "kickoff",
     "kickoff_with_calendar_state", 
+    "stream_with_calendar_state",
+    "kickoff_for_user",
+    "kickoff_many",
+    "get_batch_stats",
     "plot",
     "CalendarState",
     "CalendarFlow",
+    "BatchItemResult",
+    "BatchStats",
+    "get_metrics",
 ]
@@ -0,0 +1,11 @@
+"""
+Command-line entry point: ``python -m assistant_team serve``.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+from .server import main
+
+if __name__ == "__main__":
+    main()
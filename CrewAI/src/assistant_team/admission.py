@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+"""
+Admission control and load shedding for crew calls.
+
+During a burst every message used to queue for a crew without limit, so
+latency grew until the upstream webhook timed out and the retries made the
+overload worse. ``AdmissionController`` bounds the number of crew calls in
+flight and the number waiting for one. Waiting requests are served in
+priority order, interactive messages ahead of bulk imports, and anything
+beyond the limits is rejected at once with OverloadedError:
+
+- queue_full: the queue was full of requests of the same or higher priority
+- displaced: a queued request made room for a higher-priority arrival
+- timeout: the request waited longer than the maximum queue wait
+
+Answers that need no LLM (fast path, response cache) are never queued.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from .log import get_logger
+from .metrics import get_metrics
+
+logger = get_logger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+# Highest priority first
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BULK)
+
+SHED_QUEUE_FULL = "queue_full"
+SHED_DISPLACED = "displaced"
+SHED_TIMEOUT = "timeout"
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_MAX_QUEUE = 64
+# Seconds a request may wait for a slot; stays well below typical webhook timeouts
+DEFAULT_MAX_QUEUE_WAIT = 10.0
+
+_queue_wait = get_metrics().timer(
+    "calendar_admission_queue_wait_seconds", "Time admitted requests waited for a crew call slot"
+)
+_shed = get_metrics().counter("calendar_admission_shed_total", "Requests rejected by admission control")
+
+
+class OverloadedError(RuntimeError):
+    """
+    A request was shed by admission control; retrying later may succeed.
+
+    Attributes:
+        reason: "queue_full", "displaced" or "timeout"
+    """
+
+    def __init__(self, message: str, reason: str = "") -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    priority: str = field(compare=False)
+    future: "asyncio.Future[None]" = field(compare=False)
+
+
+@dataclass
+class AdmissionStats:
+    """
+    Counters of an AdmissionController.
+
+    Attributes:
+        admitted: Requests that got a slot
+        shed: Requests rejected, by reason
+        in_flight: Slots currently held
+        queued: Requests currently waiting
+    """
+    admitted: int = 0
+    shed: Dict[str, int] = field(default_factory=dict)
+    in_flight: int = 0
+    queued: int = 0
+
+
+class AdmissionController:
+    """
+    Bounded, prioritized gate in front of crew calls.
+
+    Must be used from coroutines of one event loop.
+
+    Example:
+        >>> admission = AdmissionController(max_in_flight=8, max_queue=32)
+        >>> async with admission.admit(PRIORITY_BULK):
+        ...     result = await pool.kickoff_async(inputs)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_queue_wait: float = DEFAULT_MAX_QUEUE_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_in_flight: Requests admitted at the same time
+            max_queue: Requests waiting for a slot; 0 rejects as soon as all slots are taken
+            max_queue_wait: Seconds a request may wait before it is shed, 0 for no limit
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If max_in_flight is smaller than 1 or a limit is negative
+        """
+        if max_in_flight < 1 or max_queue < 0 or max_queue_wait < 0:
+            raise ValueError("max_in_flight must be at least 1 and the queue limits not negative")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self._clock = clock
+        self._in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._stats = AdmissionStats()
+
+    def stats(self) -> AdmissionStats:
+        """Return a snapshot of the counters."""
+        return AdmissionStats(self._stats.admitted, dict(self._stats.shed), self._in_flight, len(self._waiters))
+
+    @asynccontextmanager
+    async def admit(self, priority: str = PRIORITY_INTERACTIVE) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Args:
+            priority: "interactive" or "bulk"
+
+        Raises:
+            OverloadedError: If the request is shed
+            ValueError: If priority is unknown
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """
+        Wait for a slot; call release() when done with it.
+
+        Args:
+            priority: "interactive" or "bulk"
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            OverloadedError: If the request is shed
+            ValueError: If priority is unknown
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority!r}")
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self._admitted(priority, 0.0)
+            return 0.0
+
+        rank = PRIORITIES.index(priority)
+        if len(self._waiters) >= self.max_queue:
+            victim = max(self._waiters) if self._waiters else None
+            if victim is None or victim.rank <= rank:
+                raise self._reject(priority, SHED_QUEUE_FULL)
+            self._remove(victim)
+            victim.future.set_exception(self._reject(victim.priority, SHED_DISPLACED))
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(rank, next(self._seq), priority, loop.create_future())
+        heapq.heappush(self._waiters, waiter)
+        timer = loop.call_later(self.max_queue_wait, self._expire, waiter) if self.max_queue_wait else None
+        started = self._clock()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # Granted just before the cancellation arrived: hand the slot on
+                self.release()
+            else:
+                self._remove(waiter)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        waited = self._clock() - started
+        self._admitted(priority, waited)
+        return waited
+
+    def release(self) -> None:
+        """Give a slot back and admit the next waiting request."""
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.max_in_flight:
+            waiter = heapq.heappop(self._waiters)
+            if not waiter.future.done():
+                self._in_flight += 1
+                waiter.future.set_result(None)
+
+    def _admitted(self, priority: str, waited: float) -> None:
+        self._stats.admitted += 1
+        _queue_wait.observe(waited, priority=priority)
+
+    def _reject(self, priority: str, reason: str) -> OverloadedError:
+        self._stats.shed[reason] = self._stats.shed.get(reason, 0) + 1
+        _shed.inc(priority=priority, reason=reason)
+        logger.warning("🚦 Shedding %s request (%s): %d in flight, %d queued",
+                       priority, reason, self._in_flight, len(self._waiters))
+        return OverloadedError(f"Calendar assistant overloaded ({reason}), retry later", reason)
+
+    def _expire(self, waiter: _Waiter) -> None:
+        if not waiter.future.done():
+            self._remove(waiter)
+            waiter.future.set_exception(self._reject(waiter.priority, SHED_TIMEOUT))
+
+    def _remove(self, waiter: _Waiter) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+
+_default_controller: Optional[AdmissionController] = None
+_default_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """
+    Get the process-wide admission controller, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_ADMISSION: "on" (default) or "off"
+        CALENDAR_MAX_IN_FLIGHT: Crew calls running at the same time (default 16)
+        CALENDAR_MAX_QUEUE: Requests waiting for a crew call (default 64)
+        CALENDAR_MAX_QUEUE_WAIT: Seconds a request may wait, 0 for no limit (default 10)
+
+    Returns:
+        Optional[AdmissionController]: The shared controller, or None when disabled
+    """
+    global _default_controller
+    if os.getenv("CALENDAR_ADMISSION", "on").strip().lower() in ("off", "0", "false", "no"):
+        return None
+
+    if _default_controller is None:
+        with _default_controller_lock:
+            if _default_controller is None:
+                _default_controller = AdmissionController(
+                    max_in_flight=int(os.getenv("CALENDAR_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+                    max_queue=int(os.getenv("CALENDAR_MAX_QUEUE", DEFAULT_MAX_QUEUE)),
+                    max_queue_wait=float(os.getenv("CALENDAR_MAX_QUEUE_WAIT", DEFAULT_MAX_QUEUE_WAIT)),
+                )
+    return _default_controller
+
+
+def set_admission_controller(controller: Optional[AdmissionController]) -> None:
+    """
+    Replace the process-wide admission controller.
+
+    Passing None makes the next get_admission_controller() call build a
+    default controller again.
+
+    Args:
+        controller: Controller to install, or None to reset
+    """
+    global _default_controller
+    with _default_controller_lock:
+        _default_controller = controller
@@ -0,0 +1,13 @@
+"""
+Benchmarks module for the Assistant Team calendar management system.
+
+Each submodule is a standalone benchmark that can be run with
+``python -m assistant_team.benchmarks.<name>``.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+from .timing import measure, format_result
+
+__all__ = ["measure", "format_result"]
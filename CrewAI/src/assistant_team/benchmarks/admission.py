@@ -0,0 +1,97 @@
+"""
+Benchmark: a burst above crew capacity with and without admission control.
+
+Offers interactive and bulk messages at a fixed rate higher than the
+replay-backed crews can serve, and reports per priority how many were
+answered, their latency, how many were answered after the webhook timeout,
+and for shed requests how quickly they were rejected. Without admission
+control every request queues for a crew and latency grows for the whole
+burst; with it, interactive messages go first and the excess is rejected
+within the queue wait limit.
+
+Usage:
+    python -m assistant_team.benchmarks.admission [--rate N] [--duration SECONDS]
+        [--latency SECONDS] [--slots N] [--max-queue N] [--max-wait SECONDS]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+from ..admission import PRIORITIES, PRIORITY_BULK, PRIORITY_INTERACTIVE, AdmissionController, \
+    OverloadedError, set_admission_controller
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_with_calendar_state
+from .replay_load import replay_crews, synthetic_records
+from .timing import _percentile
+
+
+async def burst(rate: float, duration: float, interactive_share: float) -> Dict[str, Dict[str, List[float]]]:
+    """Offer `rate` messages per second for `duration` seconds; every 1/interactive_share-th is interactive."""
+    outcomes: Dict[str, Dict[str, List[float]]] = {p: {"served": [], "shed": []} for p in PRIORITIES}
+    every = max(1, round(1 / interactive_share)) if interactive_share else 0
+
+    async def deliver(i: int) -> None:
+        await asyncio.sleep(i / rate)
+        priority = PRIORITY_INTERACTIVE if every and i % every == 0 else PRIORITY_BULK
+        state = CalendarState(user_input=f"gym on 4/3 at 18:00 #{i}", priority=priority)
+        started = time.perf_counter()
+        try:
+            await kickoff_with_calendar_state(state)
+            outcomes[priority]["served"].append(time.perf_counter() - started)
+        except OverloadedError:
+            outcomes[priority]["shed"].append(time.perf_counter() - started)
+
+    await asyncio.gather(*(deliver(i) for i in range(int(rate * duration))))
+    return outcomes
+
+
+def _summary(samples: Dict[str, List[float]], timeout: float) -> str:
+    served, shed = sorted(samples["served"]), sorted(samples["shed"])
+    text = f"served={len(served):>3}"
+    if served:
+        late = sum(1 for seconds in served if seconds > timeout)
+        text += (f" p50={_percentile(served, 50) * 1000:6.0f}ms p99={_percentile(served, 99) * 1000:6.0f}ms"
+                 f" late={late:>3}")
+    text += f"  shed={len(shed):>3}"
+    if shed:
+        text += f" rejected in p99={_percentile(shed, 99) * 1000:6.0f}ms"
+    return text
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=20.0, help="Messages offered per second")
+    parser.add_argument("--duration", type=float, default=4.0, help="Seconds the burst lasts")
+    parser.add_argument("--interactive-share", type=float, default=0.25)
+    parser.add_argument("--latency", type=float, default=0.5, help="Injected seconds per LLM call")
+    parser.add_argument("--slots", type=int, default=4, help="Crews, and crew calls admitted at once")
+    parser.add_argument("--max-queue", type=int, default=8)
+    parser.add_argument("--max-wait", type=float, default=2.0, help="Seconds a request may wait for a crew")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Webhook timeout counted as late")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    capacity = args.slots / args.latency
+    print(f"{args.rate:.0f} msg/s for {args.duration:.0f}s against ~{capacity:.0f} msg/s of crew capacity, "
+          f"{args.interactive_share:.0%} interactive:")
+    for enabled in (False, True):
+        os.environ["CALENDAR_ADMISSION"] = "on" if enabled else "off"
+        set_admission_controller(
+            AdmissionController(args.slots, args.max_queue, args.max_wait) if enabled else None
+        )
+        with replay_crews(synthetic_records(), pool_size=args.slots, latency=args.latency):
+            outcomes = asyncio.run(burst(args.rate, args.duration, args.interactive_share))
+        print("  admission control" if enabled else "  unbounded queue")
+        for priority in PRIORITIES:
+            print(f"    {priority:<11} {_summary(outcomes[priority], args.timeout)}")
+
+
+if __name__ == "__main__":
+    main()
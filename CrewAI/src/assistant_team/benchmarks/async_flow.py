@@ -0,0 +1,102 @@
+"""
+Benchmark: concurrent flows must not block each other on the event loop.
+
+Runs N ``kickoff_with_calendar_state`` calls concurrently against stub crews
+that sleep for a fixed LLM latency, and checks that the batch finishes in
+roughly one call's latency rather than N times it.
+
+Usage:
+    python -m assistant_team.benchmarks.async_flow [--concurrency N] [--latency SECONDS]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+# The stub crew must be reached on every call
+os.environ["CALENDAR_FAST_PATH"] = "0"
+os.environ["CALENDAR_CACHE"] = "off"
+os.environ["CALENDAR_SINGLE_FLIGHT"] = "off"
+os.environ["CALENDAR_ADMISSION"] = "off"
+
+from ..crews.calendar_crew.crew_pool import CalendarCrewPool, get_crew_pool, set_crew_pool
+from ..main import CalendarState, kickoff_with_calendar_state
+
+_STUB_EVENT = {
+    "summary": "Stub event",
+    "start": {"dateTime": "2025-03-04T18:00:00+02:00", "timeZone": "Asia/Jerusalem"},
+    "end": {"dateTime": "2025-03-04T19:00:00+02:00", "timeZone": "Asia/Jerusalem"},
+    "location": "",
+    "description": "",
+}
+
+
+class SleepingCrew:
+    """Stand-in crew whose kickoff blocks like a real LLM round trip."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.tasks: list = []
+        self.agents: list = []
+
+    def kickoff(self, inputs: Dict[str, Any]) -> Any:
+        time.sleep(self.latency)
+        return SimpleNamespace(raw=json.dumps([_STUB_EVENT]))
+
+
+async def run(concurrency: int = 8, latency: float = 0.5) -> Dict[str, float]:
+    """
+    Time one flow and then `concurrency` flows started together.
+
+    Args:
+        concurrency: Number of concurrent flows
+        latency: Simulated LLM latency in seconds
+
+    Returns:
+        Dict with single and concurrent wall times and their ratio
+    """
+    previous = get_crew_pool()
+    pool = CalendarCrewPool(size=concurrency, factory=lambda: SleepingCrew(latency))
+    pool.warm_up()
+    set_crew_pool(pool)
+    try:
+        started = time.perf_counter()
+        await kickoff_with_calendar_state(CalendarState(user_input="warm-up request"))
+        single = time.perf_counter() - started
+
+        states = [CalendarState(user_input=f"request {i}") for i in range(concurrency)]
+        started = time.perf_counter()
+        await asyncio.gather(*(kickoff_with_calendar_state(state) for state in states))
+        concurrent = time.perf_counter() - started
+    finally:
+        set_crew_pool(previous)
+        pool.shutdown()
+
+    return {"single_s": single, "concurrent_s": concurrent, "ratio": concurrent / single}
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="Fail if N concurrent calls take more than this many single-call latencies")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.concurrency, args.latency))
+    print(f"1 flow: {result['single_s']:.3f}s, {args.concurrency} concurrent flows: "
+          f"{result['concurrent_s']:.3f}s ({result['ratio']:.2f}x one call)")
+    sys.exit(0 if result["ratio"] <= args.max_ratio else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: a small/large model cascade against the large model alone.
+
+Two replay backends stand in for the models: a fast small model whose
+answers are sometimes unusable (no JSON, an event without an end time, or
+no event for a message with a time in it) and a slow large model that
+always answers correctly. The same flows are run with only the large model
+and with the cascade, reporting per tier how many requests reached it, its
+hit rate and mean latency, and the latency of the whole flow.
+
+Usage:
+    python -m assistant_team.benchmarks.cascade [--flows N] [--concurrency N]
+        [--small-latency SECONDS] [--large-latency SECONDS] [--bad-share FRACTION]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from crewai import BaseLLM
+
+from ..cascade import ModelCascade, TierStats, set_model_cascade
+from ..crews.calendar_crew.calendar_crew import CalendarCrew
+from ..crews.calendar_crew.crew_pool import CalendarCrewPool, get_crew_pool, set_crew_pool
+from ..crews.calendar_crew.llm_backend import ON_MISS_CYCLE, ReplayLLM
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_many
+from .replay_load import _SYNTHETIC_EVENTS, synthetic_records
+from .timing import _percentile
+
+SMALL, LARGE = "small-model", "large-model"
+
+# Unusable answers of the small model, one per escalation reason
+_BAD_ANSWERS = [
+    "I could not find enough details to create an event.",
+    json.dumps([{key: value for key, value in _SYNTHETIC_EVENTS[0].items() if key != "end"}]),
+    "[]",
+]
+
+
+def small_model_records(bad_share: float, records: int = 20) -> List[Dict[str, Any]]:
+    """Return replay records of which `bad_share` are unusable, spread evenly."""
+    bad = round(bad_share * records)
+    answers = []
+    for i in range(records):
+        if bad and i * bad // records != (i + 1) * bad // records:
+            answers.append(_BAD_ANSWERS[len(answers) % len(_BAD_ANSWERS)])
+        else:
+            answers.append(None)
+    return [synthetic_records(answer)[0] for answer in answers]
+
+
+def _crew_factory(llm: BaseLLM) -> Callable[[], Any]:
+    return lambda: CalendarCrew(llm=llm).crew()
+
+
+@contextlib.contextmanager
+def tier_pools(backends: Dict[Optional[str], BaseLLM], pool_size: int) -> Iterator[None]:
+    """Install a warm crew pool per model (None for the default pool) for the duration of the block."""
+    previous = get_crew_pool()
+    pools = {model: CalendarCrewPool(size=pool_size, factory=_crew_factory(llm)) for model, llm in backends.items()}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for model, pool in pools.items():
+                pool.warm_up()
+                set_crew_pool(pool, model)
+            yield
+    finally:
+        for model, pool in pools.items():
+            set_crew_pool(previous if model is None else None, model)
+            pool.shutdown()
+
+
+def run(cascade: Optional[ModelCascade], flows: int, concurrency: int, small: BaseLLM, large: BaseLLM) -> List[float]:
+    """Run `flows` flows, `concurrency` at a time, and return their durations in seconds."""
+    set_model_cascade(cascade)
+    backends: Dict[Optional[str], BaseLLM] = {SMALL: small, LARGE: large} if cascade else {None: large}
+    try:
+        with tier_pools(backends, pool_size=concurrency), contextlib.redirect_stdout(io.StringIO()):
+            states = [CalendarState(user_input=f"gym on 4/3 at 18:00 #{i}") for i in range(flows)]
+            results = asyncio.run(kickoff_many(states, max_concurrency=concurrency))
+    finally:
+        set_model_cascade(None)
+    failed = sum(1 for result in results if not result.ok)
+    if failed:
+        print(f"  {failed} flow(s) failed")
+    return sorted(result.duration_seconds for result in results if result.ok)
+
+
+def _latency(durations: List[float]) -> str:
+    return (f"mean={statistics.fmean(durations) * 1000:6.0f}ms p50={_percentile(durations, 50) * 1000:6.0f}ms "
+            f"p99={_percentile(durations, 99) * 1000:6.0f}ms")
+
+
+def _tier(stats: TierStats) -> str:
+    escalated = ", ".join(f"{reason}={count}" for reason, count in sorted(stats.escalated.items())) or "none"
+    return (f"{stats.model:<12} calls={stats.calls:>4} hit rate={stats.hit_rate:6.1%} "
+            f"mean={stats.mean_seconds * 1000:6.0f}ms escalated: {escalated}")
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--flows", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8, help="Flows and crews per model running at once")
+    parser.add_argument("--small-latency", type=float, default=0.15, help="Seconds per small model call")
+    parser.add_argument("--large-latency", type=float, default=0.8, help="Seconds per large model call")
+    parser.add_argument("--bad-share", type=float, default=0.2, help="Fraction of unusable small model answers")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+    os.environ.pop("CALENDAR_MODEL_CASCADE", None)
+
+    def backends() -> Dict[str, BaseLLM]:
+        return {
+            SMALL: ReplayLLM(small_model_records(args.bad_share), on_miss=ON_MISS_CYCLE, latency=args.small_latency),
+            LARGE: ReplayLLM(synthetic_records(), on_miss=ON_MISS_CYCLE, latency=args.large_latency),
+        }
+
+    print(f"{args.flows} flows, {args.concurrency} at a time; small model {args.small_latency}s per call, "
+          f"{args.bad_share:.0%} unusable; large model {args.large_latency}s per call:")
+    llms = backends()
+    baseline = run(None, args.flows, args.concurrency, llms[SMALL], llms[LARGE])
+    print(f"  large only  {_latency(baseline)}")
+
+    llms = backends()
+    cascade = ModelCascade([SMALL, LARGE])
+    durations = run(cascade, args.flows, args.concurrency, llms[SMALL], llms[LARGE])
+    saved = 1 - statistics.fmean(durations) / statistics.fmean(baseline)
+    print(f"  cascade     {_latency(durations)}  ({saved:.0%} lower mean latency)")
+    for stats in cascade.stats():
+        print(f"    {_tier(stats)}")
+
+
+if __name__ == "__main__":
+    main()
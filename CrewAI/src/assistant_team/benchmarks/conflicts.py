@@ -0,0 +1,42 @@
+"""
+Benchmark: interval-index conflict detection on large calendars.
+
+Measures index build time, the per-request cost of getting the index from
+the checker cache once it is built, and per-event conflict checks for
+calendars of 1,000 to 50,000 existing events.
+
+Usage:
+    python -m assistant_team.benchmarks.conflicts [--iterations N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+
+from ..conflicts import ConflictChecker, ConflictCheckerCache
+from .event_filter import build_calendar
+from .timing import format_result, measure
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    for size in (1000, 10000, 50000):
+        events = build_calendar(size)
+        proposed = [dict(events[size // 2]), {**events[size // 3], "summary": "Overlapping"}]
+        print(format_result(f"build index ({size})", measure(lambda: ConflictChecker(events), 3, warmup=1)))
+        cache = ConflictCheckerCache()
+        checker = asyncio.run(cache.get("v1", events))
+        result = measure(lambda: asyncio.run(cache.get("v1", events)), 100)
+        print(format_result(f"cached index per request ({size})", result))
+        result = measure(lambda: checker.find(proposed), args.iterations)
+        print(format_result(f"check {len(proposed)} events ({size})", result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: cold crew construction vs. pooled crew checkout.
+
+Compares the per-request setup cost of ``CalendarCrew().crew()`` with a
+lease from a warm ``CalendarCrewPool``. The LLM is never called.
+
+Usage:
+    python -m assistant_team.benchmarks.crew_pool [--iterations N] [--pool-size N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+
+from ..crews.calendar_crew.crew_pool import CalendarCrewPool, _build_calendar_crew
+from .timing import format_result, measure
+
+
+def run(iterations: int = 50, pool_size: int = 1) -> dict:
+    """
+    Run the cold vs. pooled comparison.
+
+    Args:
+        iterations: Number of timed checkouts per case
+        pool_size: Size of the warm pool
+
+    Returns:
+        Dict mapping case name to measure() result
+    """
+    pool = CalendarCrewPool(size=pool_size)
+    pool.warm_up()
+
+    def pooled() -> None:
+        with pool.lease():
+            pass
+
+    return {
+        "cold CalendarCrew().crew()": measure(_build_calendar_crew, iterations, warmup=1),
+        "pooled lease/reset": measure(pooled, iterations, warmup=1),
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=1)
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.pool_size)
+    for name, result in results.items():
+        print(format_result(name, result))
+
+    cold = results["cold CalendarCrew().crew()"]["p50_ms"]
+    pooled = results["pooled lease/reset"]["p50_ms"]
+    if pooled:
+        print(f"Pooled checkout is {cold / pooled:.0f}x faster at p50")
+
+
+if __name__ == "__main__":
+    main()
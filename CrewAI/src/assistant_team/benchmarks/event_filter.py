@@ -0,0 +1,67 @@
+"""
+Benchmark: prompt size and latency of date-filtered existing events.
+
+Builds calendars of increasing size and compares sending every existing
+event into the prompt with sending only the events in the window the
+message refers to.
+
+Usage:
+    python -m assistant_team.benchmarks.event_filter [--iterations N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from zoneinfo import ZoneInfo
+
+from ..event_store import EventStore, format_events_for_prompt
+from ..history import estimate_tokens
+from .timing import format_result, measure
+
+NOW = datetime(2025, 3, 3, 9, 0, tzinfo=ZoneInfo("Asia/Jerusalem"))
+MESSAGES = ["dentist tomorrow at 3pm", "gym 4/3 18:00-19:30", "what's on next week?"]
+
+
+def build_calendar(size: int) -> List[Dict[str, Any]]:
+    """Build `size` events spread over the year after NOW, three per day."""
+    events = []
+    for i in range(size):
+        start = NOW + timedelta(days=i // 3, hours=(i % 3) * 3)
+        events.append({
+            "summary": f"Event {i}",
+            "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Jerusalem"},
+            "end": {"dateTime": (start + timedelta(hours=1)).isoformat(), "timeZone": "Asia/Jerusalem"},
+            "location": "Office",
+            "description": "",
+        })
+    return events
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    for size in (100, 1000, 10000):
+        events = build_calendar(size)
+        full_tokens = estimate_tokens(format_events_for_prompt(events))
+        store = EventStore(events)
+        for message in MESSAGES:
+            relevant = store.relevant_to(message, NOW)
+            tokens = estimate_tokens(format_events_for_prompt(relevant))
+            print(f"{size:>6} events, {message!r}: {len(relevant)} sent, ~{tokens} vs ~{full_tokens} prompt tokens")
+
+        message = MESSAGES[0]
+        print(format_result(f"  build store ({size})", measure(lambda: EventStore(events), args.iterations // 10 or 1)))
+        print(format_result(f"  filter + format ({size})", measure(
+            lambda: format_events_for_prompt(store.relevant_to(message, NOW)), args.iterations)))
+        print(format_result(f"  format all ({size})", measure(
+            lambda: format_events_for_prompt(events), args.iterations // 10 or 1)))
+
+
+if __name__ == "__main__":
+    main()
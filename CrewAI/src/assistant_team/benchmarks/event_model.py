@@ -0,0 +1,82 @@
+"""
+Benchmark: typed CalendarEvent batches versus plain event dicts.
+
+Compares the retained memory of large event batches held as JSON-decoded
+dicts and as slotted CalendarEvents, and the throughput of validating a
+batch and running the conflict check on it: per-event
+``validate_calendar_event`` plus string re-parsing in the conflict check on
+the dict path, one ``validate_events`` pass plus pre-parsed spans on the
+typed path.
+
+Usage:
+    python -m assistant_team.benchmarks.event_model [--sizes N ...] [--iterations N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable
+
+from ..conflicts import ConflictChecker
+from ..events import validate_events
+from ..log import configure_logging
+from ..utils import validate_calendar_event
+from .event_filter import build_calendar
+from .timing import format_result, measure
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by the object build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return current
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    existing = build_calendar(2000)
+    checker = ConflictChecker(existing)
+
+    for size in args.sizes:
+        payload = json.dumps(build_calendar(size))
+
+        dict_bytes = retained_bytes(lambda: json.loads(payload))
+        typed_bytes = retained_bytes(lambda: validate_events(json.loads(payload))[0])
+        print(f"{size:>7} events: dicts {dict_bytes / size:,.0f} B/event, "
+              f"CalendarEvent {typed_bytes / size:,.0f} B/event ({typed_bytes / dict_bytes:.2f}x)")
+
+        events = json.loads(payload)
+        iterations = max(1, args.iterations * 1000 // size)
+
+        def dict_path() -> None:
+            valid = [event for event in events if validate_calendar_event(event)]
+            checker.find(valid)
+
+        def typed_path() -> None:
+            valid, _ = validate_events(events)
+            checker.find(valid)
+
+        print(format_result(f"  dicts: validate + conflicts ({size})", measure(dict_path, iterations, warmup=1)))
+        print(format_result(f"  typed: validate + conflicts ({size})", measure(typed_path, iterations, warmup=1)))
+        parsed, _ = validate_events(events)
+        print(format_result(f"  typed: conflicts only ({size})", measure(lambda: checker.find(parsed), iterations, warmup=1)))
+
+
+if __name__ == "__main__":
+    main()
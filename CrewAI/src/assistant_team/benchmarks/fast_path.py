@@ -0,0 +1,124 @@
+"""
+Benchmark: accuracy and latency of the rule-based fast path.
+
+Runs ``parse_simple_request`` over a labelled corpus of scheduling messages
+and reports how many were parsed correctly, how many were correctly handed
+to the crew, and any false accepts (messages the fast path answered wrongly).
+Exits with a non-zero status when accuracy or latency misses its budget.
+
+Usage:
+    python -m assistant_team.benchmarks.fast_path [--min-accuracy 0.95] [--max-p99-ms 1.0]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from ..fast_path import parse_simple_request
+from .timing import format_result, measure
+
+# Reference time for the corpus: Monday 3 March 2025, 09:00 Asia/Jerusalem
+CORPUS_NOW = datetime(2025, 3, 3, 9, 0)
+
+# (message, expected (summary, start, end) or None when the crew must handle it)
+CORPUS: List[Tuple[str, Optional[Tuple[str, str, str]]]] = [
+    ("dentist tomorrow at 3pm", ("Dentist", "2025-03-04T15:00:00+02:00", "2025-03-04T16:00:00+02:00")),
+    ("gym 4/3 18:00-19:30", ("Gym", "2025-03-04T18:00:00+02:00", "2025-03-04T19:30:00+02:00")),
+    ("call with Dana friday 10", ("Call with Dana", "2025-03-07T10:00:00+02:00", "2025-03-07T11:00:00+02:00")),
+    ("Lunch with Bob today 12:30 for 90 minutes", ("Lunch with Bob", "2025-03-03T12:30:00+02:00", "2025-03-03T14:00:00+02:00")),
+    ("team meeting 3-4pm tomorrow", ("Team meeting", "2025-03-04T15:00:00+02:00", "2025-03-04T16:00:00+02:00")),
+    ("Schedule a haircut on 10/3 at 11am", ("Haircut", "2025-03-10T11:00:00+02:00", "2025-03-10T12:00:00+02:00")),
+    ("flight 25/12/2025 06:15", ("Flight", "2025-12-25T06:15:00+02:00", "2025-12-25T07:15:00+02:00")),
+    ("yoga sunday from 7 to 8", ("Yoga", "2025-03-09T19:00:00+02:00", "2025-03-09T20:00:00+02:00")),
+    ("doctor in 3 days at 11am", ("Doctor", "2025-03-06T11:00:00+02:00", "2025-03-06T12:00:00+02:00")),
+    ("party saturday at 9pm for 3 hours", ("Party", "2025-03-08T21:00:00+02:00", "2025-03-09T00:00:00+02:00")),
+    ("dinner tonight at 8", ("Dinner", "2025-03-03T20:00:00+02:00", "2025-03-03T21:00:00+02:00")),
+    ("standup 9:30 tomorrow for 15 min", ("Standup", "2025-03-04T09:30:00+02:00", "2025-03-04T09:45:00+02:00")),
+    ("Add parent teacher meeting 5.3 at 17:00", ("Parent teacher meeting", "2025-03-05T17:00:00+02:00", "2025-03-05T18:00:00+02:00")),
+    ("interview with Acme wednesday 14:00-15:00", ("Interview with Acme", "2025-03-05T14:00:00+02:00", "2025-03-05T15:00:00+02:00")),
+    ("book a massage the day after tomorrow at noon", ("Massage", "2025-03-05T12:00:00+02:00", "2025-03-05T13:00:00+02:00")),
+    ("piano lesson thu 4:30pm for an hour", ("Piano lesson", "2025-03-06T16:30:00+02:00", "2025-03-06T17:30:00+02:00")),
+    ("vet 1/4 at 10", ("Vet", "2025-04-01T10:00:00+03:00", "2025-04-01T11:00:00+03:00")),
+    ("coffee with Noa 13:00", ("Coffee with Noa", "2025-03-03T13:00:00+02:00", "2025-03-03T14:00:00+02:00")),
+    ("cancel the dentist tomorrow", None),
+    ("move my meeting to 5pm", None),
+    ("gym every monday at 7am", None),
+    ("what do I have tomorrow?", None),
+    ("meeting tomorrow morning", None),
+    ("dinner at 8 and movie at 10", None),
+    ("team sync next monday 10am", None),
+    ("dentist 31/02 at 3pm", None),
+    ("lunch sometime next week", None),
+    ("conference on 12/5", None),
+    ("yes add that one too", None),
+    ("breakfast at 8am", None),
+]
+
+
+def evaluate() -> Tuple[int, int, List[str]]:
+    """
+    Score the parser against the corpus.
+
+    Returns:
+        Tuple of (correct count, false accept count, list of failure messages)
+    """
+    correct = 0
+    false_accepts = 0
+    failures = []
+
+    for message, expected in CORPUS:
+        result = parse_simple_request(message, now=CORPUS_NOW)
+        if not result.accepted:
+            if expected is None:
+                correct += 1
+            else:
+                failures.append(f"missed: {message!r} ({result.reason or result.confidence})")
+            continue
+
+        event = result.events[0]
+        got = (event["summary"], event["start"]["dateTime"], event["end"]["dateTime"])
+        if got == expected:
+            correct += 1
+        else:
+            false_accepts += 1
+            failures.append(f"wrong: {message!r} -> {got}, expected {expected}")
+
+    return correct, false_accepts, failures
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--min-accuracy", type=float, default=0.95)
+    parser.add_argument("--max-p99-ms", type=float, default=1.0)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    correct, false_accepts, failures = evaluate()
+    accuracy = correct / len(CORPUS)
+    print(f"Accuracy: {correct}/{len(CORPUS)} ({accuracy:.1%}), false accepts: {false_accepts}")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+
+    messages = [message for message, _ in CORPUS]
+    latency = measure(
+        lambda: [parse_simple_request(m, now=CORPUS_NOW) for m in messages],
+        args.iterations,
+    )
+    per_message = {
+        key: (value / len(messages) if key.endswith("_ms") else value * len(messages))
+        for key, value in latency.items()
+        if key != "iterations"
+    }
+    print(format_result("parse_simple_request (per message)", per_message))
+
+    ok = accuracy >= args.min_accuracy and not false_accepts and per_message["p99_ms"] <= args.max_p99_ms
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: flow latency with and without hedged crew calls.
+
+``TailLatencyLLM`` is a local LLM whose calls usually take about the same
+time but now and then stall, like a provider under load. The same flows
+are run without hedging and with it, reporting p50, p99 and the extra LLM
+calls the hedges cost.
+
+Usage:
+    python -m assistant_team.benchmarks.hedging [--flows N] [--concurrency N]
+        [--latency SECONDS] [--slow-share FRACTION] [--slow-latency SECONDS]
+        [--percentile P] [--budget FRACTION]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from crewai import BaseLLM
+
+from ..crews.calendar_crew.llm_backend import Messages
+from ..hedge import Hedger, set_hedger
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_many
+from .replay_load import crews_with_backend, synthetic_records
+from .timing import _percentile
+
+
+class TailLatencyLLM(BaseLLM):
+    """Local LLM whose calls take `latency` seconds, except a share that take `slow_latency`."""
+
+    def __init__(self, response: str, latency: float, slow_share: float, slow_latency: float, seed: int = 0) -> None:
+        super().__init__(model="tail-latency")
+        self.response = response
+        self.latency = latency
+        self.slow_share = slow_share
+        self.slow_latency = slow_latency
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def call(self, messages: Messages, *args: Any, **kwargs: Any) -> str:
+        with self._lock:
+            self.calls += 1
+            slow = self._random.random() < self.slow_share
+            jitter = self._random.uniform(0.8, 1.2)
+        time.sleep(self.slow_latency if slow else self.latency * jitter)
+        return self.response
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128_000
+
+
+def run(hedger: Optional[Hedger], flows: int, concurrency: int, llm: TailLatencyLLM) -> Dict[str, Any]:
+    """Run `flows` flows, `concurrency` at a time, with or without hedging."""
+    set_hedger(hedger)
+    try:
+        # Spare crews for the hedges; cancelled losers may still print while the pool shuts down
+        with contextlib.redirect_stdout(io.StringIO()), crews_with_backend(llm, pool_size=concurrency * 2):
+            states = [CalendarState(user_input=f"gym on 4/3 at 18:00 #{i}") for i in range(flows)]
+            results = asyncio.run(kickoff_many(states, max_concurrency=concurrency))
+    finally:
+        set_hedger(None)
+
+    durations: List[float] = sorted(result.duration_seconds for result in results if result.ok)
+    return {
+        "failed": sum(1 for result in results if not result.ok),
+        "p50_ms": _percentile(durations, 50) * 1000,
+        "p99_ms": _percentile(durations, 99) * 1000,
+        "llm_calls": llm.calls,
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--flows", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4, help="Flows running at once")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per typical LLM call")
+    parser.add_argument("--slow-share", type=float, default=0.03, help="Fraction of LLM calls that stall")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="Seconds per stalled LLM call")
+    parser.add_argument("--percentile", type=float, default=95.0, help="Hedge after this latency percentile")
+    parser.add_argument("--budget", type=float, default=0.1, help="Fraction of crew calls that may be hedged")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    print(f"{args.flows} flows, {args.concurrency} at a time; LLM calls take {args.latency}s, "
+          f"{args.slow_share:.0%} stall for {args.slow_latency}s:")
+    response = synthetic_records()[0]["response"]
+    for hedged in (False, True):
+        llm = TailLatencyLLM(response, args.latency, args.slow_share, args.slow_latency)
+        hedger = Hedger(percentile=args.percentile, budget=args.budget) if hedged else None
+        result = run(hedger, args.flows, args.concurrency, llm)
+        text = (f"  {'hedged' if hedged else 'no hedging':<11} failed={result['failed']:>3} "
+                f"p50={result['p50_ms']:6.0f}ms p99={result['p99_ms']:6.0f}ms LLM calls={result['llm_calls']:>4}")
+        if hedger is not None:
+            stats = hedger.stats()
+            text += (f" hedge rate={stats.hedge_rate:5.1%} hedge wins={stats.hedge_wins:>3} "
+                     f"over budget={stats.over_budget:>3} no free crew={stats.unavailable:>3} "
+                     f"delay={stats.delay * 1000:4.0f}ms")
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: import-time regression check for the light package entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+for each module, parses the cumulative time reported for it and fails when
+a module exceeds its budget or drags in a module it must not import (for
+example crewai from ``assistant_team.utils``).
+
+Usage:
+    python -m assistant_team.benchmarks.import_time [--repeat N] [--scale FACTOR]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# module -> (budget in milliseconds, modules it must not import)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "assistant_team": (50.0, ("crewai", "pydantic", "dotenv")),
+    "assistant_team.utils": (100.0, ("crewai", "pydantic", "dotenv")),
+    "assistant_team.fast_path": (150.0, ("crewai", "pydantic")),
+    "assistant_team.cache": (150.0, ("crewai", "pydantic")),
+    "assistant_team.history": (100.0, ("crewai", "pydantic")),
+    "assistant_team.event_store": (150.0, ("crewai", "pydantic")),
+    "assistant_team.conflicts": (150.0, ("crewai", "pydantic")),
+    "assistant_team.events": (150.0, ("crewai", "pydantic")),
+    "assistant_team.metrics": (100.0, ("crewai", "pydantic", "dotenv")),
+    "assistant_team.wire_format": (150.0, ("crewai", "pydantic")),
+    "assistant_team.json_repair": (100.0, ("crewai", "pydantic")),
+    "assistant_team.single_flight": (150.0, ("crewai", "pydantic")),
+    "assistant_team.user_store": (150.0, ("crewai", "pydantic")),
+    "assistant_team.server": (150.0, ("crewai", "pydantic")),
+    "assistant_team.admission": (100.0, ("crewai", "pydantic")),
+    "assistant_team.rate_limit": (100.0, ("crewai", "pydantic")),
+    "assistant_team.cascade": (150.0, ("crewai", "pydantic")),
+    "assistant_team.hedge": (100.0, ("crewai", "pydantic")),
+    "assistant_team.state": (600.0, ("crewai",)),
+}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        output: stderr of an interpreter run with -X importtime
+
+    Returns:
+        Dict mapping module name to cumulative import time in microseconds
+    """
+    cumulative = {}
+    for line in output.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def measure_import(module: str, repeat: int = 5) -> Tuple[float, List[str]]:
+    """
+    Measure the cold import time of a module in fresh interpreters.
+
+    Args:
+        module: Dotted module name
+        repeat: Number of interpreter runs; the median is reported
+
+    Returns:
+        Tuple of (median cumulative milliseconds, modules imported on the way)
+    """
+    env = dict(os.environ)
+    samples = []
+    imported: List[str] = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        timings = parse_importtime(completed.stderr)
+        samples.append(timings.get(module, 0) / 1000)
+        imported = list(timings)
+    return statistics.median(samples), imported
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. on slow CI machines")
+    args = parser.parse_args()
+
+    failures = []
+    for module, (budget, forbidden) in BUDGETS.items():
+        elapsed, imported = measure_import(module, args.repeat)
+        leaked = sorted({name for name in imported if name.split(".")[0] in forbidden})
+        status = "✅" if elapsed <= budget * args.scale and not leaked else "❌"
+        print(f"{status} {module:<30} {elapsed:8.1f}ms (budget {budget * args.scale:.0f}ms)")
+        if elapsed > budget * args.scale:
+            failures.append(f"{module} took {elapsed:.1f}ms")
+        if leaked:
+            roots = sorted({name.split(".")[0] for name in leaked})
+            failures.append(f"{module} imports {', '.join(roots)}")
+
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark: single-pass JSON scanner vs. the previous regex cascade.
+
+``legacy_extract_json_from_text`` reproduces the four-strategy extractor that
+``utils.extract_json_from_text`` used before the single-pass scanner, so both
+can be timed side by side on realistic, large and adversarial LLM outputs.
+
+Usage:
+    python -m assistant_team.benchmarks.json_extraction [--iterations N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from ..log import configure_logging
+from ..utils import extract_json_from_text
+from .timing import format_result, measure
+
+
+def _legacy_code_block(text: str) -> Optional[Any]:
+    for pattern in (r'```json\s*\n(.*?)\n\s*```', r'```\s*\n(.*?)\n\s*```', r'`([^`]+)`'):
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            try:
+                return json.loads(match.group(1).strip())
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+def _legacy_prefixed(text: str, prefix: str, kind: type) -> Optional[Any]:
+    if text.startswith(prefix):
+        try:
+            result = json.loads(text.rstrip('`').rstrip())
+            if isinstance(result, kind):
+                return result
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def _legacy_raw(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        for match in re.findall(r'(\[.*?\]|\{.*?\})', text, re.DOTALL):
+            try:
+                return json.loads(match)
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+def legacy_extract_json_from_text(text: str) -> Optional[Any]:
+    """The multi-strategy regex cascade previously used by extract_json_from_text."""
+    if not text or not isinstance(text, str):
+        return None
+    text = text.strip()
+    strategies: List[Callable[[str], Optional[Any]]] = [
+        _legacy_code_block,
+        lambda t: _legacy_prefixed(t, '[', list),
+        lambda t: _legacy_prefixed(t, '{', dict),
+        _legacy_raw,
+    ]
+    for strategy in strategies:
+        try:
+            result = strategy(text)
+            if result is not None:
+                return result
+        except Exception:
+            continue
+    return None
+
+
+def _event(i: int) -> Dict[str, Any]:
+    return {
+        "summary": f"Event {i}",
+        "start": {"dateTime": "2025-03-04T18:00:00+02:00", "timeZone": "Asia/Jerusalem"},
+        "end": {"dateTime": "2025-03-04T19:30:00+02:00", "timeZone": "Asia/Jerusalem"},
+        "location": "Tel Aviv",
+        "description": "Weekly sync [room {B}]",
+    }
+
+
+def build_cases() -> Dict[str, str]:
+    """Build the benchmark inputs keyed by case name."""
+    events = json.dumps([_event(i) for i in range(3)], indent=2)
+    many_events = json.dumps([_event(i) for i in range(500)])
+    chatter = "Let me think about the [user's] request {carefully}. " * 400
+    return {
+        "clean array": events,
+        "code block": f"```json\n{events}\n```",
+        "chatty prefix": f"Sure! Here are the events you asked for:\n{events}\nLet me know!",
+        "nested object in prose": f"Result: {json.dumps(_event(0))} - done",
+        "500 events": many_events,
+        "long chatter then json": f"{chatter}\n{events}",
+        "unbalanced brackets": "[" * 2000 + "{" * 2000 + " nothing closes here",
+        "no json": "I could not find any events in your message. " * 500,
+    }
+
+
+def run(iterations: int = 200) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Time both extractors on every case.
+
+    Args:
+        iterations: Number of timed calls per case and extractor
+
+    Returns:
+        Dict mapping case name to {"legacy": result, "scanner": result}
+    """
+    results = {}
+    # Both extractors print warnings on failure; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, text in build_cases().items():
+            results[name] = {
+                "legacy": measure(lambda: legacy_extract_json_from_text(text), iterations),
+                "scanner": measure(lambda: extract_json_from_text(text), iterations),
+            }
+    return results
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    # Per-call warnings would flood the report and cost time in the listener
+    configure_logging("ERROR", force=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = build_cases()
+        mismatches = [
+            name for name, text in cases.items()
+            if legacy_extract_json_from_text(text) != extract_json_from_text(text)
+        ]
+
+    for name, result in run(args.iterations).items():
+        print(format_result(f"{name} [legacy]", result["legacy"]))
+        print(format_result(f"{name} [scanner]", result["scanner"]))
+    if mismatches:
+        print(f"Cases where the outputs differ: {', '.join(mismatches)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: local JSON repair of malformed crew output.
+
+Takes realistic crew answers, breaks them with the defects models commonly
+produce (single quotes, trailing commas, Python literals, comments,
+truncation) and reports, per defect, whether ``extract_json_from_text``
+still finds the events, whether ``repair_json`` recovers them, and how long
+the repair takes, next to the cost of re-running the crew.
+
+Usage:
+    python -m assistant_team.benchmarks.json_repair [--events N] [--iterations N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import json
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..json_repair import repair_json
+from ..log import configure_logging
+from ..utils import extract_json_from_text
+from .timing import format_result, measure
+from .wire_format import sample_events
+
+_PREFIX = "Thought: I now know the final answer\nFinal Answer: "
+
+
+def _single_quotes(text: str) -> str:
+    return text.replace('"', "'")
+
+
+def _trailing_commas(text: str) -> str:
+    return re.sub(r"\n(\s*)([}\]])", r",\n\1\2", text)
+
+
+def _python_literals(text: str) -> str:
+    return text.replace('"description": ""', '"description": None, "allDay": False')
+
+
+def _comments(text: str) -> str:
+    return text.replace("[\n", "[\n  // events parsed from the message\n", 1) + "  /* end */"
+
+
+def _truncated(text: str) -> str:
+    # Cut inside the last event, as when the output token limit is hit
+    return text[:text.rfind('"end"')]
+
+
+DEFECTS: Dict[str, Callable[[str], str]] = {
+    "single quotes": _single_quotes,
+    "trailing commas": _trailing_commas,
+    "python literals": _python_literals,
+    "comments": _comments,
+    "truncated": _truncated,
+    "all of the above": lambda text: _single_quotes(_trailing_commas(_comments(_python_literals(_truncated(text))))),
+}
+
+
+def build_defects(count: int = 3) -> List[Tuple[str, str, int]]:
+    """Return (defect, broken crew output, events recoverable) for each defect."""
+    answer = json.dumps(sample_events(count), indent=2)
+    cases = []
+    for name, breaker in DEFECTS.items():
+        expected = count - 1 if "truncated" in name or name == "all of the above" else count
+        cases.append((name, _PREFIX + breaker(answer), expected))
+    return cases
+
+
+def recovered(value: Any, expected: int) -> bool:
+    """Whether a parsed value holds the expected number of event objects."""
+    return isinstance(value, list) and len(value) == expected and all(isinstance(item, dict) for item in value)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--crew-latency", type=float, default=1.5,
+                        help="Seconds a crew retry would cost, for comparison")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    cases = build_defects(args.events)
+    repaired = 0
+    for name, text, expected in cases:
+        extracted = recovered(extract_json_from_text(text), expected)
+        ok = recovered(repair_json(text), expected)
+        repaired += ok
+        result = measure(lambda text=text: repair_json(text), args.iterations)
+        status = "✅" if ok else "❌"
+        print(f"{status} {format_result(f'repair: {name}', result)}  (extract alone: {'ok' if extracted else 'fails'})")
+
+    print(f"Repair success rate: {repaired}/{len(cases)}; a crew retry costs ~{args.crew_latency * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
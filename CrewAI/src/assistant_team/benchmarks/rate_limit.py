@@ -0,0 +1,136 @@
+"""
+Benchmark: a burst of flows against a quota-enforcing stub provider.
+
+``StubProvider`` is a local LLM that enforces a requests-per-minute quota
+like a real provider account: calls over quota fail at once with a 429
+and a Retry-After hint, and calls get slower when more run at the same
+time than it has capacity for. The same burst of flows is run without a
+client-side limiter, with only AIMD adaptive concurrency (quota unknown),
+and with the token buckets set to the quota plus AIMD, reporting failed
+flows, 429s seen by the provider and latency.
+
+Usage:
+    python -m assistant_team.benchmarks.rate_limit [--flows N] [--concurrency N]
+        [--rpm N] [--latency SECONDS] [--capacity N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from crewai import BaseLLM
+
+from ..crews.calendar_crew.llm_backend import Messages
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_many
+from ..rate_limit import AdaptiveConcurrency, ProviderLimiter, TokenBucket, set_provider_limiter
+from .replay_load import crews_with_backend, synthetic_records
+from .timing import _percentile
+
+
+class ProviderRateLimitError(RuntimeError):
+    """429 returned by StubProvider."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limit reached, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class StubProvider(BaseLLM):
+    """Local provider with a requests-per-minute quota and load-dependent latency."""
+
+    def __init__(self, response: str, requests_per_minute: float, latency: float, capacity: int) -> None:
+        super().__init__(model="stub-provider")
+        self.response = response
+        self.latency = latency
+        self.capacity = capacity
+        # Two seconds of burst, roughly what providers tolerate
+        self.quota = TokenBucket(requests_per_minute, capacity=max(1.0, requests_per_minute / 30))
+        self.calls = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def call(self, messages: Messages, *args: Any, **kwargs: Any) -> str:
+        with self._lock:
+            self.calls += 1
+            if self.quota.available < 1:
+                self.rejected += 1
+                raise ProviderRateLimitError((1 - self.quota.available) / self.quota.rate)
+            self.quota.reserve(1)
+            self.in_flight += 1
+            delay = self.latency * max(1.0, self.in_flight / self.capacity)
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return self.response
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128_000
+
+
+def run(mode: str, flows: int, concurrency: int, rpm: float, latency: float, capacity: int) -> Dict[str, Any]:
+    """Run `flows` flows, `concurrency` at a time, with the limiter configured by mode."""
+    limiter: Optional[ProviderLimiter] = None
+    if mode != "none":
+        limiter = ProviderLimiter(
+            requests_per_minute=rpm if mode == "buckets + AIMD" else 0,
+            concurrency=AdaptiveConcurrency(initial=concurrency / 2, maximum=concurrency),
+            seed=0,
+        )
+    os.environ["CALENDAR_LLM_LIMITER"] = "off" if limiter is None else "on"
+    set_provider_limiter(limiter)
+
+    provider = StubProvider(synthetic_records()[0]["response"], rpm, latency, capacity)
+    with crews_with_backend(provider, pool_size=concurrency):
+        states = [CalendarState(user_input=f"gym on 4/3 at 18:00 #{i}") for i in range(flows)]
+        started = time.perf_counter()
+        results = asyncio.run(kickoff_many(states, max_concurrency=concurrency))
+        elapsed = time.perf_counter() - started
+
+    durations: List[float] = sorted(result.duration_seconds for result in results if result.ok)
+    return {
+        "failed": sum(1 for result in results if not result.ok),
+        "rejected": provider.rejected,
+        "elapsed_s": elapsed,
+        "p50_ms": _percentile(durations, 50) * 1000 if durations else 0.0,
+        "p99_ms": _percentile(durations, 99) * 1000 if durations else 0.0,
+        "limit": int(limiter.concurrency.limit) if limiter else concurrency,
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--flows", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=16, help="Flows and crews running at once")
+    parser.add_argument("--rpm", type=float, default=240, help="Provider requests-per-minute quota")
+    parser.add_argument("--latency", type=float, default=0.3, help="Provider seconds per call at low load")
+    parser.add_argument("--capacity", type=int, default=4, help="Concurrent calls before the provider slows down")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    print(f"{args.flows} flows, {args.concurrency} at a time, provider quota {args.rpm:.0f} rpm, "
+          f"{args.latency}s per call up to {args.capacity} concurrent:")
+    for mode in ("none", "AIMD", "buckets + AIMD"):
+        result = run(mode, args.flows, args.concurrency, args.rpm, args.latency, args.capacity)
+        print(f"  {mode:<15} failed={result['failed']:>3} provider 429s={result['rejected']:>4} "
+              f"elapsed={result['elapsed_s']:5.1f}s p50={result['p50_ms']:6.0f}ms p99={result['p99_ms']:6.0f}ms "
+              f"final limit={result['limit']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark: offline load test of the full calendar flow against a replayed LLM.
+
+Runs many ``kickoff_many`` flows through real CalendarCrews whose agent is
+backed by a ReplayLLM, so the whole stack (flow, crew, agent executor, JSON
+extraction, conflict check) is exercised without any provider calls.
+Without --recordings a single synthetic answer is served for every prompt.
+
+Usage:
+    python -m assistant_team.benchmarks.replay_load [--requests N] [--concurrency N]
+        [--latency SECONDS] [--token-latency SECONDS] [--error-rate FRACTION] [--recordings FILE]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# Every request must reach the crew
+os.environ["CALENDAR_FAST_PATH"] = "0"
+os.environ["CALENDAR_CACHE"] = "off"
+os.environ["CALENDAR_SINGLE_FLIGHT"] = "off"
+os.environ["CALENDAR_ADMISSION"] = "off"
+os.environ["CALENDAR_LLM_LIMITER"] = "off"
+
+from crewai import BaseLLM
+
+from ..crews.calendar_crew.crew_pool import CalendarCrewPool, get_crew_pool, set_crew_pool
+from ..crews.calendar_crew.llm_backend import (
+    ON_MISS_CYCLE,
+    RecordingStore,
+    ReplayLLM,
+    get_llm_backend,
+    set_llm_backend,
+)
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_many
+from .timing import _percentile
+
+_SYNTHETIC_EVENTS = [{
+    "summary": "Gym",
+    "start": {"dateTime": "2025-03-04T18:00:00+02:00", "timeZone": "Asia/Jerusalem"},
+    "end": {"dateTime": "2025-03-04T19:30:00+02:00", "timeZone": "Asia/Jerusalem"},
+    "location": "",
+    "description": "",
+}]
+
+
+def synthetic_records(answer: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return one recorded answer in the format the agent executor expects."""
+    if answer is None:
+        answer = json.dumps(_SYNTHETIC_EVENTS)
+    response = "Thought: I now know the final answer\nFinal Answer: " + answer
+    return [{"key": "synthetic", "response": response, "model": "replay"}]
+
+
+@contextlib.contextmanager
+def replay_crews(records: List[Dict[str, Any]], pool_size: int = 4, **llm_options: Any) -> Iterator[ReplayLLM]:
+    """
+    Install a warm pool of crews backed by a ReplayLLM for the duration of the block.
+
+    Crew construction output is silenced and the previous backend and pool
+    are restored afterwards.
+
+    Args:
+        records: Records to replay (unrecorded prompts cycle through them)
+        pool_size: Number of crews in the pool
+        **llm_options: Extra ReplayLLM arguments such as latency or token_latency
+
+    Yields:
+        ReplayLLM: The installed backend, for its stats()
+    """
+    llm = ReplayLLM(records, on_miss=ON_MISS_CYCLE, seed=0, **llm_options)
+    with crews_with_backend(llm, pool_size):
+        yield llm
+
+
+@contextlib.contextmanager
+def crews_with_backend(llm: BaseLLM, pool_size: int = 4) -> Iterator[CalendarCrewPool]:
+    """
+    Install a warm pool of crews whose agent uses `llm` for the duration of the block.
+
+    Args:
+        llm: Backend for the crews, e.g. a ReplayLLM or a stub provider
+        pool_size: Number of crews in the pool
+
+    Yields:
+        CalendarCrewPool: The installed pool
+    """
+    previous_llm, previous_pool = get_llm_backend(), get_crew_pool()
+    set_llm_backend(llm)
+    pool = CalendarCrewPool(size=pool_size)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pool.warm_up()
+            set_crew_pool(pool)
+            yield pool
+    finally:
+        set_crew_pool(previous_pool)
+        set_llm_backend(previous_llm)
+        pool.shutdown()
+
+
+async def run(
+    requests: int = 500,
+    concurrency: int = 8,
+    pool_size: int = 4,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    recordings: Optional[str] = None,
+    token_latency: float = 0.0,
+    records: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Push `requests` flows through a pool of replay-backed crews.
+
+    Args:
+        requests: Number of flows to run
+        concurrency: Maximum flows in flight
+        pool_size: Number of crews in the pool
+        latency: Injected seconds per LLM call
+        error_rate: Fraction of LLM calls that fail
+        recordings: Recording file to replay, defaults to a synthetic answer
+        token_latency: Injected seconds per output token
+        records: Records to replay instead of a file or the synthetic answer
+
+    Returns:
+        Dict with throughput, latency percentiles, error count and replay stats
+    """
+    if records is None:
+        records = RecordingStore(recordings).load() if recordings else synthetic_records()
+    with replay_crews(records, pool_size, latency=latency, error_rate=error_rate,
+                      token_latency=token_latency) as llm:
+        states = [CalendarState(user_input=f"gym on 4/3 at 18:00 #{i}") for i in range(requests)]
+        started = time.perf_counter()
+        results = await kickoff_many(states, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+
+    durations = sorted(result.duration_seconds for result in results)
+    return {
+        "requests": requests,
+        "elapsed_s": elapsed,
+        "requests_per_sec": requests / elapsed if elapsed else float("inf"),
+        "p50_ms": _percentile(durations, 50) * 1000,
+        "p99_ms": _percentile(durations, 99) * 1000,
+        "failed": sum(1 for result in results if not result.ok),
+        "replay": llm.stats(),
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected seconds per LLM call")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Injected seconds per output token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of LLM calls that fail")
+    parser.add_argument("--recordings", help="JSONL file written with CALENDAR_LLM_MODE=record")
+    args = parser.parse_args()
+    # Per-call warnings would flood the report and cost time in the listener
+    configure_logging("ERROR", force=True)
+
+    result = asyncio.run(run(args.requests, args.concurrency, args.pool_size,
+                             args.latency, args.error_rate, args.recordings, args.token_latency))
+    print(f"{result['requests']} flows in {result['elapsed_s']:.2f}s: "
+          f"{result['requests_per_sec']:.1f} req/s, p50={result['p50_ms']:.1f}ms, "
+          f"p99={result['p99_ms']:.1f}ms, failed={result['failed']}")
+    print(f"Replay LLM: {result['replay']}")
+
+
+if __name__ == "__main__":
+    main()
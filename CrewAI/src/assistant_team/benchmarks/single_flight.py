@@ -0,0 +1,70 @@
+"""
+Benchmark: duplicate webhook deliveries with and without single-flight.
+
+Sends bursts in which every message arrives several times (a user
+double-send plus webhook retries a little later) through replay-backed
+crews, and reports how many LLM calls were made and the request latency,
+with coalescing on and off. With coalescing every delivery still gets the
+events back, but they come from one flow per message.
+
+Usage:
+    python -m assistant_team.benchmarks.single_flight [--messages N] [--copies N]
+        [--retry-delay SECONDS] [--latency SECONDS]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict
+
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_with_calendar_state
+from ..single_flight import SingleFlight, set_single_flight
+from .replay_load import replay_crews, synthetic_records
+from .timing import _percentile
+
+
+async def burst(messages: int, copies: int, retry_delay: float) -> Dict[str, Any]:
+    """Deliver `copies` of each message, the first two at once and the rest retry_delay apart."""
+    async def deliver(message: int, copy: int) -> float:
+        await asyncio.sleep(max(0, copy - 1) * retry_delay)
+        state = CalendarState(user_id=f"+97250000{message:04d}", user_input=f"gym on 4/3 at 18:00 #{message}")
+        started = time.perf_counter()
+        await kickoff_with_calendar_state(state)
+        return time.perf_counter() - started
+
+    durations = sorted(await asyncio.gather(*(deliver(m, c) for m in range(messages) for c in range(copies))))
+    return {
+        "p50_ms": _percentile(durations, 50) * 1000,
+        "p99_ms": _percentile(durations, 99) * 1000,
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=8)
+    parser.add_argument("--copies", type=int, default=3)
+    parser.add_argument("--retry-delay", type=float, default=0.2, help="Seconds between webhook redeliveries")
+    parser.add_argument("--latency", type=float, default=0.5, help="Injected seconds per LLM call")
+    parser.add_argument("--window", type=float, default=10.0, help="Dedupe window in seconds")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    print(f"{args.messages} messages x {args.copies} deliveries, {args.latency}s per LLM call:")
+    for enabled in (False, True):
+        os.environ["CALENDAR_SINGLE_FLIGHT"] = "on" if enabled else "off"
+        set_single_flight(SingleFlight(window=args.window) if enabled else None)
+        with replay_crews(synthetic_records(), pool_size=4, latency=args.latency) as llm:
+            result = asyncio.run(burst(args.messages, args.copies, args.retry_delay))
+        label = "single-flight" if enabled else "no coalescing"
+        print(f"  {label:<14} LLM calls={llm.stats()['calls']:>3} "
+              f"p50={result['p50_ms']:7.1f}ms p99={result['p99_ms']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
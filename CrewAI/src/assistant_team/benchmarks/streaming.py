@@ -0,0 +1,74 @@
+"""
+Benchmark: time to first event with streaming vs buffered crew output.
+
+Runs the full flow through replay-backed crews whose LLM emits its answer
+token by token (--token-latency) and compares, for messages that produce
+1 / 3 / 10 events, when ``kickoff_with_calendar_state`` returns with when
+``stream_with_calendar_state`` yields its first and its last event.
+
+Usage:
+    python -m assistant_team.benchmarks.streaming [--events N ...] [--runs N]
+        [--latency SECONDS] [--token-latency SECONDS]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from ..log import configure_logging
+from ..main import CalendarState, kickoff_with_calendar_state, stream_with_calendar_state
+from .replay_load import replay_crews, synthetic_records
+from .timing import _percentile
+from .wire_format import sample_events
+
+
+async def measure_flows(runs: int) -> Dict[str, List[float]]:
+    """Time `runs` buffered and `runs` streaming flows; the runs overlap, each on its own crew."""
+    samples: Dict[str, List[float]] = {"buffered": [], "first": [], "last": []}
+
+    async def measure(i: int) -> None:
+        state = CalendarState(user_input=f"plan my week #{i}")
+
+        started = time.perf_counter()
+        await kickoff_with_calendar_state(state)
+        samples["buffered"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        first = None
+        async for _ in stream_with_calendar_state(state):
+            if first is None:
+                first = time.perf_counter() - started
+        samples["first"].append(first if first is not None else float("nan"))
+        samples["last"].append(time.perf_counter() - started)
+
+    await asyncio.gather(*(measure(i) for i in range(runs)))
+    return samples
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, nargs="*", default=[1, 3, 10])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.3, help="Injected seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="Injected seconds per output token")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    print(f"p50 over {args.runs} runs ({args.latency}s + {args.token_latency}s/token):")
+    for count in args.events:
+        records = synthetic_records(json.dumps(sample_events(count), indent=2))
+        with replay_crews(records, pool_size=args.runs, latency=args.latency, token_latency=args.token_latency):
+            samples = asyncio.run(measure_flows(args.runs))
+        p50 = {name: _percentile(sorted(values), 50) * 1000 for name, values in samples.items()}
+        print(f"  {count:>3} event(s): buffered {p50['buffered']:7.1f}ms | streaming first "
+              f"{p50['first']:7.1f}ms, last {p50['last']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Micro-benchmark suite for the non-LLM hot paths that run on every message.
+
+Covers JSON extraction on realistic and pathological LLM output, local
+repair of malformed output, event validation and summary formatting on large
+event lists, get_current_date, CalendarState construction and the flow
+overhead with the crew stubbed out.
+Reports p50/p99 and ops/sec per case and compares p50 against a stored
+baseline so regressions fail the run.
+
+Usage:
+    python -m assistant_team.benchmarks.suite                     # compare with baseline.json
+    python -m assistant_team.benchmarks.suite --save-baseline     # record a new baseline
+    python -m assistant_team.benchmarks.suite --only json --tolerance 0.3
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..json_repair import repair_json
+from ..log import configure_logging
+from ..state import CalendarState
+from ..timezones import localize_events
+from ..utils import extract_json_from_text, format_events_summary, get_current_date, validate_calendar_event
+from .event_filter import build_calendar
+from .json_extraction import build_cases
+from .json_repair import build_defects
+from .timing import format_result, measure
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# A case regresses when its p50 exceeds the baseline by more than this fraction
+DEFAULT_TOLERANCE = 0.5
+
+
+def _json_cases() -> List[Tuple[str, Callable[[], Any], int]]:
+    cases = []
+    for name, text in build_cases().items():
+        cases.append((f"json: {name}", lambda text=text: extract_json_from_text(text), 200))
+    for name, text, _ in build_defects():
+        cases.append((f"json repair: {name}", lambda text=text: repair_json(text), 200))
+    return cases
+
+
+def _event_cases() -> List[Tuple[str, Callable[[], Any], int]]:
+    events = build_calendar(1000)
+    return [
+        ("events: validate 1000", lambda: [validate_calendar_event(event) for event in events], 50),
+        ("events: format summary 1000", lambda: format_events_summary(events), 50),
+        ("events: localize 1000", lambda: localize_events(events, "Asia/Jerusalem"), 50),
+    ]
+
+
+def _misc_cases() -> List[Tuple[str, Callable[[], Any], int]]:
+    history = "User: dentist tomorrow at 3pm\nAssistant: Added.\n" * 20
+    return [
+        ("get_current_date", get_current_date, 5000),
+        ("CalendarState construction", lambda: CalendarState(
+            chat_history=history, user_input="gym 4/3 18:00-19:30", existing_events="4/3 10:00: Standup",
+        ), 5000),
+    ]
+
+
+def _flow_cases() -> List[Tuple[str, Callable[[], Any], int]]:
+    try:
+        from ..crews.calendar_crew.crew_pool import CalendarCrewPool, set_crew_pool
+        from ..main import kickoff_with_calendar_state
+        # Importing async_flow turns off the fast path, response cache and single-flight
+        from .async_flow import SleepingCrew
+    except ImportError as e:
+        print(f"⚠️ Skipping flow overhead case: {e}")
+        return []
+
+    pool = CalendarCrewPool(size=1, factory=lambda: SleepingCrew(0.0))
+    pool.warm_up()
+    set_crew_pool(pool)
+    state = CalendarState(user_input="stubbed crew request")
+    loop = asyncio.new_event_loop()
+    return [("flow overhead (stub crew)", lambda: loop.run_until_complete(kickoff_with_calendar_state(state)), 50)]
+
+
+CASE_GROUPS = {
+    "json": _json_cases,
+    "events": _event_cases,
+    "misc": _misc_cases,
+    "flow": _flow_cases,
+}
+
+
+def run(groups: List[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Run the selected case groups.
+
+    Args:
+        groups: Names from CASE_GROUPS
+
+    Returns:
+        Dict mapping case name to measure() result
+    """
+    results = {}
+    for group in groups:
+        for name, fn, iterations in CASE_GROUPS[group]():
+            # Hot paths print warnings and progress; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = measure(fn, iterations, warmup=min(10, iterations))
+            print(format_result(name, results[name]))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """
+    Compare p50 timings against a baseline.
+
+    Args:
+        results: Current results from run()
+        baseline: Stored results from an earlier run()
+        tolerance: Allowed slowdown as a fraction of the baseline p50
+
+    Returns:
+        List of regression messages (empty when nothing regressed)
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get("p50_ms"):
+            continue
+        ratio = result["p50_ms"] / reference["p50_ms"]
+        marker = "❌" if ratio > 1 + tolerance else "  "
+        print(f"{marker} {name:<40} {ratio:6.2f}x baseline p50")
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: p50 {result['p50_ms']:.4f}ms vs {reference['p50_ms']:.4f}ms")
+    return regressions
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="*", choices=sorted(CASE_GROUPS), default=list(CASE_GROUPS))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    # Per-call warnings would flood the report and cost time in the listener
+    configure_logging("ERROR", force=True)
+
+    results = run(args.only)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    print(f"\nComparing with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"  ❌ {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
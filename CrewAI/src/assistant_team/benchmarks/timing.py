@@ -0,0 +1,67 @@
+"""
+Timing helpers shared by the Assistant Team benchmarks.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of already sorted samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(pct / 100 * len(samples) + 0.5)) - 1))
+    return samples[index]
+
+
+def measure(fn: Callable[[], Any], iterations: int = 1000, warmup: int = 10) -> Dict[str, float]:
+    """
+    Time repeated calls of a zero-argument callable.
+
+    Args:
+        fn: Callable to benchmark
+        iterations: Number of timed calls
+        warmup: Number of untimed calls made first
+
+    Returns:
+        Dict with iterations, mean, p50 and p99 in milliseconds and ops_per_sec
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": _percentile(samples, 50) * 1000,
+        "p99_ms": _percentile(samples, 99) * 1000,
+        "ops_per_sec": iterations / total if total else float("inf"),
+    }
+
+
+def format_result(name: str, result: Dict[str, float]) -> str:
+    """
+    Format a measure() result as a single report line.
+
+    Args:
+        name: Label of the benchmark case
+        result: Dict returned by measure()
+
+    Returns:
+        str: Human-readable report line
+    """
+    return (
+        f"{name:<40} p50={result['p50_ms']:9.4f}ms  p99={result['p99_ms']:9.4f}ms  "
+        f"ops/s={result['ops_per_sec']:12.1f}"
+    )
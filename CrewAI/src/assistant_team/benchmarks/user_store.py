@@ -0,0 +1,84 @@
+"""
+Benchmark: per-message state handling with the user state store.
+
+Compares what the host did before, rebuilding the whole state for every
+message and rewriting it as one serialized blob, with UserStateStore: a hot
+load from the in-memory LRU, a cold load from SQLite, and an incremental
+append of one exchange and one event.
+
+Usage:
+    python -m assistant_team.benchmarks.user_store [--events N ...] [--turns N] [--iterations N]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+
+from ..user_store import UserStateStore
+from .event_filter import NOW, build_calendar
+from .timing import format_result, measure
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, nargs="*", default=[100, 1000])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    history = [f"User: dentist on {i % 28 + 1}/3 at 15:00" if i % 2 == 0 else "Assistant: Added Dentist"
+               for i in range(args.turns)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.events:
+            events = build_calendar(size)
+            path = os.path.join(tmp, f"state-{size}.sqlite3")
+
+            # Before: one blob per user, read and rewritten in full on every message
+            blob = sqlite3.connect(os.path.join(tmp, f"blob-{size}.sqlite3"), isolation_level=None)
+            blob.execute("PRAGMA journal_mode=WAL")
+            blob.execute("PRAGMA synchronous=NORMAL")
+            blob.execute("CREATE TABLE state (user_id TEXT PRIMARY KEY, value TEXT)")
+            blob.execute("INSERT INTO state VALUES ('u', ?)", (json.dumps({"history": history, "events": events}),))
+
+            def blob_roundtrip() -> None:
+                value = json.loads(blob.execute("SELECT value FROM state WHERE user_id = 'u'").fetchone()[0])
+                value["history"].append("User: gym tomorrow at 18:00")
+                value["events"].append(events[0])
+                blob.execute("UPDATE state SET value = ? WHERE user_id = 'u'", (json.dumps(value),))
+
+            # The calendar starts at NOW; nothing in it has ended yet
+            store = UserStateStore(path, hot_users=1, clock=NOW.timestamp)
+            store.append_history("u", *history)
+            store.append_events("u", events)
+            store.append_history("other", "User: hi")
+
+            def hot_load() -> None:
+                store.load("u").chat_history
+
+            def cold_load() -> None:
+                # Touching another user evicts "u" from the one-slot LRU
+                store.load("other")
+                store.load("u").chat_history
+
+            def append() -> None:
+                store.append_history("u", "User: gym tomorrow at 18:00", "Assistant: Added Gym")
+                store.append_events("u", events[:1])
+
+            print(f"{size} events, {args.turns} turns:")
+            print(format_result("  blob: load + rewrite", measure(blob_roundtrip, args.iterations)))
+            print(format_result("  store: hot load", measure(hot_load, args.iterations)))
+            print(format_result("  store: cold load", measure(cold_load, args.iterations // 4 or 1)))
+            print(format_result("  store: append exchange + event", measure(append, args.iterations)))
+            store.close()
+            blob.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: output tokens and end-to-end latency of the full vs compact wire format.
+
+Counts the output tokens of the same events written in the full Google
+Calendar format (as the model lays it out, indented) and as compact
+positional rows, with tiktoken when its encoding is available and the
+repo's character estimate otherwise. Then runs the whole flow through
+replay-backed crews in both modes, with generation time proportional to
+output length (--token-latency), and reports p50/p99.
+
+Usage:
+    python -m assistant_team.benchmarks.wire_format [--requests N] [--events N ...]
+        [--latency SECONDS] [--token-latency SECONDS]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..history import estimate_tokens
+from ..log import configure_logging
+from ..wire_format import OUTPUT_COMPACT, OUTPUT_FULL, to_compact
+from .replay_load import run, synthetic_records
+
+_TITLES = ["Dentist", "Team standup", "Lunch with Dana", "Gym", "Flight to Berlin"]
+_LOCATIONS = ["Clinic, 12 Herzl St", "", "Cafe Noir", "", "TLV Airport"]
+
+
+def sample_events(count: int) -> List[Dict[str, Any]]:
+    """Build `count` naive local-time events as the crew writes them."""
+    events = []
+    for i in range(count):
+        day = 1 + i % 28
+        hour = 8 + i % 10
+        events.append({
+            "summary": _TITLES[i % len(_TITLES)],
+            "start": {"dateTime": f"2025-03-{day:02d}T{hour:02d}:00:00", "timeZone": "Asia/Jerusalem"},
+            "end": {"dateTime": f"2025-03-{day:02d}T{hour:02d}:45:00", "timeZone": "Asia/Jerusalem"},
+            "location": _LOCATIONS[i % len(_LOCATIONS)],
+            "description": "Bring the referral letter" if i % 3 == 0 else "",
+        })
+    return events
+
+
+def token_counter(timeout: float = 5.0) -> Tuple[str, Callable[[str], int]]:
+    """Return (name, count function), preferring tiktoken's cl100k_base encoding."""
+    loaded: List[Any] = []
+
+    def load() -> None:
+        try:
+            import tiktoken
+
+            loaded.append(tiktoken.get_encoding("cl100k_base"))
+        except Exception:
+            # Not installed, or the encoding file cannot be downloaded
+            pass
+
+    # An uncached encoding is downloaded without a timeout; do not hang offline
+    loader = threading.Thread(target=load, daemon=True)
+    loader.start()
+    loader.join(timeout)
+    if not loaded:
+        return "estimate", estimate_tokens
+    encoding = loaded[0]
+    return "cl100k_base", lambda text: len(encoding.encode(text))
+
+
+def answers(count: int) -> Dict[str, str]:
+    """Return the model answer for `count` events in each output format."""
+    events = sample_events(count)
+    return {OUTPUT_FULL: json.dumps(events, indent=2), OUTPUT_COMPACT: to_compact(events)}
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, nargs="*", default=[1, 3, 10])
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16, help="Flows and crews running at once")
+    parser.add_argument("--latency", type=float, default=0.3, help="Injected seconds per LLM call")
+    parser.add_argument("--token-latency", type=float, default=0.01,
+                        help="Injected seconds per output token (0.01 = 100 tokens/s)")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+
+    name, count_tokens = token_counter()
+    print(f"Output tokens ({name}):")
+    for count in args.events:
+        texts = answers(count)
+        full, compact = count_tokens(texts[OUTPUT_FULL]), count_tokens(texts[OUTPUT_COMPACT])
+        print(f"  {count:>3} event(s): full {full:>5}, compact {compact:>5} ({compact / full:.2f}x)")
+
+    print(f"End to end ({args.requests} flows, {args.latency}s + {args.token_latency}s/token):")
+    for count in args.events:
+        for output_format, answer in answers(count).items():
+            # Crews read the format when they are built, i.e. inside run()
+            os.environ["CALENDAR_OUTPUT_FORMAT"] = output_format
+            result = asyncio.run(run(
+                # One crew per flow in flight: with the default pool of 4, simulated
+                # generation time queued up and a 10-event run took minutes
+                args.requests, args.concurrency, pool_size=args.concurrency, latency=args.latency,
+                token_latency=args.token_latency, records=synthetic_records(answer),
+            ))
+            print(f"  {count:>3} event(s) {output_format:<8} p50={result['p50_ms']:7.1f}ms "
+                  f"p99={result['p99_ms']:7.1f}ms failed={result['failed']}")
+
+
+if __name__ == "__main__":
+    main()
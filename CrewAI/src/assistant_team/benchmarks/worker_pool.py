@@ -0,0 +1,99 @@
+"""
+Benchmark: throughput of ``assistant_team serve`` at 1, 2, 4 and 8 workers.
+
+Starts a WorkerPool whose workers replay a synthetic answer instead of
+calling a provider, serves it on a temporary Unix socket, and pushes a
+burst of requests from many users through WorkerClient. Reports worker
+startup time, requests per second and latency percentiles per pool size.
+Throughput only scales while there are idle cores; the CPU count is
+printed with the results.
+
+Usage:
+    python -m assistant_team.benchmarks.worker_pool [--workers N ...] [--requests N]
+        [--concurrency N] [--latency SECONDS]
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+# Workers inherit the environment: replay every LLM call and let each request reach the crew
+os.environ["CALENDAR_LLM_MODE"] = "replay"
+os.environ["CALENDAR_LLM_REPLAY_ON_MISS"] = "cycle"
+os.environ["CALENDAR_FAST_PATH"] = "0"
+os.environ["CALENDAR_CACHE"] = "off"
+os.environ["CALENDAR_SINGLE_FLIGHT"] = "off"
+os.environ["CALENDAR_ADMISSION"] = "off"
+os.environ["CALENDAR_LLM_LIMITER"] = "off"
+os.environ.setdefault("CALENDAR_LOG_LEVEL", "ERROR")
+
+from ..log import configure_logging
+from ..server import WorkerClient, WorkerPool, serve
+from .replay_load import synthetic_records
+from .timing import _percentile
+
+
+async def burst(pool: WorkerPool, socket_path: str, requests: int) -> Dict[str, Any]:
+    """Serve the pool on socket_path and send `requests` messages from distinct users at once."""
+    stop = asyncio.Event()
+    server = asyncio.create_task(serve(pool, socket_path, stop))
+    while not os.path.exists(socket_path):
+        await asyncio.sleep(0.01)
+    client = await WorkerClient.connect(socket_path)
+
+    async def one(i: int) -> float:
+        started = time.perf_counter()
+        await client.kickoff({"user_id": f"+97250000{i:04d}", "user_input": f"gym on 4/3 at 18:00 #{i}"})
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    durations = sorted(await asyncio.gather(*(one(i) for i in range(requests))))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    stop.set()
+    await server
+    return {
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": _percentile(durations, 50) * 1000,
+        "p99_ms": _percentile(durations, 99) * 1000,
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4, help="Flows per worker at the same time")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected seconds per LLM call")
+    args = parser.parse_args()
+    configure_logging("ERROR", force=True)
+    os.environ["CALENDAR_LLM_REPLAY_LATENCY"] = str(args.latency)
+    os.environ["CALENDAR_CREW_POOL_SIZE"] = str(args.concurrency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recordings = os.path.join(tmp, "recordings.jsonl")
+        with open(recordings, "w", encoding="utf-8") as f:
+            f.write(json.dumps(synthetic_records()[0]) + "\n")
+        os.environ["CALENDAR_LLM_RECORDINGS"] = recordings
+        os.environ["CALENDAR_STATE_PATH"] = ":memory:"
+
+        print(f"{args.requests} requests, {args.concurrency} flows per worker, "
+              f"{args.latency}s per LLM call, {os.cpu_count()} CPU(s):")
+        for workers in args.workers:
+            with WorkerPool(workers, concurrency=args.concurrency, quiet=True) as pool:
+                startup = max(pool.startup_seconds)
+                result = asyncio.run(burst(pool, os.path.join(tmp, "serve.sock"), args.requests))
+            print(f"  {workers} worker(s): startup {startup:5.2f}s  {result['requests_per_sec']:7.1f} req/s  "
+                  f"p50={result['p50_ms']:7.1f}ms p99={result['p99_ms']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+"""
+Response cache for calendar crew results.
+
+Resent messages and redelivered webhooks carry the same request text. This
+module caches the parsed events returned by the crew so that identical
+requests made on the same day are answered without a new LLM call.
+
+The cache key combines the normalized user input, a hash of the chat history
+and existing events, and the current date (without the time of day), so a
+cached answer to "dentist tomorrow" is never served on a different day.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 6 * 60 * 60  # seconds
+
+_DATE_BUCKET_RE = re.compile(r"day:\s*\d+,\s*month:\s*\d+,\s*year:\s*\d+")
+
+
+def normalize_user_input(user_input: str) -> str:
+    """Lowercase the input and collapse whitespace so trivial resends match."""
+    return " ".join(user_input.lower().split())
+
+
+def date_bucket(current_date: str) -> str:
+    """
+    Reduce a get_current_date() string to its calendar day.
+
+    Args:
+        current_date: Value returned by get_current_date()
+
+    Returns:
+        str: The "day: X, month: Y, year: Z" part, or the input unchanged
+    """
+    match = _DATE_BUCKET_RE.search(current_date)
+    return match.group(0) if match else current_date
+
+
+def make_cache_key(
+    user_input: str,
+    chat_history: str,
+    existing_events: str,
+    current_date: str,
+    time_zone: str = "",
+) -> str:
+    """
+    Build a cache key for a crew request.
+
+    Args:
+        user_input: Current user request
+        chat_history: Previous conversation context
+        existing_events: Current calendar events
+        current_date: Value returned by get_current_date()
+        time_zone: IANA zone of the user
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+    parts = (normalize_user_input(user_input), chat_history, existing_events, date_bucket(current_date), time_zone)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a response cache."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters and hit rate as a plain dict."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl: Optional[float] = DEFAULT_CACHE_TTL) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+        # Hand out a copy so callers cannot mutate the cached events
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """
+    SQLite-backed LRU cache with per-entry TTL.
+
+    Entries survive process restarts and can be shared by several worker
+    processes on one host. Values must be JSON serializable.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_size
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Cache of parsed crew results keyed on request content and date.
+
+    Example:
+        >>> cache = ResponseCache()
+        >>> key = cache.key_for(state.user_input, state.chat_history,
+        ...                     state.existing_events, get_current_date())
+        >>> events = cache.get(key)
+        >>> if events is None:
+        ...     events = run_crew()
+        ...     cache.set(key, events)
+    """
+
+    def __init__(self, backend: Optional[Any] = None) -> None:
+        """
+        Args:
+            backend: MemoryCacheBackend or DiskCacheBackend, defaults to in-memory
+        """
+        self.backend = backend or MemoryCacheBackend()
+
+    key_for = staticmethod(make_cache_key)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit/miss statistics of the backend."""
+        return self.backend.stats
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached events for the key, or None on a miss."""
+        return self.backend.get(key)
+
+    def set(self, key: str, events: List[Dict[str, Any]]) -> None:
+        """Cache the events parsed for the key."""
+        self.backend.set(key, events)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self.backend.clear()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_CACHE: "memory" (default), "disk" or "off"
+        CALENDAR_CACHE_SIZE: Maximum number of entries (default 1024)
+        CALENDAR_CACHE_TTL: Entry lifetime in seconds, 0 disables expiry (default 6h)
+        CALENDAR_CACHE_PATH: SQLite file for the disk backend
+
+    Returns:
+        Optional[ResponseCache]: The shared cache, or None when disabled
+    """
+    global _default_cache
+    mode = os.getenv("CALENDAR_CACHE", "memory").strip().lower()
+    if mode in ("off", "0", "false", "no", "none"):
+        return None
+
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                size = int(os.getenv("CALENDAR_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+                ttl = float(os.getenv("CALENDAR_CACHE_TTL", DEFAULT_CACHE_TTL)) or None
+                if mode == "disk":
+                    path = os.getenv("CALENDAR_CACHE_PATH", "calendar_cache.sqlite3")
+                    backend = DiskCacheBackend(path, max_size=size, ttl=ttl)
+                else:
+                    backend = MemoryCacheBackend(max_size=size, ttl=ttl)
+                _default_cache = ResponseCache(backend)
+    return _default_cache
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Model cascade for crew calls.
+
+Most calendar messages are easy enough for a small, fast model and only a
+few need the large one. With CALENDAR_MODEL_CASCADE set to a
+comma-separated list of models, cheapest first, the crew runs with the
+first model and its answer is checked locally before it is used. The next
+model is only tried when the check fails:
+
+- unparseable: no JSON value, even after local repair
+- invalid: a proposed event lacks required fields (validate_calendar_event)
+  or its times do not parse
+- empty: no events although the message mentions a date or time of day
+
+The last model's answer is always used. Per-tier hit rates and latency are
+kept in ``TierStats`` and exported as calendar_cascade_* metrics.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+from .events import validate_events
+from .fast_path import find_referenced_dates
+from .log import get_logger
+from .metrics import get_metrics
+from .timezones import localize_events
+from .utils import validate_calendar_event
+
+logger = get_logger(__name__)
+
+ESCALATE_UNPARSEABLE = "unparseable"
+ESCALATE_INVALID = "invalid"
+ESCALATE_EMPTY = "empty"
+
+OUTCOME_ACCEPTED = "accepted"
+
+# Clock times a message can mention without a date: "3pm", "18:00", "noon"
+_TIME_CUE_RE = re.compile(
+    r"\b\d{1,2}(?::\d{2})?\s*(?:am|pm|a\.m\.|p\.m\.)|\b\d{1,2}:\d{2}\b|\b(?:noon|midday|midnight)\b",
+    re.IGNORECASE,
+)
+
+_tier_calls = get_metrics().counter("calendar_cascade_calls_total", "Crew calls per cascade tier by outcome")
+_tier_timer = get_metrics().timer("calendar_cascade_tier_seconds", "Time spent in each cascade tier, retries included")
+
+
+@dataclass
+class TierStats:
+    """
+    Counters of one cascade tier.
+
+    Attributes:
+        model: Model of the tier
+        calls: Requests that reached the tier
+        accepted: Requests answered by the tier
+        escalated: Requests passed on to the next tier, by reason
+        seconds: Total time spent in the tier
+    """
+    model: str
+    calls: int = 0
+    accepted: int = 0
+    escalated: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the requests reaching this tier that it answered."""
+        return self.accepted / self.calls if self.calls else 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean time per request spent in this tier."""
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+class ModelCascade:
+    """
+    Ordered list of models tried cheapest first, with the check that decides escalation.
+
+    Example:
+        >>> cascade = ModelCascade(["gpt-4o-mini", "gpt-4o"])
+        >>> cascade.check(json_data, "lunch tomorrow at noon", "Asia/Jerusalem")
+        'empty'
+    """
+
+    def __init__(self, models: Sequence[str]) -> None:
+        """
+        Args:
+            models: Model names, cheapest first
+
+        Raises:
+            ValueError: If no model is given or a model is listed twice
+        """
+        if not models:
+            raise ValueError("A model cascade needs at least one model")
+        if len(set(models)) != len(models):
+            raise ValueError("Each model may appear only once in a cascade")
+        self.models = tuple(models)
+        self._stats = {model: TierStats(model) for model in self.models}
+        self._lock = threading.Lock()
+
+    def check(self, json_data: Any, user_input: str, timezone: str) -> Optional[str]:
+        """
+        Decide whether a tier's answer is good enough to use.
+
+        Args:
+            json_data: Parsed crew output (list or dict of events), None if unparseable
+            user_input: Message the answer is for
+            timezone: IANA zone the crew wrote its local times in
+
+        Returns:
+            Optional[str]: None to accept the answer, otherwise the reason to escalate
+        """
+        if json_data is None:
+            return ESCALATE_UNPARSEABLE
+        events = [json_data] if isinstance(json_data, dict) else json_data
+        if not isinstance(events, list):
+            return ESCALATE_INVALID
+
+        if not events:
+            today = datetime.now(ZoneInfo(timezone)).date()
+            if find_referenced_dates(user_input, today) or _TIME_CUE_RE.search(user_input):
+                return ESCALATE_EMPTY
+            return None
+
+        if not all(validate_calendar_event(event) for event in events):
+            return ESCALATE_INVALID
+        _, errors = validate_events(localize_events(events, timezone), timezone)
+        if errors:
+            return ESCALATE_INVALID
+        return None
+
+    def record(self, model: str, seconds: float, escalation: Optional[str] = None) -> None:
+        """
+        Count one request handled by a tier.
+
+        Args:
+            model: Model of the tier
+            seconds: Time spent in the tier
+            escalation: Reason the answer was passed on, None if it was used
+        """
+        outcome = escalation or OUTCOME_ACCEPTED
+        with self._lock:
+            stats = self._stats[model]
+            stats.calls += 1
+            stats.seconds += seconds
+            if escalation is None:
+                stats.accepted += 1
+            else:
+                stats.escalated[escalation] = stats.escalated.get(escalation, 0) + 1
+        _tier_calls.inc(model=model, outcome=outcome)
+        _tier_timer.observe(seconds, model=model)
+
+    def stats(self) -> List[TierStats]:
+        """Return a snapshot of the per-tier counters, cheapest tier first."""
+        with self._lock:
+            return [
+                TierStats(s.model, s.calls, s.accepted, dict(s.escalated), s.seconds)
+                for s in (self._stats[model] for model in self.models)
+            ]
+
+
+def models_from_env() -> List[str]:
+    """Read the cascade's models from CALENDAR_MODEL_CASCADE (comma-separated, cheapest first)."""
+    return [model.strip() for model in os.getenv("CALENDAR_MODEL_CASCADE", "").split(",") if model.strip()]
+
+
+_default_cascade: Optional[ModelCascade] = None
+_default_cascade_lock = threading.Lock()
+
+
+def get_model_cascade() -> Optional[ModelCascade]:
+    """
+    Get the process-wide model cascade, creating it on first use.
+
+    Configured through the CALENDAR_MODEL_CASCADE environment variable, a
+    comma-separated list of models cheapest first, e.g.
+    "gpt-4o-mini,gpt-4o". Unset or empty disables the cascade and every
+    crew uses the configured model.
+
+    Returns:
+        Optional[ModelCascade]: The shared cascade, or None when disabled
+    """
+    global _default_cascade
+    if _default_cascade is None:
+        models = models_from_env()
+        if not models:
+            return None
+        with _default_cascade_lock:
+            if _default_cascade is None:
+                _default_cascade = ModelCascade(list(dict.fromkeys(models)))
+    return _default_cascade
+
+
+def set_model_cascade(cascade: Optional[ModelCascade]) -> None:
+    """
+    Replace the process-wide model cascade.
+
+    Passing None makes the next get_model_cascade() call build the cascade
+    from the environment again.
+
+    Args:
+        cascade: Cascade to install, or None to reset
+    """
+    global _default_cascade
+    with _default_cascade_lock:
+        _default_cascade = cascade
@@ -0,0 +1,469 @@
+#!/usr/bin/env python
+"""
+Local conflict detection for newly proposed calendar events.
+
+Proposed events are checked against the user's existing events with an
+interval index before they are written, instead of relying on the prompt to
+keep the model from repeating or double-booking existing events. Duplicates
+are found by hash lookup and overlaps by an augmented interval tree, so each
+proposed event costs O(log n) plus the number of overlaps reported.
+
+Building the index is O(n log n), so it is not rebuilt per request: the
+checker is cached by the user and the version of the calendar it was
+built from (``CalendarState.existing_events_version``, bumped by the user
+state store whenever events are added) and built off the event loop on a
+miss.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .event_store import parse_event_datetime
+from .events import CalendarEvent
+from .fast_path import DEFAULT_TIMEZONE
+
+# What to do with conflicting proposed events
+POLICY_OFF = "off"                          # No checking
+POLICY_FLAG = "flag"                        # Keep everything, report conflicts
+POLICY_DROP_DUPLICATES = "drop-duplicates"  # Drop duplicates, report overlaps
+POLICY_DROP = "drop"                        # Drop duplicates and overlapping events
+CONFLICT_POLICIES = (POLICY_OFF, POLICY_FLAG, POLICY_DROP_DUPLICATES, POLICY_DROP)
+DEFAULT_CONFLICT_POLICY = POLICY_DROP_DUPLICATES
+
+DUPLICATE = "duplicate"
+OVERLAP = "overlap"
+
+# Conflict kinds each policy removes
+_DROP_KINDS = {POLICY_DROP_DUPLICATES: {DUPLICATE}, POLICY_DROP: {DUPLICATE, OVERLAP}}
+
+
+Event = Union[Dict[str, Any], CalendarEvent]
+
+
+def _summary(event: Event) -> str:
+    return event.summary if isinstance(event, CalendarEvent) else str(event.get("summary", ""))
+
+
+def _event_span(event: Event, timezone: str) -> Optional[Tuple[datetime, datetime]]:
+    """Return an event's (start, end), or None if either cannot be parsed."""
+    if isinstance(event, CalendarEvent):
+        # Already parsed and validated
+        return event.start, event.end
+    if not isinstance(event, dict):
+        return None
+    start = parse_event_datetime(event.get("start"), timezone)
+    end = parse_event_datetime(event.get("end"), timezone)
+    if start is None or end is None:
+        return None
+    return start, max(start, end)
+
+
+def _duplicate_key(event: Event, start: datetime, end: datetime) -> Tuple[Any, ...]:
+    summary = " ".join(_summary(event).lower().split())
+    return (start, end, summary)
+
+
+class IntervalIndex:
+    """
+    Static interval tree over event time spans.
+
+    Intervals are sorted by start and laid out as an implicit balanced tree
+    (the middle element of every range is the node), with each node storing
+    the largest end time in its subtree. An overlap query only descends into
+    subtrees that can still contain an overlapping interval.
+
+    Example:
+        >>> index = IntervalIndex.from_events(existing_events)
+        >>> index.overlapping(start, end)
+        [{'summary': 'Daily standup', ...}]
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime, Any]] = ()) -> None:
+        """
+        Args:
+            intervals: (start, end, item) triples with timezone-aware datetimes
+        """
+        ordered = sorted(intervals, key=lambda interval: interval[0])
+        self._starts = [interval[0] for interval in ordered]
+        self._ends = [interval[1] for interval in ordered]
+        self._items = [interval[2] for interval in ordered]
+        self._max_end: List[Optional[datetime]] = list(self._ends)
+        self._build(0, len(ordered))
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event], timezone: str = DEFAULT_TIMEZONE) -> "IntervalIndex":
+        """
+        Build an index over event dicts or CalendarEvents.
+
+        Events whose start or end cannot be parsed are skipped.
+
+        Args:
+            events: Existing events
+            timezone: Zone used for naive and all-day event times
+
+        Returns:
+            IntervalIndex: Index whose items are the events
+        """
+        intervals = []
+        for event in events:
+            span = _event_span(event, timezone)
+            if span is not None:
+                intervals.append((span[0], span[1], event))
+        return cls(intervals)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int) -> Optional[datetime]:
+        """Fill in subtree max ends for the range [lo, hi); returns its max end."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self._ends[mid]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self._max_end[mid] = best
+        return best
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Any]:
+        """
+        Return the items whose interval overlaps [start, end).
+
+        Args:
+            start: Query start (timezone aware)
+            end: Query end (timezone aware)
+
+        Returns:
+            List of overlapping items in start order
+        """
+        found: List[int] = []
+        stack = [(0, len(self._items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= start:
+                # Nothing in this subtree ends after the query starts
+                continue
+            stack.append((lo, mid))
+            if self._starts[mid] < end:
+                if self._ends[mid] > start:
+                    found.append(mid)
+                stack.append((mid + 1, hi))
+        return [self._items[i] for i in sorted(found)]
+
+
+@dataclass
+class EventConflict:
+    """
+    A proposed event that clashes with the calendar.
+
+    Attributes:
+        index: Position of the proposed event in the checked list
+        kind: "duplicate" or "overlap"
+        event: The proposed event (dict or CalendarEvent)
+        existing: Existing (or earlier proposed) events it clashes with
+        dropped: Whether the event was removed by the conflict policy
+    """
+    index: int
+    kind: str
+    event: Event
+    existing: List[Event] = field(default_factory=list)
+    dropped: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the conflict."""
+        return {
+            "index": self.index,
+            "kind": self.kind,
+            "summary": _summary(self.event),
+            "conflicts_with": [_summary(event) for event in self.existing],
+            "dropped": self.dropped,
+        }
+
+
+class ConflictChecker:
+    """
+    Checks proposed events against an index of existing events.
+
+    Example:
+        >>> checker = ConflictChecker(existing_events)
+        >>> kept, conflicts = checker.resolve(events_added, policy="drop-duplicates")
+    """
+
+    def __init__(self, existing_events: Iterable[Event] = (), timezone: str = DEFAULT_TIMEZONE) -> None:
+        """
+        Args:
+            existing_events: The user's existing events
+            timezone: Zone used for naive and all-day event times
+        """
+        self.timezone = timezone
+        intervals = []
+        self._duplicates: Dict[Tuple[Any, ...], Event] = {}
+        for event in existing_events:
+            span = _event_span(event, timezone)
+            if span is not None:
+                intervals.append((span[0], span[1], event))
+                self._duplicates.setdefault(_duplicate_key(event, *span), event)
+        self.index = IntervalIndex(intervals)
+
+    def find(self, proposed: List[Event]) -> List[EventConflict]:
+        """
+        Find duplicates and overlaps among proposed events.
+
+        Proposed events are also checked against each other, so an event the
+        model emitted twice is reported as a duplicate of the first copy.
+
+        Args:
+            proposed: Events about to be written, as dicts or CalendarEvents
+
+        Returns:
+            List of conflicts, at most one per proposed event
+        """
+        conflicts = []
+        seen: Dict[Tuple[Any, ...], Event] = {}
+        for i, event in enumerate(proposed):
+            span = _event_span(event, self.timezone)
+            if span is None:
+                continue
+            key = _duplicate_key(event, *span)
+            original = self._duplicates.get(key) or seen.get(key)
+            if original is not None:
+                conflicts.append(EventConflict(i, DUPLICATE, event, [original]))
+                continue
+            seen[key] = event
+            overlaps = self.index.overlapping(*span)
+            if overlaps:
+                conflicts.append(EventConflict(i, OVERLAP, event, overlaps))
+        return conflicts
+
+    def resolve(
+        self,
+        proposed: List[Event],
+        policy: str = DEFAULT_CONFLICT_POLICY,
+    ) -> Tuple[List[Event], List[EventConflict]]:
+        """
+        Apply a conflict policy to proposed events.
+
+        Args:
+            proposed: Events about to be written
+            policy: One of CONFLICT_POLICIES
+
+        Returns:
+            Tuple of (events to keep, conflicts found)
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy: {policy!r}")
+        if policy == POLICY_OFF:
+            return proposed, []
+
+        conflicts = self.find(proposed)
+        drop_kinds = _DROP_KINDS.get(policy, set())
+        dropped = set()
+        for conflict in conflicts:
+            if conflict.kind in drop_kinds:
+                conflict.dropped = True
+                dropped.add(conflict.index)
+        kept = [event for i, event in enumerate(proposed) if i not in dropped]
+        return kept, conflicts
+
+
+class ConflictStream:
+    """
+    Applies a conflict policy to proposed events one at a time, e.g. while streaming.
+
+    Each event is checked against the checker's existing events and against
+    the events kept before it, so a stream of k events costs k index lookups
+    instead of k rebuilds of the checker. The checker itself is not
+    modified and can be shared.
+
+    Example:
+        >>> stream = ConflictStream(checker, policy="drop-duplicates")
+        >>> keep, conflict = stream.resolve(event)
+    """
+
+    def __init__(self, checker: ConflictChecker, policy: str = DEFAULT_CONFLICT_POLICY) -> None:
+        """
+        Args:
+            checker: Index of the existing events
+            policy: One of CONFLICT_POLICIES
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy: {policy!r}")
+        self.checker = checker
+        self.policy = policy
+        self._proposed = 0
+        self._kept: Dict[Tuple[Any, ...], Event] = {}
+
+    def resolve(self, event: Event) -> Tuple[bool, Optional[EventConflict]]:
+        """
+        Check one more proposed event.
+
+        Args:
+            event: Event about to be written
+
+        Returns:
+            Tuple of (whether to keep the event, its conflict or None)
+        """
+        index = self._proposed
+        self._proposed += 1
+        span = _event_span(event, self.checker.timezone)
+        if self.policy == POLICY_OFF or span is None:
+            return True, None
+
+        key = _duplicate_key(event, *span)
+        original = self.checker._duplicates.get(key) or self._kept.get(key)
+        conflict = None
+        if original is not None:
+            conflict = EventConflict(index, DUPLICATE, event, [original])
+        else:
+            overlaps = self.checker.index.overlapping(*span)
+            if overlaps:
+                conflict = EventConflict(index, OVERLAP, event, overlaps)
+        keep = conflict is None or conflict.kind not in _DROP_KINDS.get(self.policy, set())
+        if conflict is not None:
+            conflict.dropped = not keep
+        if keep:
+            self._kept[key] = event
+        return keep, conflict
+
+
+# Calendars smaller than this are indexed inline; a thread hop costs more
+_INLINE_BUILD_EVENTS = 1000
+DEFAULT_CHECKER_CACHE_SIZE = 64
+
+
+class ConflictCheckerCache:
+    """
+    LRU of ConflictCheckers keyed by user and calendar version.
+
+    A version must identify the contents of one user's event list, e.g. the
+    user state store's revision or a calendar sync token; a new version
+    replaces the cached checker the next time it is requested. Versions
+    only need to be unique per user, since a host's counters or sync tokens
+    may repeat across users.
+
+    Example:
+        >>> cache = ConflictCheckerCache(max_entries=64)
+        >>> checker = await cache.get(
+        ...     state.existing_events_version, state.existing_event_list, state.time_zone, state.user_id
+        ... )
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CHECKER_CACHE_SIZE) -> None:
+        """
+        Args:
+            max_entries: Checkers kept; 0 disables caching but still builds off the event loop
+
+        Raises:
+            ValueError: If max_entries is negative
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._checkers: "OrderedDict[Tuple[str, str, str], ConflictChecker]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._checkers)
+
+    async def get(
+        self,
+        version: Optional[str],
+        existing_events: List[Event],
+        timezone: str = DEFAULT_TIMEZONE,
+        user_id: str = "",
+    ) -> ConflictChecker:
+        """
+        Return the checker for a calendar, building it off the event loop on a miss.
+
+        Args:
+            version: Identifies the contents of existing_events, None if unknown (never cached)
+            existing_events: The user's existing events
+            timezone: Zone used for naive and all-day event times
+            user_id: Owner of the calendar; versions of different users never share a checker
+
+        Returns:
+            ConflictChecker: Cached or freshly built checker
+        """
+        key = (user_id, version, timezone) if version else None
+        if key is not None:
+            with self._lock:
+                checker = self._checkers.get(key)
+                if checker is not None:
+                    self._checkers.move_to_end(key)
+                    self.hits += 1
+                    return checker
+                self.misses += 1
+
+        if len(existing_events) < _INLINE_BUILD_EVENTS:
+            checker = ConflictChecker(existing_events, timezone)
+        else:
+            checker = await asyncio.to_thread(ConflictChecker, existing_events, timezone)
+        if key is not None and self.max_entries:
+            with self._lock:
+                self._checkers[key] = checker
+                self._checkers.move_to_end(key)
+                while len(self._checkers) > self.max_entries:
+                    self._checkers.popitem(last=False)
+        return checker
+
+
+_default_checker_cache: Optional[ConflictCheckerCache] = None
+_default_checker_cache_lock = threading.Lock()
+
+
+def get_conflict_checker_cache() -> ConflictCheckerCache:
+    """
+    Get the process-wide conflict checker cache, creating it on first use.
+
+    Its size is read from CALENDAR_CONFLICT_CACHE_SIZE (default 64, 0 to
+    disable caching).
+
+    Returns:
+        ConflictCheckerCache: The shared cache
+    """
+    global _default_checker_cache
+    if _default_checker_cache is None:
+        with _default_checker_cache_lock:
+            if _default_checker_cache is None:
+                _default_checker_cache = ConflictCheckerCache(
+                    int(os.getenv("CALENDAR_CONFLICT_CACHE_SIZE", DEFAULT_CHECKER_CACHE_SIZE))
+                )
+    return _default_checker_cache
+
+
+def set_conflict_checker_cache(cache: Optional[ConflictCheckerCache]) -> None:
+    """
+    Replace the process-wide conflict checker cache.
+
+    Args:
+        cache: Cache to install, or None to build a default one on next use
+    """
+    global _default_checker_cache
+    with _default_checker_cache_lock:
+        _default_checker_cache = cache
+
+
+def conflict_policy_from_env() -> str:
+    """Read the conflict policy (CALENDAR_CONFLICT_POLICY, default drop-duplicates)."""
+    policy = os.getenv("CALENDAR_CONFLICT_POLICY", DEFAULT_CONFLICT_POLICY).strip().lower()
+    return policy if policy in CONFLICT_POLICIES else DEFAULT_CONFLICT_POLICY
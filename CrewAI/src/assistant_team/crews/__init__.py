@@ -8,5 +8,8 @@ License: MIT
 """
 
 from .calendar_crew.calendar_crew import CalendarCrew
+from .calendar_crew.crew_pool import CalendarCrewPool, get_crew_pool, set_crew_pool
+from .calendar_crew.llm_backend import RecordingLLM, RecordingStore, ReplayLLM, get_llm_backend, get_recording_store, set_llm_backend
 
-__all__ = ["CalendarCrew"] 
\ No newline at end of file
+__all__ = ["CalendarCrew", "CalendarCrewPool", "get_crew_pool", "set_crew_pool",
+           "RecordingLLM", "RecordingStore", "ReplayLLM", "get_llm_backend", "get_recording_store", "set_llm_backend"] 
\ No newline at end of file
@@ -8,12 +8,15 @@ Author: Assistant Team Developer
 License: MIT
 """
 
-from crewai import Agent, Crew, Process, Task
+from typing import Optional
+
+from crewai import Agent, BaseLLM, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from dotenv import load_dotenv
+from crewai.utilities.llm_utils import create_llm
 
-# Load environment variables
-load_dotenv()
+from ...rate_limit import get_provider_limiter
+from ...wire_format import OUTPUT_COMPACT, output_format_from_env
+from .llm_backend import RateLimitedLLM, RecordingLLM, get_llm_backend, get_recording_store
 
 
 @CrewBase
@@ -32,17 +35,47 @@ class CalendarCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self, model: Optional[str] = None, llm: Optional[BaseLLM] = None) -> None:
+        """
+        Args:
+            model: LLM for the agent in live mode, e.g. a model cascade tier;
+                defaults to the one configured in agents.yaml or the environment
+            llm: Backend to use instead of any configured LLM, e.g. a stub in benchmarks
+        """
+        self.model = model
+        self.llm = llm
+
     @agent
     def calendar_event_manager(self) -> Agent:
         """
         Create the Calendar Event Manager agent.
         
         This agent specializes in interpreting user requests and managing
-        calendar information with natural language understanding.
+        calendar information with natural language understanding. In replay
+        mode (CALENDAR_LLM_MODE) it uses the backend from get_llm_backend()
+        instead of the configured LLM, whatever the crew's model; in record
+        mode the crew's own LLM is wrapped in a RecordingLLM. Unless
+        CALENDAR_LLM_LIMITER=off, its calls go through the shared provider
+        limiter.
         
         Returns:
             Agent: Configured calendar event manager agent
         """
+        llm_backend = self.llm or get_llm_backend()
+        recordings = get_recording_store() if llm_backend is None else None
+        limiter = get_provider_limiter()
+        if llm_backend is None and (self.model or recordings is not None or limiter is not None):
+            llm_backend = create_llm(self.model or self.agents_config["Calendar_event_manager"].get("llm"))
+        if recordings is not None:
+            llm_backend = RecordingLLM(llm_backend, recordings)
+        if limiter is not None:
+            llm_backend = RateLimitedLLM(llm_backend, limiter)
+        if llm_backend is not None:
+            return Agent(
+                config=self.agents_config["Calendar_event_manager"],
+                llm=llm_backend,
+                verbose=True,
+            )
         return Agent(
             config=self.agents_config["Calendar_event_manager"],
             verbose=True,
@@ -54,14 +87,19 @@ class CalendarCrew:
         Create the calendar events creation task.
         
         This task processes user input and generates structured calendar
-        events in the proper format for calendar integration.
+        events in the proper format for calendar integration. With
+        CALENDAR_OUTPUT_FORMAT=compact the model is asked for positional
+        arrays instead, which the flow expands locally.
         
         Returns:
             Task: Configured calendar event creation task
         """
+        config_key = "Create_calendar_events"
+        if output_format_from_env() == OUTPUT_COMPACT:
+            config_key = "Create_calendar_events_compact"
         return Task(
-            config=self.tasks_config["Create_calendar_events"],
-            agent=self.calendar_event_manager,
+            config=self.tasks_config[config_key],
+            agent=self.calendar_event_manager(),
         )
 
     @crew
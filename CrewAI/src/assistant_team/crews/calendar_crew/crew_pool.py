@@ -0,0 +1,426 @@
+"""
+Calendar Crew Pool
+
+This module keeps a warm pool of pre-built calendar crews so that flows do
+not pay for YAML loading, Agent/Task/Crew construction and LLM client setup
+on every request.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from ...log import get_logger
+from ...metrics import get_metrics
+from ...utils import load_env
+from .calendar_crew import CalendarCrew
+from .llm_backend import ChunkCallback, stream_chunks
+
+logger = get_logger(__name__)
+
+# Default number of crews kept warm, overridable via CALENDAR_CREW_POOL_SIZE
+DEFAULT_POOL_SIZE = 4
+
+# Put on the idle queue when a crew's slot is given up, so a waiter in acquire() builds a replacement
+_REBUILD = object()
+
+_build_timer = get_metrics().timer("calendar_crew_build_seconds", "Time spent building a calendar crew")
+_llm_timer = get_metrics().timer("calendar_llm_call_seconds", "Time spent in crew kickoff (LLM round trips)")
+
+
+def _build_calendar_crew(model: Optional[str] = None) -> Any:
+    """Build a fresh calendar crew (the cold path), optionally for a specific model."""
+    load_env()
+    return CalendarCrew(model=model).crew()
+
+
+class CalendarCrewPool:
+    """
+    Thread-safe pool of reusable calendar crews.
+
+    Crews are built lazily up to ``size`` and handed out to concurrent flows.
+    A checked-out crew is reset before it goes back into the pool so that no
+    task output or tool results leak into the next request.
+
+    Example:
+        >>> pool = CalendarCrewPool(size=2)
+        >>> with pool.lease() as crew:
+        ...     result = crew.kickoff(inputs=crew_inputs)
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Args:
+            size: Maximum number of crews built and kept warm
+            factory: Callable returning a new crew, defaults to CalendarCrew().crew()
+
+        Raises:
+            ValueError: If size is smaller than 1
+        """
+        if size < 1:
+            raise ValueError("Crew pool size must be at least 1")
+
+        self.size = size
+        self._factory = factory or _build_calendar_crew
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._waiting = 0         # Callers blocked in acquire()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Runs calls on crews checked out beforehand, see kickoff_async()
+        self._leased_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def created(self) -> int:
+        """Number of crews built by this pool so far."""
+        return self._created
+
+    @property
+    def idle(self) -> int:
+        """Number of crews currently waiting in the pool."""
+        return self._idle.qsize()
+
+    def warm_up(self, count: Optional[int] = None) -> None:
+        """
+        Eagerly build crews so the first requests skip the cold path.
+
+        Args:
+            count: Number of crews to have ready, defaults to the pool size
+        """
+        target = min(count or self.size, self.size)
+        built = []
+        while self._created < target:
+            crew = self._try_create()
+            if crew is None:
+                break
+            built.append(crew)
+        for crew in built:
+            self._idle.put_nowait(crew)
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Check out a crew, building one if the pool is not yet full.
+
+        Args:
+            timeout: Seconds to wait for a free crew, None waits forever
+
+        Returns:
+            A ready-to-use crew
+
+        Raises:
+            TimeoutError: If no crew became available within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            crew = self._idle.get_nowait()
+        except queue.Empty:
+            crew = _REBUILD
+
+        while crew is _REBUILD:
+            # Counted before checking capacity, so a slot freed in between still wakes us
+            with self._lock:
+                self._waiting += 1
+            try:
+                crew = self._try_create()
+                if crew is None:
+                    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    crew = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(f"No calendar crew available after {timeout}s")
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return crew
+
+    def try_kickoff_async(
+        self,
+        inputs: Dict[str, Any],
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> "Optional[asyncio.Future[Any]]":
+        """
+        Start a kickoff only if a crew is idle or can still be built, without waiting.
+
+        A crew that still has to be built is built on the executor thread,
+        so a pool nobody warmed up (e.g. the hedge model's) can serve the
+        call. Must be called from a coroutine.
+
+        Args:
+            inputs: Inputs passed to Crew.kickoff()
+            on_chunk: Called on the executor thread with LLM response text as it streams in
+
+        Returns:
+            Future of the crew output, or None if every crew is busy
+        """
+        try:
+            crew = self._idle.get_nowait()
+        except queue.Empty:
+            crew = _REBUILD
+        if crew is _REBUILD:
+            crew = None
+            if not self._reserve():
+                return None
+
+        # Runs on a second executor, so it never queues behind calls still waiting for a crew
+        future = self._get_executor(leased=True).submit(self._kickoff_leased, inputs, on_chunk, crew)
+
+        def give_back(done: "Future[Any]") -> None:
+            # A call cancelled before it started still holds its crew or build slot
+            if done.cancelled():
+                if crew is None:
+                    self._unreserve()
+                else:
+                    self.release(crew)
+
+        future.add_done_callback(give_back)
+        return asyncio.wrap_future(future)
+
+    def release(self, crew: Any) -> None:
+        """
+        Reset a crew and return it to the pool.
+
+        Args:
+            crew: Crew previously obtained from acquire()
+        """
+        try:
+            self._reset(crew)
+        except Exception as e:
+            # A crew we cannot reset is not safe to reuse; drop it
+            logger.warning("⚠️ Discarding calendar crew that failed to reset: %s", e)
+            self._unreserve()
+            return
+
+        self._idle.put_nowait(crew)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Context manager that acquires a crew and always releases it.
+
+        Args:
+            timeout: Seconds to wait for a free crew, None waits forever
+
+        Yields:
+            A ready-to-use crew
+        """
+        crew = self.acquire(timeout=timeout)
+        try:
+            yield crew
+        finally:
+            self.release(crew)
+
+    def kickoff(
+        self,
+        inputs: Dict[str, Any],
+        timeout: Optional[float] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        crew: Optional[Any] = None,
+    ) -> Any:
+        """
+        Run a crew from the pool synchronously.
+
+        Args:
+            inputs: Inputs passed to Crew.kickoff()
+            timeout: Seconds to wait for a free crew, None waits forever
+            on_chunk: Called on this thread with LLM response text as it streams in
+            crew: Crew already checked out to run instead of acquiring one; released afterwards
+
+        Returns:
+            The crew output
+        """
+        if crew is None:
+            crew = self.acquire(timeout=timeout)
+        try:
+            with _llm_timer.time():
+                if on_chunk is None:
+                    return crew.kickoff(inputs=inputs)
+                with stream_chunks(on_chunk, crew):
+                    return crew.kickoff(inputs=inputs)
+        finally:
+            self.release(crew)
+
+    async def kickoff_async(
+        self,
+        inputs: Dict[str, Any],
+        timeout: Optional[float] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> Any:
+        """
+        Run a crew from the pool without blocking the event loop.
+
+        Waiting for a free crew and the blocking LLM round trip both happen
+        on the pool's own thread executor, sized to the pool, so a slow
+        completion never stalls other coroutines on the loop.
+
+        Args:
+            inputs: Inputs passed to Crew.kickoff()
+            timeout: Seconds to wait for a free crew, None waits forever
+            on_chunk: Called on the executor thread with LLM response text as it streams in
+
+        Returns:
+            The crew output
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(self.kickoff, inputs, timeout, on_chunk))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the pool's executor thread pools.
+
+        Args:
+            wait: Block until running kickoffs have finished
+        """
+        with self._lock:
+            executors = (self._executor, self._leased_executor)
+            self._executor = self._leased_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=wait)
+
+    def _get_executor(self, leased: bool = False) -> ThreadPoolExecutor:
+        """Return the executor used by kickoff_async(), creating it on first use."""
+        attribute = "_leased_executor" if leased else "_executor"
+        if getattr(self, attribute) is None:
+            with self._lock:
+                if getattr(self, attribute) is None:
+                    setattr(self, attribute, ThreadPoolExecutor(
+                        max_workers=self.size, thread_name_prefix="calendar-crew-leased" if leased else "calendar-crew"
+                    ))
+        return getattr(self, attribute)
+
+    def _kickoff_leased(self, inputs: Dict[str, Any], on_chunk: Optional[ChunkCallback], crew: Optional[Any]) -> Any:
+        """Body of try_kickoff_async(): build the crew if only a slot was reserved, then run it."""
+        if crew is None:
+            crew = self._build()
+        return self.kickoff(inputs, on_chunk=on_chunk, crew=crew)
+
+    def _try_create(self) -> Optional[Any]:
+        """Build a new crew if the pool has capacity left, otherwise return None."""
+        if not self._reserve():
+            return None
+        return self._build()
+
+    def _reserve(self) -> bool:
+        """Claim capacity for one more crew; False if the pool is full."""
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _unreserve(self) -> None:
+        """Give back capacity claimed by _reserve(), e.g. of a dropped crew, waking one waiter to use it."""
+        with self._lock:
+            self._created -= 1
+            if not self._waiting:
+                return
+        try:
+            self._idle.put_nowait(_REBUILD)
+        except queue.Full:
+            # Every slot holds an idle crew, so nobody is waiting after all
+            pass
+
+    def _build(self) -> Any:
+        """Build a crew for capacity already claimed with _reserve()."""
+        try:
+            with _build_timer.time():
+                return self._factory()
+        except Exception:
+            self._unreserve()
+            raise
+
+    @staticmethod
+    def _reset(crew: Any) -> None:
+        """Clear per-run state left on the crew, its tasks and its agents."""
+        for task in getattr(crew, "tasks", []):
+            task.output = None
+            if hasattr(task, "retry_count"):
+                task.retry_count = 0
+        for agent in getattr(crew, "agents", []):
+            if hasattr(agent, "tools_results"):
+                agent.tools_results = []
+        if hasattr(crew, "usage_metrics"):
+            crew.usage_metrics = None
+
+
+_default_pool: Optional[CalendarCrewPool] = None
+_model_pools: Dict[str, CalendarCrewPool] = {}
+_default_pool_lock = threading.Lock()
+
+
+def _pool_size_from_env() -> int:
+    """Read the crew pool size (CALENDAR_CREW_POOL_SIZE, default DEFAULT_POOL_SIZE)."""
+    value = os.getenv("CALENDAR_CREW_POOL_SIZE", "").strip()
+    if not value:
+        return DEFAULT_POOL_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        logger.warning("⚠️ Invalid CALENDAR_CREW_POOL_SIZE %r, using %d", value, DEFAULT_POOL_SIZE)
+        return DEFAULT_POOL_SIZE
+    return size
+
+
+def get_crew_pool(model: Optional[str] = None) -> CalendarCrewPool:
+    """
+    Get the process-wide calendar crew pool, creating it on first use.
+
+    The pool size is read from the CALENDAR_CREW_POOL_SIZE environment
+    variable and falls back to DEFAULT_POOL_SIZE when it is unset or not a
+    positive integer. Each model of a model
+    cascade gets a pool of its own.
+
+    Args:
+        model: Model the pool's crews use, None for the configured one
+
+    Returns:
+        CalendarCrewPool: The shared crew pool
+    """
+    global _default_pool
+    pool = _default_pool if model is None else _model_pools.get(model)
+    if pool is None:
+        with _default_pool_lock:
+            pool = _default_pool if model is None else _model_pools.get(model)
+            if pool is None:
+                size = _pool_size_from_env()
+                if model is None:
+                    pool = _default_pool = CalendarCrewPool(size=size)
+                else:
+                    pool = _model_pools[model] = CalendarCrewPool(size=size, factory=partial(_build_calendar_crew, model))
+    return pool
+
+
+def set_crew_pool(pool: Optional[CalendarCrewPool], model: Optional[str] = None) -> None:
+    """
+    Replace the process-wide calendar crew pool.
+
+    Useful for sizing the pool explicitly at startup or for running flows
+    against stub crews. Passing None makes the next get_crew_pool() call
+    build a default pool again.
+
+    Args:
+        pool: Pool to install, or None to reset
+        model: Replace the pool of this cascade model instead of the default pool
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if model is None:
+            _default_pool = pool
+        elif pool is None:
+            _model_pools.pop(model, None)
+        else:
+            _model_pools[model] = pool
@@ -0,0 +1,540 @@
+"""
+Pluggable LLM backends for the Calendar Crew
+
+The calendar agent normally talks to a paid LLM provider, which makes load
+tests slow, rate-limited and non-deterministic. This module adds two
+alternative backends selected with CALENDAR_LLM_MODE:
+
+- ``record``: calls the real LLM and appends every prompt/response pair to a
+  JSONL recording file.
+- ``replay``: answers from a recording file without any network access,
+  with configurable injected latency (per call and per output token) and
+  error rate.
+
+Prompts are matched on their messages with the current date and time masked
+out, so a recording made today still replays tomorrow.
+
+``stream_chunks`` routes the text of a running crew's LLM response to a
+callback as it is generated: live LLMs are switched to streaming and their
+chunk events forwarded, and ReplayLLM emits its response piece by piece.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from crewai import BaseLLM
+
+from ...history import CHARS_PER_TOKEN, estimate_tokens
+from ...log import get_logger
+from ...rate_limit import ProviderLimiter
+
+logger = get_logger(__name__)
+
+LLM_MODE_LIVE = "live"
+LLM_MODE_RECORD = "record"
+LLM_MODE_REPLAY = "replay"
+LLM_MODES = (LLM_MODE_LIVE, LLM_MODE_RECORD, LLM_MODE_REPLAY)
+
+DEFAULT_RECORDINGS_PATH = "calendar_llm_recordings.jsonl"
+
+# What replay does with a prompt that was never recorded
+ON_MISS_ERROR = "error"  # Raise ReplayMissError
+ON_MISS_CYCLE = "cycle"  # Serve recorded responses round-robin
+
+# get_current_date() output; masked so recordings survive across days
+_CURRENT_DATE_RE = re.compile(r"day: \d+, month: \d+, year: \d+, time: \d{2}:\d{2} [AP]M")
+
+# Characters ReplayLLM emits per stream chunk
+STREAM_CHUNK_CHARS = 4 * CHARS_PER_TOKEN
+
+Messages = Union[str, List[Dict[str, str]]]
+ChunkCallback = Callable[[str], None]
+
+
+class ReplayMissError(KeyError):
+    """Raised in replay mode when a prompt has no recorded response."""
+
+
+class InjectedLLMError(RuntimeError):
+    """Failure injected by ReplayLLM to simulate provider errors."""
+
+
+def prompt_key(messages: Messages) -> str:
+    """
+    Build the lookup key of a prompt.
+
+    Args:
+        messages: Prompt string or chat messages passed to BaseLLM.call()
+
+    Returns:
+        str: Hex digest of the messages with the current date masked
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    normalized = [
+        [message.get("role", ""), _CURRENT_DATE_RE.sub("<current_date>", str(message.get("content", "")))]
+        for message in messages
+    ]
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+def prompt_tokens(messages: Messages) -> int:
+    """Estimate the tokens of a prompt string or chat messages."""
+    if isinstance(messages, str):
+        return estimate_tokens(messages)
+    return sum(estimate_tokens(str(message.get("content", ""))) for message in messages)
+
+
+_stream_local = threading.local()
+_stream_handler_lock = threading.Lock()
+_stream_handler_registered = False
+
+
+def _current_chunk_callback() -> Optional[ChunkCallback]:
+    return getattr(_stream_local, "callback", None)
+
+
+def _forward_stream_chunk(source: Any, event: Any) -> None:
+    """Event bus handler: pass streamed text to the callback of the emitting thread."""
+    callback = _current_chunk_callback()
+    if callback is not None and event.tool_call is None:
+        callback(event.chunk)
+
+
+def _register_stream_handler() -> None:
+    global _stream_handler_registered
+    if _stream_handler_registered:
+        return
+    with _stream_handler_lock:
+        if not _stream_handler_registered:
+            from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _forward_stream_chunk)
+            _stream_handler_registered = True
+
+
+@contextmanager
+def stream_chunks(callback: ChunkCallback, crew: Any = None) -> Iterator[None]:
+    """
+    Deliver LLM response text to a callback while a crew runs on this thread.
+
+    Chunk events are emitted on the thread that runs the crew, so the
+    callback is bound to the current thread and a pool of crews can stream
+    to different callers at once. The callback runs on that thread too.
+
+    Args:
+        callback: Called with each piece of response text as it arrives
+        crew: Crew whose live LLM clients are switched to streaming for the duration
+
+    Example:
+        >>> with stream_chunks(scanner.feed, crew):
+        ...     crew.kickoff(inputs=crew_inputs)
+    """
+    _register_stream_handler()
+    switched = []
+    for agent in getattr(crew, "agents", []):
+        llm = getattr(agent, "llm", None)
+        # RecordingLLM and RateLimitedLLM wrap the provider client
+        while getattr(llm, "inner", None) is not None:
+            llm = llm.inner
+        # Provider clients have a stream flag; ReplayLLM streams on its own
+        if getattr(llm, "stream", None) is False:
+            llm.stream = True
+            switched.append(llm)
+    previous = _current_chunk_callback()
+    _stream_local.callback = callback
+    try:
+        yield
+    finally:
+        _stream_local.callback = previous
+        for llm in switched:
+            llm.stream = False
+
+
+class RecordingStore:
+    """
+    Append-only JSONL file of prompt/response pairs.
+
+    Each line holds the prompt key, the messages, the response text, the
+    model and the observed latency of the real call.
+    """
+
+    def __init__(self, path: str = DEFAULT_RECORDINGS_PATH) -> None:
+        """
+        Args:
+            path: Recording file, created on the first append
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, messages: Messages, response: str, model: str = "", latency: float = 0.0) -> None:
+        """
+        Record one prompt/response pair.
+
+        Args:
+            messages: Prompt sent to the LLM
+            response: Text the LLM returned
+            model: Model that produced the response
+            latency: Seconds the real call took
+        """
+        record = {
+            "key": prompt_key(messages),
+            "messages": messages,
+            "response": response,
+            "model": model,
+            "latency": round(latency, 4),
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Read all recorded pairs, skipping corrupt lines.
+
+        Returns:
+            List of record dicts in file order
+        """
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and "key" in record and "response" in record:
+                    records.append(record)
+        return records
+
+
+class RecordingLLM(BaseLLM):
+    """
+    Wraps a real LLM and records every prompt/response pair.
+
+    Example:
+        >>> llm = RecordingLLM(create_llm("gpt-4o-mini"), RecordingStore("recordings.jsonl"))
+        >>> Agent(config=..., llm=llm)
+    """
+
+    def __init__(self, inner: BaseLLM, store: RecordingStore) -> None:
+        """
+        Args:
+            inner: LLM that answers the prompts
+            store: Where pairs are recorded
+        """
+        super().__init__(model=inner.model, temperature=getattr(inner, "temperature", None))
+        self.inner = inner
+        self.store = store
+        self.stop = getattr(inner, "stop", None) or []
+
+    def call(
+        self,
+        messages: Messages,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        start = time.perf_counter()
+        response = self.inner.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+        )
+        if isinstance(response, str):
+            self.store.append(messages, response, self.model, time.perf_counter() - start)
+        return response
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+
+class RateLimitedLLM(BaseLLM):
+    """
+    Wraps an LLM so every call goes through a ProviderLimiter.
+
+    Example:
+        >>> llm = RateLimitedLLM(create_llm("gpt-4o-mini"), get_provider_limiter())
+        >>> Agent(config=..., llm=llm)
+    """
+
+    def __init__(self, inner: BaseLLM, limiter: ProviderLimiter) -> None:
+        """
+        Args:
+            inner: LLM that answers the prompts
+            limiter: Limiter shared by all clients of the same provider account
+        """
+        super().__init__(model=inner.model, temperature=getattr(inner, "temperature", None))
+        self.inner = inner
+        self.limiter = limiter
+        self.stop = getattr(inner, "stop", None) or []
+
+    def call(
+        self,
+        messages: Messages,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        return self.limiter.call(
+            lambda: self.inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            ),
+            prompt_tokens=prompt_tokens(messages),
+            count_tokens=estimate_tokens,
+        )
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+
+class ReplayLLM(BaseLLM):
+    """
+    Serves recorded responses locally with injected latency and errors.
+
+    Thread-safe, so one instance can back every crew in the pool.
+
+    Example:
+        >>> llm = ReplayLLM(RecordingStore("recordings.jsonl").load(), latency=0.2, error_rate=0.01)
+        >>> Agent(config=..., llm=llm)
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        on_miss: str = ON_MISS_ERROR,
+        seed: Optional[int] = None,
+        token_latency: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            records: Pairs loaded from a RecordingStore
+            latency: Seconds every call blocks for, like a provider round trip
+            jitter: Extra uniformly random latency of up to this many seconds
+            error_rate: Fraction of calls that raise InjectedLLMError
+            on_miss: "error" or "cycle" for prompts that were never recorded
+            seed: Seed for the latency and error randomness
+            token_latency: Extra seconds per (estimated) output token, so
+                longer responses take longer like real generation does
+
+        Raises:
+            ValueError: If error_rate or on_miss is invalid
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        if on_miss not in (ON_MISS_ERROR, ON_MISS_CYCLE):
+            raise ValueError(f"Unknown on_miss behaviour: {on_miss!r}")
+
+        models = {record.get("model") for record in records if record.get("model")}
+        super().__init__(model=models.pop() if len(models) == 1 else "replay")
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.on_miss = on_miss
+        self.calls = 0
+        self.misses = 0
+        self.injected_errors = 0
+        self._responses: Dict[str, str] = {}
+        for record in records:
+            # The latest recording of a prompt wins
+            self._responses[record["key"]] = record["response"]
+        self._ordered = [record["response"] for record in records]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def call(
+        self,
+        messages: Messages,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+
+        response = None if fail else self._responses.get(prompt_key(messages))
+        if response is None and not fail:
+            with self._lock:
+                self.misses += 1
+            if self.on_miss == ON_MISS_CYCLE and self._ordered:
+                response = self._ordered[index % len(self._ordered)]
+        callback = _current_chunk_callback() if response is not None else None
+        if callback is not None:
+            if delay > 0:
+                time.sleep(delay)
+            for i in range(0, len(response), STREAM_CHUNK_CHARS):
+                chunk = response[i:i + STREAM_CHUNK_CHARS]
+                if self.token_latency > 0:
+                    time.sleep(self.token_latency * estimate_tokens(chunk))
+                callback(chunk)
+            return response
+        if response is not None:
+            delay += self.token_latency * estimate_tokens(response)
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise InjectedLLMError("Injected LLM failure (replay mode)")
+        if response is None:
+            raise ReplayMissError("No recorded response for this prompt; record it first with CALENDAR_LLM_MODE=record")
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Return call, miss and injected error counters."""
+        with self._lock:
+            return {"calls": self.calls, "misses": self.misses, "injected_errors": self.injected_errors}
+
+
+_default_backend: Optional[BaseLLM] = None
+_default_backend_lock = threading.Lock()
+_recording_store: Optional[RecordingStore] = None
+
+
+def llm_mode() -> str:
+    """
+    Read CALENDAR_LLM_MODE.
+
+    Returns:
+        str: "live" (default), "record" or "replay"
+
+    Raises:
+        ValueError: If CALENDAR_LLM_MODE is unknown
+    """
+    mode = os.getenv("CALENDAR_LLM_MODE", LLM_MODE_LIVE).strip().lower()
+    if mode not in LLM_MODES:
+        raise ValueError(f"Unknown CALENDAR_LLM_MODE: {mode!r}")
+    return mode
+
+
+def get_recording_store() -> Optional[RecordingStore]:
+    """
+    Get the process-wide recording store in record mode, creating it on first use.
+
+    Each crew wraps the LLM of its own model in a RecordingLLM writing to
+    this store, so agents.yaml, cascade and hedge models are recorded as
+    what they are.
+
+    Returns:
+        Optional[RecordingStore]: Store at CALENDAR_LLM_RECORDINGS, or None
+        unless CALENDAR_LLM_MODE is "record" and no backend is installed
+    """
+    global _recording_store
+    if _default_backend is not None or llm_mode() != LLM_MODE_RECORD:
+        return None
+    if _recording_store is None:
+        with _default_backend_lock:
+            if _recording_store is None:
+                _recording_store = RecordingStore(os.getenv("CALENDAR_LLM_RECORDINGS", DEFAULT_RECORDINGS_PATH))
+                logger.info("🎞️ Calendar LLM backend: %s (%s)", LLM_MODE_RECORD, _recording_store.path)
+    return _recording_store
+
+
+def get_llm_backend() -> Optional[BaseLLM]:
+    """
+    Get the process-wide LLM backend for the calendar agent, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_LLM_MODE: "live" (default), "record" or "replay"
+        CALENDAR_LLM_RECORDINGS: Recording file (default calendar_llm_recordings.jsonl)
+        CALENDAR_LLM_REPLAY_LATENCY: Seconds each replayed call takes (default 0)
+        CALENDAR_LLM_REPLAY_JITTER: Extra random latency in seconds (default 0)
+        CALENDAR_LLM_REPLAY_TOKEN_LATENCY: Extra seconds per output token (default 0)
+        CALENDAR_LLM_REPLAY_ERROR_RATE: Fraction of replayed calls that fail (default 0)
+        CALENDAR_LLM_REPLAY_ON_MISS: "error" (default) or "cycle"
+        CALENDAR_LLM_REPLAY_SEED: Seed for latency jitter and injected errors
+
+    Returns:
+        Optional[BaseLLM]: The backend installed with set_llm_backend() or built
+        from the environment, or None in live and record mode (the agent's own
+        LLM is used, in record mode wrapped in a RecordingLLM; see
+        get_recording_store())
+
+    Raises:
+        ValueError: If CALENDAR_LLM_MODE is unknown
+    """
+    global _default_backend
+    if _default_backend is not None:
+        return _default_backend
+
+    mode = llm_mode()
+    if mode != LLM_MODE_REPLAY:
+        return None
+
+    if _default_backend is None:
+        with _default_backend_lock:
+            if _default_backend is None:
+                store = RecordingStore(os.getenv("CALENDAR_LLM_RECORDINGS", DEFAULT_RECORDINGS_PATH))
+                seed = os.getenv("CALENDAR_LLM_REPLAY_SEED")
+                _default_backend = ReplayLLM(
+                    store.load(),
+                    latency=float(os.getenv("CALENDAR_LLM_REPLAY_LATENCY", 0)),
+                    jitter=float(os.getenv("CALENDAR_LLM_REPLAY_JITTER", 0)),
+                    error_rate=float(os.getenv("CALENDAR_LLM_REPLAY_ERROR_RATE", 0)),
+                    on_miss=os.getenv("CALENDAR_LLM_REPLAY_ON_MISS", ON_MISS_ERROR).strip().lower(),
+                    seed=int(seed) if seed else None,
+                    token_latency=float(os.getenv("CALENDAR_LLM_REPLAY_TOKEN_LATENCY", 0)),
+                )
+                logger.info("🎞️ Calendar LLM backend: %s (%s)", mode, store.path)
+    return _default_backend
+
+
+def set_llm_backend(backend: Optional[BaseLLM]) -> None:
+    """
+    Replace the process-wide LLM backend.
+
+    An installed backend takes precedence over CALENDAR_LLM_MODE. Crews built
+    afterwards use it; crews already in the pool keep theirs. Passing None
+    makes the next get_llm_backend() or get_recording_store() call read the
+    environment again.
+
+    Args:
+        backend: Backend to install, or None to reset
+    """
+    global _default_backend, _recording_store
+    with _default_backend_lock:
+        _default_backend = backend
+        _recording_store = None
@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+"""
+Date-indexed store of a user's existing calendar events.
+
+Sending every upcoming event into the prompt makes each request slower and
+more expensive as the calendar grows. This module keeps existing events
+sorted by start time so that only the events inside the window a message
+plausibly refers to are rendered into the ``existing_events`` prompt field.
+
+Sorting the events is O(n log n), so stores are cached by user and calendar
+version (``CalendarState.existing_events_version``) like the conflict
+index, instead of being rebuilt on every request.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import bisect
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .fast_path import DEFAULT_TIMEZONE, find_referenced_dates
+
+# Window used when a message names no date at all
+DEFAULT_LOOKAHEAD = timedelta(days=7)
+
+# Extra context kept around each date the message refers to
+DATE_MARGIN = timedelta(days=1)
+
+_WIDE_WINDOW_RE = re.compile(r"\b(next\s+week|this\s+week|week|weekend)\b")
+_MONTH_WINDOW_RE = re.compile(r"\bmonth\b")
+
+# Calendars smaller than this are indexed inline; a thread hop costs more
+_INLINE_BUILD_EVENTS = 1000
+DEFAULT_STORE_CACHE_SIZE = 64
+
+
+def parse_event_datetime(value: Dict[str, Any], timezone: str = DEFAULT_TIMEZONE) -> Optional[datetime]:
+    """
+    Parse a Google Calendar start/end object into an aware datetime.
+
+    Args:
+        value: Dict with a "dateTime" (ISO 8601) or all-day "date" key
+        timezone: Zone applied to naive values and all-day events, and
+            to values whose own "timeZone" is unknown
+
+    Returns:
+        Optional[datetime]: Parsed datetime, or None if it cannot be parsed
+    """
+    if not isinstance(value, dict):
+        return None
+    raw = value.get("dateTime") or value.get("date")
+    if not isinstance(raw, str):
+        return None
+    try:
+        # Python < 3.11 does not accept the "Z" suffix
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        zone = _zone(value.get("timeZone")) or _zone(timezone)
+        if zone is None:
+            return None
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed
+
+
+def _zone(name: Any) -> Optional[ZoneInfo]:
+    """Return the ZoneInfo for an IANA name, or None if it is missing or unknown."""
+    if not name or not isinstance(name, str):
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+class EventStore:
+    """
+    Existing events kept sorted by start time for fast range queries.
+
+    Example:
+        >>> store = EventStore(existing_event_dicts)
+        >>> relevant = store.between(start, end)
+        >>> prompt_text = format_events_for_prompt(relevant)
+    """
+
+    def __init__(self, events: Iterable[Dict[str, Any]] = (), timezone: str = DEFAULT_TIMEZONE) -> None:
+        """
+        Args:
+            events: Existing events in Google Calendar dict format
+            timezone: Zone used for naive and all-day event times
+        """
+        self.timezone = timezone
+        self._starts: List[datetime] = []
+        self._events: List[Dict[str, Any]] = []
+        self._undated: List[Dict[str, Any]] = []
+        self.add_many(events)
+
+    def __len__(self) -> int:
+        return len(self._events) + len(self._undated)
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """
+        Insert one event, keeping the index sorted.
+
+        Args:
+            event: Event in Google Calendar dict format
+        """
+        start = parse_event_datetime(event.get("start"), self.timezone) if isinstance(event, dict) else None
+        if start is None:
+            # Events we cannot place in time are kept but never filtered in
+            self._undated.append(event)
+            return
+        index = bisect.bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self._events.insert(index, event)
+
+    def add_many(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Insert many events, re-sorting once instead of per event.
+
+        Args:
+            events: Events in Google Calendar dict format
+        """
+        dated = list(zip(self._starts, self._events))
+        for event in events:
+            start = parse_event_datetime(event.get("start"), self.timezone) if isinstance(event, dict) else None
+            if start is None:
+                self._undated.append(event)
+            else:
+                dated.append((start, event))
+        dated.sort(key=lambda item: item[0])
+        self._starts = [start for start, _ in dated]
+        self._events = [event for _, event in dated]
+
+    def between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        Return events starting in [start, end), in start order.
+
+        Args:
+            start: Inclusive lower bound (timezone aware)
+            end: Exclusive upper bound (timezone aware)
+
+        Returns:
+            List of matching events
+        """
+        lo = bisect.bisect_left(self._starts, start)
+        hi = bisect.bisect_left(self._starts, end, lo)
+        return self._events[lo:hi]
+
+    def relevant_to(self, user_input: str, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Return the events inside the time window a message plausibly refers to.
+
+        Args:
+            user_input: Raw message from the user
+            now: Reference time, defaults to the current time in the store's zone
+
+        Returns:
+            List of relevant events in start order, without duplicates
+        """
+        selected: List[Dict[str, Any]] = []
+        seen = set()
+        for window_start, window_end in referenced_windows(user_input, now, self.timezone):
+            for event in self.between(window_start, window_end):
+                if id(event) not in seen:
+                    seen.add(id(event))
+                    selected.append(event)
+        return selected
+
+
+class EventStoreCache:
+    """
+    LRU of EventStores keyed by user and calendar version.
+
+    Versions follow the same rules as for the conflict checker cache: a
+    version identifies the contents of one user's event list and only needs
+    to be unique per user.
+
+    Example:
+        >>> cache = EventStoreCache(max_entries=64)
+        >>> store = await cache.get(
+        ...     state.existing_events_version, state.existing_event_list, state.time_zone, state.user_id
+        ... )
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_STORE_CACHE_SIZE) -> None:
+        """
+        Args:
+            max_entries: Stores kept; 0 disables caching but still builds off the event loop
+
+        Raises:
+            ValueError: If max_entries is negative
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stores: "OrderedDict[Tuple[str, str, str], EventStore]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    async def get(
+        self,
+        version: Optional[str],
+        existing_events: List[Dict[str, Any]],
+        timezone: str = DEFAULT_TIMEZONE,
+        user_id: str = "",
+    ) -> EventStore:
+        """
+        Return the store of a calendar, building it off the event loop on a miss.
+
+        Args:
+            version: Identifies the contents of existing_events, None if unknown (never cached)
+            existing_events: The user's existing events
+            timezone: Zone used for naive and all-day event times
+            user_id: Owner of the calendar; versions of different users never share a store
+
+        Returns:
+            EventStore: Cached or freshly built store
+        """
+        key = (user_id, version, timezone) if version else None
+        if key is not None:
+            with self._lock:
+                store = self._stores.get(key)
+                if store is not None:
+                    self._stores.move_to_end(key)
+                    self.hits += 1
+                    return store
+                self.misses += 1
+
+        if len(existing_events) < _INLINE_BUILD_EVENTS:
+            store = EventStore(existing_events, timezone)
+        else:
+            store = await asyncio.to_thread(EventStore, existing_events, timezone)
+        if key is not None and self.max_entries:
+            with self._lock:
+                self._stores[key] = store
+                self._stores.move_to_end(key)
+                while len(self._stores) > self.max_entries:
+                    self._stores.popitem(last=False)
+        return store
+
+
+_default_store_cache: Optional[EventStoreCache] = None
+_default_store_cache_lock = threading.Lock()
+
+
+def get_event_store_cache() -> EventStoreCache:
+    """
+    Get the process-wide event store cache, creating it on first use.
+
+    Its size is read from CALENDAR_EVENT_STORE_CACHE_SIZE (default 64, 0 to
+    disable caching).
+
+    Returns:
+        EventStoreCache: The shared cache
+    """
+    global _default_store_cache
+    if _default_store_cache is None:
+        with _default_store_cache_lock:
+            if _default_store_cache is None:
+                _default_store_cache = EventStoreCache(
+                    int(os.getenv("CALENDAR_EVENT_STORE_CACHE_SIZE", DEFAULT_STORE_CACHE_SIZE))
+                )
+    return _default_store_cache
+
+
+def set_event_store_cache(cache: Optional[EventStoreCache]) -> None:
+    """
+    Replace the process-wide event store cache.
+
+    Args:
+        cache: Cache to install, or None to build a default one on next use
+    """
+    global _default_store_cache
+    with _default_store_cache_lock:
+        _default_store_cache = cache
+
+
+def referenced_windows(
+    user_input: str,
+    now: Optional[datetime] = None,
+    timezone: str = DEFAULT_TIMEZONE,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Work out which time windows a message plausibly refers to.
+
+    Each referenced date gets a window of that day plus DATE_MARGIN on both
+    sides. Messages without a date get the next DEFAULT_LOOKAHEAD, widened
+    for "week" and "month" phrasing.
+
+    Args:
+        user_input: Raw message from the user
+        now: Reference time, defaults to the current time in the zone
+        timezone: IANA timezone of the user
+
+    Returns:
+        List of (start, end) aware datetime pairs
+    """
+    tz = ZoneInfo(timezone)
+    now = now.astimezone(tz) if now and now.tzinfo else (now.replace(tzinfo=tz) if now else datetime.now(tz))
+    today_start = datetime.combine(now.date(), time(0, 0), tz)
+
+    dates = find_referenced_dates(user_input, now.date())
+    if dates:
+        windows = []
+        for day in sorted(set(dates)):
+            day_start = datetime.combine(day, time(0, 0), tz)
+            windows.append((day_start - DATE_MARGIN, day_start + timedelta(days=1) + DATE_MARGIN))
+        return windows
+
+    text = user_input.lower()
+    if _MONTH_WINDOW_RE.search(text):
+        lookahead = timedelta(days=62)
+    elif _WIDE_WINDOW_RE.search(text):
+        lookahead = timedelta(days=14)
+    else:
+        lookahead = DEFAULT_LOOKAHEAD
+    return [(today_start, today_start + lookahead + timedelta(days=1))]
+
+
+def format_events_for_prompt(events: Iterable[Dict[str, Any]], timezone: str = DEFAULT_TIMEZONE) -> str:
+    """
+    Render events as compact prompt lines, one per event.
+
+    Times are shown in the user's zone, whatever offset the event was
+    stored with (e.g. UTC "Z" times from a calendar API), so they read like
+    the times the user writes.
+
+    Args:
+        events: Events in Google Calendar dict format
+        timezone: IANA timezone of the user; also used for naive and all-day event times
+
+    Returns:
+        str: Lines like "4/3/2025 18:00-19:30: Gym (Tel Aviv)"
+    """
+    zone = _zone(timezone)
+    lines = []
+    for event in events:
+        start = parse_event_datetime(event.get("start"), timezone)
+        end = parse_event_datetime(event.get("end"), timezone)
+        if zone is not None:
+            start = start and start.astimezone(zone)
+            end = end and end.astimezone(zone)
+        summary = event.get("summary") or "Untitled Event"
+        if start is None:
+            line = summary
+        else:
+            span = f"{start.day}/{start.month}/{start.year} {start:%H:%M}"
+            if end is not None:
+                span += f"-{end:%H:%M}"
+            line = f"{span}: {summary}"
+        if event.get("location"):
+            line += f" ({event['location']})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def filter_existing_events(
+    user_input: str,
+    events: Iterable[Dict[str, Any]],
+    now: Optional[datetime] = None,
+    timezone: str = DEFAULT_TIMEZONE,
+) -> str:
+    """
+    Build the existing_events prompt text from only the relevant events.
+
+    Args:
+        user_input: Raw message from the user
+        events: All of the user's existing events
+        now: Reference time, defaults to the current time in the zone
+        timezone: IANA timezone of the user
+
+    Returns:
+        str: Prompt lines for the events the message plausibly refers to
+    """
+    store = events if isinstance(events, EventStore) else EventStore(events, timezone)
+    return format_events_for_prompt(store.relevant_to(user_input, now), timezone)
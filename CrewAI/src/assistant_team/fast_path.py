@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+"""
+Rule-based fast path for simple scheduling messages.
+
+This module parses short, self-contained requests such as
+"dentist tomorrow at 3pm" or "gym 4/3 18:00-19:30" locally, without an LLM
+round trip. It emits the same five-key event dicts as the calendar crew and
+reports a confidence score so the flow can fall through to the crew whenever
+the message is anything but a plain single-event request.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+DEFAULT_TIMEZONE = "Asia/Jerusalem"
+
+# Results below this confidence are handed to the calendar crew
+FAST_PATH_MIN_CONFIDENCE = 0.8
+
+DEFAULT_DURATION = timedelta(hours=1)
+
+_WEEKDAYS = {
+    "monday": 0, "mon": 0,
+    "tuesday": 1, "tue": 1, "tues": 1,
+    "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thurs": 3,
+    "friday": 4, "fri": 4,
+    "saturday": 5, "sat": 5,
+    "sunday": 6, "sun": 6,
+}
+
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?"
+
+_TIME_RANGE_RE = re.compile(
+    r"\b(from\s+)?" + _TIME + r"\s*(?:-|–|to|until|till)\s*" + _TIME + r"(?![\w/.])"
+)
+_DATE_RE = re.compile(r"\b(?:on\s+)?(\d{1,2})[/.](\d{1,2})(?:[/.](\d{2}|\d{4}))?\b")
+_RELATIVE_DAY_RE = re.compile(r"\b(?:on\s+)?(the day after tomorrow|day after tomorrow|today|tonight|tomorrow)\b")
+_IN_DAYS_RE = re.compile(r"\bin\s+(\d{1,2})\s+days?\b")
+_WEEKDAY_RE = re.compile(
+    r"\b(?:on\s+)?(?:(next|this)\s+)?(" + "|".join(sorted(_WEEKDAYS, key=len, reverse=True)) + r")\b"
+)
+_TIME_AMPM_RE = re.compile(r"(?:\bat\s+|@\s*|\b)(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)(?!\w)")
+_TIME_CLOCK_RE = re.compile(r"(?:\bat\s+|@\s*|\b)(\d{1,2}):(\d{2})\b")
+_TIME_NOON_RE = re.compile(r"\b(?:at\s+)?(noon|midday|midnight)\b")
+_TIME_AT_HOUR_RE = re.compile(r"(?:\bat\s+|@\s*)(\d{1,2})\b")
+_BARE_HOUR_RE = re.compile(r"(?<![\w:/.])(\d{1,2})(?![\w:/.])")
+_DURATION_RE = re.compile(
+    r"\bfor\s+(?:(an?|one|half an?)\s+(hour|hr)|(\d+(?:\.\d+)?)\s*"
+    r"(hours?|hrs?|h|minutes?|mins?|m))\b"
+)
+
+# Messages containing these are edits, recurrences, questions or vague times
+_FALLTHROUGH_RE = re.compile(
+    r"\b(cancel|delete|remove|move|moved|reschedule|postpone|change|update|instead|"
+    r"every|each|daily|weekly|monthly|yearly|recurring|"
+    r"week|month|weekend|morning|afternoon|evening|night|"
+    r"before|(?<!day )after|between|around|sometime|maybe|not|don't|dont|"
+    r"what|when|which|who|how|why|can|could|should|free|busy)\b|\?"
+)
+
+_LEADING_FILLER_RE = re.compile(
+    r"^(?:please\s+)?(?:(?:schedule|add|book|create|put|set\s+up|plan|"
+    r"remind\s+me\s+(?:about|of|to)?|i\s+have|i've\s+got|there(?:'s|\s+is))\s+)?"
+    r"(?:(?:a|an|the|my)\s+)?"
+)
+_DANGLING_WORD_RE = re.compile(r"^(?:at|on|from|to|for|in|with|the|and|,)\s+|\s+(?:at|on|from|to|for|in|with|the|and|,)$")
+
+
+@dataclass
+class FastPathResult:
+    """
+    Outcome of the rule-based parser.
+
+    Attributes:
+        events: Parsed events in the crew's five-key format (empty when rejected)
+        confidence: Score in [0, 1]; results below FAST_PATH_MIN_CONFIDENCE
+            should be handed to the calendar crew
+        reason: Short explanation when the parser declined or lowered confidence
+    """
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    confidence: float = 0.0
+    reason: str = ""
+
+    @property
+    def accepted(self) -> bool:
+        """Whether the result is confident enough to skip the crew."""
+        return bool(self.events) and self.confidence >= FAST_PATH_MIN_CONFIDENCE
+
+
+def _reject(reason: str) -> FastPathResult:
+    return FastPathResult(events=[], confidence=0.0, reason=reason)
+
+
+def _to_24h(hour: int, minute: int, meridiem: Optional[str]) -> Optional[time]:
+    """Convert parsed clock parts to a time, returning None when out of range."""
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        meridiem = meridiem.replace(".", "")
+        if meridiem == "am":
+            hour = 0 if hour == 12 else hour
+        else:
+            hour = 12 if hour == 12 else hour + 12
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    return time(hour, minute)
+
+
+def _guess_bare_hour(hour: int) -> Optional[time]:
+    """Interpret an hour given without minutes or am/pm ("friday 10", "at 3")."""
+    if not 1 <= hour <= 23:
+        return None
+    # Nobody books "at 3" meaning 3 AM; small numbers are afternoon hours
+    if hour <= 7:
+        hour += 12
+    return time(hour, 0)
+
+
+def _cut(text: str, match: "re.Match[str]") -> str:
+    """Remove a matched span from the text, leaving a single space behind."""
+    return f"{text[:match.start()]} {text[match.end():]}"
+
+
+def find_referenced_dates(user_input: str, today: date) -> List[date]:
+    """
+    Find every date a message refers to, explicitly or relatively.
+
+    Unlike the single-event parser this does not reject anything; it is used
+    to decide which existing events are relevant to a message.
+
+    Args:
+        user_input: Raw message from the user
+        today: Reference date for relative expressions
+
+    Returns:
+        List of referenced dates in order of appearance (may be empty)
+    """
+    text = user_input.lower()
+    found = []
+    for pattern in (_DATE_RE, _RELATIVE_DAY_RE, _IN_DAYS_RE, _WEEKDAY_RE):
+        for match in pattern.finditer(text):
+            _, parsed, _, _ = _extract_date(match.group(0), today)
+            if parsed is not None:
+                found.append((match.start(), parsed))
+    return [parsed for _, parsed in sorted(found, key=lambda item: item[0])]
+
+
+def _extract_time_range(text: str) -> Tuple[str, Optional[time], Optional[time]]:
+    match = _TIME_RANGE_RE.search(text)
+    if not match:
+        return text, None, None
+
+    has_from, h1, m1, ap1, h2, m2, ap2 = match.groups()
+    # Require something that makes this unmistakably a time range
+    if not (has_from or m1 or m2 or ap1 or ap2):
+        return text, None, None
+
+    if ap2 and not ap1 and int(h1) <= int(h2):
+        ap1 = ap2
+    if m1 or m2 or ap1 or ap2:
+        start = _to_24h(int(h1), int(m1 or 0), ap1)
+        end = _to_24h(int(h2), int(m2 or 0), ap2)
+    else:
+        # "from 7 to 8" gives bare hours on both ends
+        start = _guess_bare_hour(int(h1))
+        shift = start.hour - int(h1) if start else 0
+        end = _guess_bare_hour(int(h2)) if int(h2) < int(h1) else _to_24h(int(h2) + shift, 0, None)
+    if start is None or end is None:
+        return text, None, None
+    return _cut(text, match), start, end
+
+
+def _extract_date(text: str, today: date) -> Tuple[str, Optional[date], float, str]:
+    """Find an explicit or relative date. Returns (text, date, confidence, kind)."""
+    match = _DATE_RE.search(text)
+    if match:
+        day, month, year = match.groups()
+        # Dates are DD/MM as required by tasks.yaml
+        try:
+            if year:
+                year_num = int(year) + (2000 if len(year) == 2 else 0)
+                parsed = date(year_num, int(month), int(day))
+            else:
+                parsed = date(today.year, int(month), int(day))
+                if parsed < today:
+                    parsed = date(today.year + 1, int(month), int(day))
+        except ValueError:
+            return text, None, 0.0, ""
+        return _cut(text, match), parsed, 1.0, "date"
+
+    match = _RELATIVE_DAY_RE.search(text)
+    if match:
+        word = match.group(1)
+        offset = {"today": 0, "tonight": 0, "tomorrow": 1}.get(word, 2)
+        return _cut(text, match), today + timedelta(days=offset), 1.0, word
+
+    match = _IN_DAYS_RE.search(text)
+    if match:
+        return _cut(text, match), today + timedelta(days=int(match.group(1))), 1.0, "relative"
+
+    match = _WEEKDAY_RE.search(text)
+    if match:
+        qualifier, name = match.groups()
+        days_ahead = (_WEEKDAYS[name] - today.weekday()) % 7
+        confidence = 1.0
+        if qualifier == "next":
+            # "next friday" is ambiguous between this coming and the following week
+            days_ahead = days_ahead or 7
+            confidence = 0.6
+        return _cut(text, match), today + timedelta(days=days_ahead), confidence, "weekday"
+
+    return text, None, 1.0, ""
+
+
+def _extract_time(text: str) -> Tuple[str, Optional[time], float]:
+    """Find a single start time. Returns (text, time, confidence)."""
+    for pattern in (_TIME_AMPM_RE, _TIME_CLOCK_RE):
+        match = pattern.search(text)
+        if match:
+            groups = match.groups()
+            meridiem = groups[2] if len(groups) > 2 else None
+            parsed = _to_24h(int(groups[0]), int(groups[1] or 0), meridiem)
+            if parsed is None:
+                return text, None, 0.0
+            return _cut(text, match), parsed, 1.0
+
+    match = _TIME_NOON_RE.search(text)
+    if match:
+        parsed = time(0, 0) if match.group(1) == "midnight" else time(12, 0)
+        return _cut(text, match), parsed, 1.0
+
+    for pattern, confidence in ((_TIME_AT_HOUR_RE, 0.9), (_BARE_HOUR_RE, 0.85)):
+        match = pattern.search(text)
+        if match:
+            parsed = _guess_bare_hour(int(match.group(1)))
+            if parsed is None:
+                return text, None, 0.0
+            return _cut(text, match), parsed, confidence
+
+    return text, None, 1.0
+
+
+def _extract_duration(text: str) -> Tuple[str, Optional[timedelta]]:
+    match = _DURATION_RE.search(text)
+    if not match:
+        return text, None
+
+    article, _, amount, unit = match.groups()
+    if article:
+        duration = timedelta(minutes=30) if article.startswith("half") else timedelta(hours=1)
+    elif unit.startswith("h"):
+        duration = timedelta(hours=float(amount))
+    else:
+        duration = timedelta(minutes=float(amount))
+    return _cut(text, match), duration
+
+
+def _clean_summary(text: str) -> str:
+    summary = re.sub(r"[\s,;.!]+", " ", text).strip()
+    summary = _LEADING_FILLER_RE.sub("", summary)
+    previous = None
+    while previous != summary:
+        previous = summary
+        summary = _DANGLING_WORD_RE.sub("", summary).strip()
+    return summary
+
+
+def _format_event(summary: str, start: datetime, end: datetime, timezone: str) -> Dict[str, Any]:
+    """Build an event dict with the same five keys the crew produces."""
+    return {
+        "summary": summary,
+        "start": {"dateTime": start.isoformat(timespec="seconds"), "timeZone": timezone},
+        "end": {"dateTime": end.isoformat(timespec="seconds"), "timeZone": timezone},
+        "location": "",
+        "description": "",
+    }
+
+
+def parse_simple_request(
+    user_input: str,
+    now: Optional[datetime] = None,
+    timezone: str = DEFAULT_TIMEZONE,
+) -> FastPathResult:
+    """
+    Parse a simple single-event scheduling message without calling the LLM.
+
+    Handles relative days (today, tomorrow, weekdays, "in 3 days"), DD/MM
+    dates, 12h/24h times, time ranges and "for 2 hours" style durations.
+    Anything that looks like an edit, a recurrence, a question, a vague time
+    of day or more than one event is rejected with zero confidence, as are
+    events in the past, zero-length events and dates more than a year ahead.
+
+    Args:
+        user_input: Raw message from the user
+        now: Reference time, defaults to the current time in the timezone
+        timezone: IANA timezone used for the event times
+
+    Returns:
+        FastPathResult: Parsed events and the parser's confidence
+
+    Example:
+        >>> result = parse_simple_request("dentist tomorrow at 3pm")
+        >>> result.events[0]["summary"]
+        'Dentist'
+    """
+    if not user_input or not isinstance(user_input, str):
+        return _reject("empty input")
+
+    tz = ZoneInfo(timezone)
+    now = now.astimezone(tz) if now and now.tzinfo else (now.replace(tzinfo=tz) if now else datetime.now(tz))
+
+    text = user_input.strip().lower()
+    if len(text) > 120 or "\n" in text:
+        return _reject("message too long for the fast path")
+    if _FALLTHROUGH_RE.search(text):
+        return _reject("message needs the crew (edit, recurrence, question or vague time)")
+
+    confidence = 1.0
+
+    text, day, date_confidence, day_kind = _extract_date(text, now.date())
+    confidence *= date_confidence
+
+    text, start_time, end_time = _extract_time_range(text)
+    if start_time is None:
+        text, start_time, time_confidence = _extract_time(text)
+        confidence *= time_confidence
+    text, duration = _extract_duration(text)
+
+    if start_time is None:
+        return _reject("no start time found")
+    if day_kind == "tonight" and start_time.hour < 12 and end_time is None:
+        start_time = start_time.replace(hour=start_time.hour + 12)
+    if end_time is not None and duration is not None:
+        return _reject("both an end time and a duration were given")
+    if duration is not None and duration <= timedelta(0):
+        return _reject("zero-length event")
+    if day is not None and day.year > now.year + 1:
+        # "1/1/99" is read as 2099; more likely a typo or a different year notation
+        return _reject("date too far ahead to trust the year")
+
+    # Any digits left over mean a second time or date we did not understand
+    if re.search(r"\d", text):
+        return _reject("unparsed numbers left in message")
+    if " and " in f" {text} ":
+        return _reject("message may describe more than one event")
+
+    if day is None:
+        # A bare time means today, unless it has already passed
+        day = now.date()
+        if datetime.combine(day, start_time, tz) <= now:
+            return _reject("time-only message refers to a time that already passed")
+        confidence *= 0.9
+
+    start = datetime.combine(day, start_time, tz)
+    if day_kind == "weekday" and start <= now:
+        # "friday 10" said on a Friday afternoon means next Friday
+        day += timedelta(days=7)
+        start = datetime.combine(day, start_time, tz)
+    if start <= now:
+        # "today at 9am" sent at 10am: a typo, or the user means something else
+        return _reject("event would start in the past")
+    if end_time is not None:
+        end = datetime.combine(day, end_time, tz)
+        if end <= start:
+            end += timedelta(days=1)
+    else:
+        end = start + (duration if duration is not None else DEFAULT_DURATION)
+
+    summary = _clean_summary(text)
+    if not summary:
+        return _reject("no event title found")
+    if len(summary.split()) > 6:
+        confidence *= 0.7
+
+    # Keep the user's original casing for names ("call with Dana")
+    original = re.search(re.escape(summary), user_input, re.IGNORECASE)
+    summary = original.group(0) if original else summary
+    summary = summary[0].upper() + summary[1:]
+
+    return FastPathResult(
+        events=[_format_event(summary, start, end, timezone)],
+        confidence=confidence,
+    )
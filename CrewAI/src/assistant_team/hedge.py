@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+"""
+Hedged crew calls to cut tail latency.
+
+The p99 of a crew call is dominated by the occasional very slow provider
+response rather than by the typical one. With hedging on, a duplicate call
+is fired when the first has not returned by a high percentile of recent
+call latencies, optionally to a second model (CALENDAR_HEDGE_MODEL). The
+first valid answer wins and the other call is cancelled.
+
+Hedges cost extra LLM calls, so their rate is capped by a budget: every
+call earns a fraction of a hedge (CALENDAR_HEDGE_BUDGET) and a hedge is
+only fired when a whole one has been earned, and only onto a crew that is
+free at that moment; when none is, no credit is spent. The blocking LLM
+call of a cancelled crew cannot be interrupted; its crew goes back to the
+pool when the call returns.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Optional, TypeVar
+
+from .log import get_logger
+from .metrics import get_metrics
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PERCENTILE = 95.0
+# Fraction of calls that may be hedged
+DEFAULT_BUDGET = 0.05
+# Hedges that can be saved up while calls are fast
+DEFAULT_BURST = 10.0
+# Call latencies the percentile is taken over
+DEFAULT_WINDOW = 500
+# Latencies needed before the percentile is trusted
+DEFAULT_MIN_SAMPLES = 20
+
+OUTCOME_PRIMARY_WON = "primary_won"
+OUTCOME_HEDGE_WON = "hedge_won"
+OUTCOME_OVER_BUDGET = "over_budget"
+OUTCOME_UNAVAILABLE = "unavailable"
+
+_hedges = get_metrics().counter("calendar_hedge_total", "Crew calls that reached the hedge delay, by outcome")
+
+
+@dataclass
+class HedgeStats:
+    """
+    Counters of a Hedger.
+
+    Attributes:
+        calls: Calls run through the hedger
+        hedged: Calls for which a duplicate was fired
+        hedge_wins: Hedged calls answered by the duplicate
+        over_budget: Calls that reached the delay but were not hedged for lack of budget
+        unavailable: Calls that reached the delay but were not hedged for lack of a free crew
+        delay: Current hedge delay in seconds, None while still learning latencies
+    """
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    over_budget: int = 0
+    unavailable: int = 0
+    delay: Optional[float] = None
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of calls that were hedged."""
+        return self.hedged / self.calls if self.calls else 0.0
+
+
+class Hedger:
+    """
+    Runs a call and, if it is slow, a duplicate of it, returning the first valid result.
+
+    Must be used from coroutines of one event loop.
+
+    Example:
+        >>> hedger = Hedger(percentile=95, budget=0.05)
+        >>> result = await hedger.run(
+        ...     lambda: pool.kickoff_async(inputs),
+        ...     lambda: hedge_pool.try_kickoff_async(inputs),
+        ... )
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_PERCENTILE,
+        delay: Optional[float] = None,
+        budget: float = DEFAULT_BUDGET,
+        burst: float = DEFAULT_BURST,
+        model: Optional[str] = None,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            percentile: Percentile of recent call latencies after which a duplicate is fired
+            delay: Fixed hedge delay in seconds instead of the percentile
+            budget: Fraction of calls that may be hedged, 0 never hedges
+            burst: Hedges that can be saved up while calls are fast
+            model: Model the duplicate goes to, None for the model of the first call
+            window: Number of recent call latencies the percentile is taken over
+            min_samples: Latencies needed before the percentile is used
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If percentile is not between 0 and 100, or delay, budget or burst is negative
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if (delay is not None and delay < 0) or budget < 0 or burst < 0:
+            raise ValueError("delay, budget and burst must not be negative")
+        self.percentile = percentile
+        self.delay = delay
+        self.budget = budget
+        self.burst = max(burst, 1.0)
+        self.model = model
+        self.min_samples = min_samples
+        self._clock = clock
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._credit = 0.0
+        self._stats = HedgeStats()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait for the first call before hedging, None while latencies are still being learned."""
+        if self.delay is not None:
+            return self.delay
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)]
+
+    def stats(self) -> HedgeStats:
+        """Return a snapshot of the counters."""
+        return HedgeStats(
+            self._stats.calls, self._stats.hedged, self._stats.hedge_wins, self._stats.over_budget,
+            self._stats.unavailable, self.hedge_delay(),
+        )
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Optional[Awaitable[T]]],
+        accept: Callable[[T], bool] = lambda result: True,
+    ) -> T:
+        """
+        Await primary(), firing hedge() as well if it is still running after the hedge delay.
+
+        The losing call is only cancelled on the event loop. A blocking crew
+        call it started keeps running on its executor thread, holding its
+        crew, until the LLM returns.
+
+        Args:
+            primary: Starts the call
+            hedge: Starts the duplicate, or returns None when it cannot run now, e.g. no crew is free
+            accept: Whether a result is valid; an invalid first result waits for the other call
+
+        Returns:
+            The first accepted result, or the primary's result if neither was accepted
+
+        Raises:
+            Exception: What primary() raised, if the hedge did not produce a result either
+        """
+        self._stats.calls += 1
+        self._credit = min(self.burst, self._credit + self.budget)
+        started = self._clock()
+        first = asyncio.ensure_future(primary())
+        first.add_done_callback(lambda task: self._observe(task, started))
+        tasks = [first]
+        try:
+            delay = self.hedge_delay()
+            if delay is None:
+                return await first
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+            if self._credit < 1:
+                self._stats.over_budget += 1
+                _hedges.inc(outcome=OUTCOME_OVER_BUDGET)
+                return await first
+
+            duplicate = hedge()
+            if duplicate is None:
+                self._stats.unavailable += 1
+                _hedges.inc(outcome=OUTCOME_UNAVAILABLE)
+                return await first
+
+            self._credit -= 1
+            self._stats.hedged += 1
+            logger.info("🏁 Crew call slower than %.2fs, firing a hedge", delay)
+            second = asyncio.ensure_future(duplicate)
+            tasks.append(second)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both finished in the same iteration
+                for task in tasks:
+                    if task not in done:
+                        continue
+                    if task.exception() is not None:
+                        if task is second:
+                            logger.debug("Hedge failed: %s", task.exception())
+                        continue
+                    if accept(task.result()):
+                        if task is second:
+                            self._stats.hedge_wins += 1
+                        _hedges.inc(outcome=OUTCOME_HEDGE_WON if task is second else OUTCOME_PRIMARY_WON)
+                        return task.result()
+
+            # Neither answer was accepted: fall back to whichever succeeded, the primary first
+            _hedges.inc(outcome=OUTCOME_PRIMARY_WON)
+            if first.exception() is not None and second.exception() is None:
+                return second.result()
+            return first.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _observe(self, task: "asyncio.Future[Any]", started: float) -> None:
+        # A cancelled primary lost to its hedge; its elapsed time is a lower bound of its latency
+        if task.cancelled() or task.exception() is None:
+            self._latencies.append(self._clock() - started)
+
+
+_default_hedger: Optional[Hedger] = None
+_default_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Optional[Hedger]:
+    """
+    Get the process-wide hedger, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_HEDGE: "on" or "off" (default)
+        CALENDAR_HEDGE_PERCENTILE: Percentile of recent crew call latencies to hedge after (default 95)
+        CALENDAR_HEDGE_DELAY: Fixed hedge delay in seconds instead of the percentile
+        CALENDAR_HEDGE_BUDGET: Fraction of crew calls that may be hedged (default 0.05)
+        CALENDAR_HEDGE_MODEL: Model the duplicate goes to (default the same model)
+
+    Returns:
+        Optional[Hedger]: The shared hedger, or None when disabled
+    """
+    global _default_hedger
+    if _default_hedger is not None:
+        return _default_hedger
+    if os.getenv("CALENDAR_HEDGE", "off").strip().lower() not in ("on", "1", "true", "yes"):
+        return None
+
+    with _default_hedger_lock:
+        if _default_hedger is None:
+            delay = os.getenv("CALENDAR_HEDGE_DELAY", "").strip()
+            _default_hedger = Hedger(
+                percentile=float(os.getenv("CALENDAR_HEDGE_PERCENTILE", DEFAULT_PERCENTILE)),
+                delay=float(delay) if delay else None,
+                budget=float(os.getenv("CALENDAR_HEDGE_BUDGET", DEFAULT_BUDGET)),
+                model=os.getenv("CALENDAR_HEDGE_MODEL", "").strip() or None,
+            )
+    return _default_hedger
+
+
+def set_hedger(hedger: Optional[Hedger]) -> None:
+    """
+    Replace the process-wide hedger.
+
+    Passing None makes the next get_hedger() call build one from the
+    environment again.
+
+    Args:
+        hedger: Hedger to install, or None to reset
+    """
+    global _default_hedger
+    with _default_hedger_lock:
+        _default_hedger = hedger
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+Token-budgeted chat history windowing for the Assistant Team calendar system.
+
+The chat history is pasted into both the agent backstory and the task
+description, so its size drives prompt cost and latency. This module keeps
+the most recent turns verbatim, compacts older turns into a short digest of
+the lines that mention dates, times or events, and enforces a token budget
+before the crew is called.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import List
+
+DEFAULT_TOKEN_BUDGET = 1000
+DEFAULT_RECENT_TURNS = 6
+
+# Rough size of a token for English chat text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# chat_history appears in both the agent backstory and the task description
+HISTORY_COPIES_PER_PROMPT = 2
+
+_DIGEST_HEADER = "Earlier conversation (summarized, {count} older turns):"
+_DIGEST_LINE_CHARS = 120
+
+# Older turns worth keeping in the digest mention a date, time or weekday
+_SALIENT_RE = re.compile(
+    r"\d{1,2}[/.:]\d{1,2}|\b\d{1,2}\s*(?:am|pm)\b|"
+    r"\b(?:today|tonight|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"meeting|appointment|event|schedule|cancel|move|remind)\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a string.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class CompactedHistory:
+    """
+    Chat history prepared for a prompt.
+
+    Attributes:
+        text: History to send to the crew
+        original_tokens: Estimated tokens of the full history
+        tokens: Estimated tokens of the compacted history
+        digested_turns: Number of older turns folded into the digest
+    """
+    text: str
+    original_tokens: int
+    tokens: int
+    digested_turns: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved per copy of the history."""
+        return self.original_tokens - self.tokens
+
+    @property
+    def tokens_saved_per_request(self) -> int:
+        """Estimated prompt tokens saved per crew request."""
+        return self.tokens_saved * HISTORY_COPIES_PER_PROMPT
+
+
+def _split_turns(chat_history: str) -> List[str]:
+    """Split history into turns, one per non-empty line."""
+    return [line.strip() for line in chat_history.splitlines() if line.strip()]
+
+
+def _digest(turns: List[str], budget: int) -> str:
+    """Summarize older turns by their most recent salient lines, within budget."""
+    if not turns or budget <= 0:
+        return ""
+
+    header = _DIGEST_HEADER.format(count=len(turns))
+    remaining = budget - estimate_tokens(header)
+    kept: List[str] = []
+    for turn in reversed(turns):
+        if not _SALIENT_RE.search(turn):
+            continue
+        line = "- " + (turn if len(turn) <= _DIGEST_LINE_CHARS else turn[:_DIGEST_LINE_CHARS - 3] + "...")
+        cost = estimate_tokens(line) + 1
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+
+    if not kept:
+        return header if remaining >= 0 else ""
+    return "\n".join([header] + kept[::-1])
+
+
+def compact_chat_history(
+    chat_history: str,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    recent_turns: int = DEFAULT_RECENT_TURNS,
+) -> CompactedHistory:
+    """
+    Fit the chat history into a token budget.
+
+    The last recent_turns turns are kept verbatim (fewer if they alone exceed
+    the budget); older turns are replaced by a digest of their lines that
+    mention dates, times or calendar actions. History already within budget
+    is returned unchanged.
+
+    Args:
+        chat_history: Full conversation context, one turn per line
+        token_budget: Maximum estimated tokens for the returned history
+        recent_turns: Number of most recent turns to keep verbatim
+
+    Returns:
+        CompactedHistory: The compacted text and token accounting
+
+    Example:
+        >>> compacted = compact_chat_history(long_history, token_budget=500)
+        >>> compacted.tokens <= 500
+        True
+    """
+    original_tokens = estimate_tokens(chat_history)
+    if original_tokens <= token_budget:
+        return CompactedHistory(chat_history, original_tokens, original_tokens)
+
+    turns = _split_turns(chat_history)
+    recent = turns[-recent_turns:] if recent_turns > 0 else []
+
+    # Drop the oldest of the recent turns until the window fits on its own
+    while recent and estimate_tokens("\n".join(recent)) > token_budget:
+        recent = recent[1:]
+
+    if not recent and turns and recent_turns > 0:
+        # A single huge turn: keep its tail
+        tail = turns[-1][-token_budget * CHARS_PER_TOKEN:]
+        return CompactedHistory(tail, original_tokens, estimate_tokens(tail), len(turns) - 1)
+
+    older = turns[:len(turns) - len(recent)]
+    window = "\n".join(recent)
+    digest = _digest(older, token_budget - estimate_tokens(window) - 1)
+    text = "\n".join(part for part in (digest, window) if part)
+    return CompactedHistory(text, original_tokens, estimate_tokens(text), len(older))
+
+
+def history_budget_from_env() -> int:
+    """Read the chat history token budget (CALENDAR_HISTORY_TOKEN_BUDGET)."""
+    return int(os.getenv("CALENDAR_HISTORY_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+
+def recent_turns_from_env() -> int:
+    """Read the number of verbatim recent turns (CALENDAR_HISTORY_RECENT_TURNS)."""
+    return int(os.getenv("CALENDAR_HISTORY_RECENT_TURNS", DEFAULT_RECENT_TURNS))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+Local repair of malformed JSON in LLM output.
+
+When ``extract_json_from_text`` finds no valid JSON value, the flow used to
+report zero events, and the only way to recover was another LLM round trip.
+``repair_json`` fixes the defects models commonly produce in a single pass
+over the text, so most of these answers can be used as they are:
+
+- single-quoted strings
+- trailing commas before ``]`` or ``}``
+- Python literals ``True``, ``False`` and ``None``
+- ``//``, ``/* */`` and ``#`` comments
+- unquoted object keys
+- output cut off before its closing quotes and brackets (an incomplete
+  trailing event is dropped rather than half-kept)
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_OPENER_RE = re.compile(r"[\[{]")
+_WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+
+_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+}
+
+# Candidate openers tried before giving up, so prose like "[note]" is skipped
+MAX_CANDIDATES = 8
+
+
+def _read_string(text: str, i: int) -> Tuple[str, int, bool]:
+    """Read a string literal starting at text[i]; returns (JSON string, end index, closed)."""
+    quote = text[i]
+    n = len(text)
+    parts = ['"']
+    j = i + 1
+    while j < n:
+        char = text[j]
+        if char == "\\":
+            if j + 1 >= n:
+                j += 1
+                break
+            escaped = text[j + 1]
+            # \' is not a JSON escape
+            parts.append("'" if escaped == "'" else char + escaped)
+            j += 2
+            continue
+        if char == quote:
+            parts.append('"')
+            return "".join(parts), j + 1, True
+        if char == '"':
+            parts.append('\\"')
+        elif char == "\n":
+            parts.append("\\n")
+        else:
+            parts.append(char)
+        j += 1
+    parts.append('"')
+    return "".join(parts), j, False
+
+
+def _strip_trailing(out: List[str], tokens: str = ",") -> None:
+    """Drop trailing whitespace and any of `tokens` from the output pieces."""
+    while out and (out[-1].isspace() or out[-1] in tokens):
+        out.pop()
+
+
+def _skip_comment(text: str, i: int) -> int:
+    """Return the index after a comment starting at text[i], or i if there is none."""
+    if text.startswith("//", i) or text[i] == "#":
+        end = text.find("\n", i)
+        return len(text) if end < 0 else end
+    if text.startswith("/*", i):
+        end = text.find("*/", i + 2)
+        return len(text) if end < 0 else end + 2
+    return i
+
+
+def _repair_from(text: str, start: int) -> Optional[str]:
+    """Rewrite the value starting at text[start] as strict JSON text, or None if it cannot be."""
+    out: List[str] = []
+    closers: List[str] = []
+    last_element = -1  # len(out) after the last complete element of a top-level array
+    i = start
+    n = len(text)
+
+    while i < n:
+        char = text[i]
+        if char == '"' or char == "'":
+            string, i, closed = _read_string(text, i)
+            out.append(string)
+            if not closed:
+                break
+            continue
+
+        skipped = _skip_comment(text, i)
+        if skipped != i:
+            i = skipped
+            continue
+
+        if char in "[{":
+            closers.append("]" if char == "[" else "}")
+            out.append(char)
+        elif char in "]}":
+            _strip_trailing(out)
+            out.append(closers.pop())
+            if not closers:
+                return "".join(out)
+            if len(closers) == 1 and closers[0] == "]":
+                last_element = len(out)
+        elif char == "," or char == ":" or char.isspace():
+            out.append(char)
+        elif char == "-" or char.isdigit():
+            match = _NUMBER_RE.match(text, i)
+            if not match:
+                return None
+            out.append(match.group())
+            i = match.end()
+            continue
+        else:
+            match = _WORD_RE.match(text, i)
+            if not match:
+                return None
+            word = match.group()
+            i = match.end()
+            if word in _LITERALS:
+                out.append(_LITERALS[word])
+            elif closers[-1] == "}" and text[i:].lstrip().startswith(":"):
+                # Unquoted object key
+                out.append(json.dumps(word))
+            else:
+                return None
+            continue
+        i += 1
+
+    # Truncated: keep the complete elements of a top-level array, or close what is open
+    if last_element >= 0 and len(closers) > 1:
+        del out[last_element:]
+        closers = closers[:1]
+    _strip_trailing(out, ",:")
+    if out and closers[-1] == "}" and out[-1].startswith('"'):
+        before = next((piece for piece in reversed(out[:-1]) if not piece.isspace()), "")
+        if before in ("{", ","):
+            # Dangling key without a value
+            out.pop()
+            _strip_trailing(out)
+    out.extend(reversed(closers))
+    return "".join(out)
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    Parse the first JSON array or object in text, repairing common defects.
+
+    Use after ``extract_json_from_text`` has returned None; valid JSON is
+    parsed faster there.
+
+    Args:
+        text: LLM output that may contain malformed JSON
+
+    Returns:
+        The parsed list or dict, or None if no candidate could be repaired
+
+    Example:
+        >>> repair_json("[{'summary': 'Gym', 'allDay': False,}]  // done")
+        [{'summary': 'Gym', 'allDay': False}]
+    """
+    if not text or not isinstance(text, str):
+        return None
+
+    pos = 0
+    for _ in range(MAX_CANDIDATES):
+        match = _OPENER_RE.search(text, pos)
+        if not match:
+            return None
+        pos = match.start()
+        try:
+            repaired = _repair_from(text, pos)
+        except IndexError:
+            # Stray closing bracket
+            repaired = None
+        if repaired is not None:
+            try:
+                return json.loads(repaired)
+            except json.JSONDecodeError:
+                pass
+        pos += 1
+    return None
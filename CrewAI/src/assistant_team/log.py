@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Non-blocking leveled logging for the Assistant Team calendar system.
+
+Package modules log through ``get_logger(__name__)``. Like any library, the
+package only attaches a NullHandler to the "assistant_team" logger, so
+importing it leaves the application's logging setup alone and records
+propagate to its handlers.
+
+The server and CLI entry points call ``configure_logging()``, which puts
+records on an in-memory queue by a QueueHandler and writes them to stderr
+from a background QueueListener thread, so formatting and terminal I/O
+never happen on the flow's hot path. The level is read from
+CALENDAR_LOG_LEVEL (default INFO). The listener thread is only started when
+the first record is logged. Handlers an application attached to the
+"assistant_team" logger beforehand are kept; the queue handler is only
+installed when none exist.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Optional
+
+PACKAGE_LOGGER = "assistant_team"
+DEFAULT_LOG_LEVEL = "INFO"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that starts its listener thread on the first record."""
+
+    def __init__(
+        self,
+        records: "queue.SimpleQueue[logging.LogRecord]",
+        listener: logging.handlers.QueueListener,
+    ) -> None:
+        super().__init__(records)
+        self.listener = listener
+        self._started = False
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if not self._started:
+            with _configure_lock:
+                if not self._started:
+                    self.listener.start()
+                    self._started = True
+        super().enqueue(record)
+
+
+def configure_logging(level: Optional[str] = None, force: bool = False) -> logging.Logger:
+    """
+    Install the queue-backed handler on the package logger.
+
+    Meant for entry points (the server, the kickoff/plot scripts and
+    benchmarks); code using the package as a library configures logging
+    itself.
+
+    Args:
+        level: Log level name, defaults to CALENDAR_LOG_LEVEL or INFO
+        force: Replace existing handlers on the package logger
+
+    Returns:
+        logging.Logger: The "assistant_team" logger
+    """
+    global _listener
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    with _configure_lock:
+        if not force and any(not isinstance(handler, logging.NullHandler) for handler in logger.handlers):
+            return logger
+
+        _stop_listener()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        level_name = (level or os.getenv("CALENDAR_LOG_LEVEL", DEFAULT_LOG_LEVEL)).strip().upper()
+        logger.setLevel(getattr(logging, level_name, logging.INFO))
+
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        stream = logging.StreamHandler()
+        stream.setFormatter(logging.Formatter(LOG_FORMAT))
+        _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+        logger.addHandler(_LazyQueueHandler(records, _listener))
+        # Records are written by the listener; do not also hand them to the root logger
+        logger.propagate = False
+    return logger
+
+
+def _stop_listener() -> None:
+    """Flush and stop the background listener, if running."""
+    global _listener
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
+# Library default: no output of our own until an entry point configures logging
+logging.getLogger(PACKAGE_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a package logger.
+
+    Args:
+        name: Module name, usually __name__
+
+    Returns:
+        logging.Logger: Logger below "assistant_team"
+    """
+    return logging.getLogger(name)
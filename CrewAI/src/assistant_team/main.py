@@ -10,12 +10,16 @@ Author: Assistant Team Developer
 License: MIT
 """
 
+import asyncio
+import contextlib
 import warnings
 import logging
+import os
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Sequence
 import re
 import json
 
@@ -23,26 +27,73 @@ import json
 warnings.filterwarnings("ignore", category=Warning)
 logging.getLogger('opentelemetry').setLevel(logging.ERROR)
 
-from pydantic import BaseModel, Field
 from crewai.flow import Flow, listen, start, or_, router
 
 # Use relative imports for better package structure
-from .crews.calendar_crew.calendar_crew import CalendarCrew
-from .utils import get_current_date, extract_json_from_text
+from .crews.calendar_crew.crew_pool import CalendarCrewPool, get_crew_pool
+from .state import CalendarState, BatchItemResult, BatchStats
+from .utils import JsonElementScanner, get_current_date, extract_json_from_text, load_env
+from .fast_path import parse_simple_request
+from .cache import get_response_cache
+from .json_repair import repair_json
+from .history import compact_chat_history, estimate_tokens, history_budget_from_env, recent_turns_from_env
+from .event_store import format_events_for_prompt, get_event_store_cache
+from .conflicts import ConflictChecker, ConflictStream, conflict_policy_from_env, get_conflict_checker_cache
+from .events import validate_events
+from .timezones import localize_events
+from .wire_format import expand_compact_events, is_compact, output_format_from_env
+from .single_flight import NAMESPACE_STATE, NAMESPACE_USER, get_single_flight, history_context, request_key
+from .user_store import UserStateStore, get_state_store
+from .admission import PRIORITY_INTERACTIVE, OverloadedError, get_admission_controller
+from .cascade import ModelCascade, get_model_cascade
+from .hedge import get_hedger
+from .log import configure_logging, get_logger
+from .metrics import get_metrics
 
 
-class CalendarState(BaseModel):
-    """
-    State model for calendar conversations.
-    
-    Attributes:
-        user_input: Current user request/input
-        events_added: List of newly created events from the conversation
-    """
-    chat_history: str = Field(default="", description="Previous conversation context")
-    user_input: str = Field(default="", description="Current user request")
-    existing_events: str = Field(default="", description="Current calendar events")
-    events_added: List[Dict[str, Any]] = Field(default_factory=list, description="Newly created events")
+load_env()
+logger = get_logger(__name__)
+
+# Default number of flows kickoff_many() runs at the same time
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Crew re-runs when the answer has no JSON even after local repair
+DEFAULT_CREW_RETRIES = 1
+
+
+def _crew_retries_from_env() -> int:
+    """Read how often an unparseable crew answer is re-queried (CALENDAR_CREW_RETRIES, default 1)."""
+    try:
+        return max(0, int(os.getenv("CALENDAR_CREW_RETRIES", DEFAULT_CREW_RETRIES)))
+    except ValueError:
+        return DEFAULT_CREW_RETRIES
+
+
+def _fast_path_enabled() -> bool:
+    """Check whether the rule-based fast path is enabled (CALENDAR_FAST_PATH, default on)."""
+    return os.getenv("CALENDAR_FAST_PATH", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+_batch_stats = BatchStats()
+
+_metrics = get_metrics()
+_step_timer = _metrics.timer("calendar_flow_step_seconds", "Time spent in each CalendarFlow step")
+_json_timer = _metrics.timer("calendar_json_extraction_seconds", "Time spent extracting JSON from crew output")
+_requests = _metrics.counter("calendar_requests_total", "Calendar requests by the path that answered them")
+_events_parsed = _metrics.counter("calendar_events_parsed_total", "Events parsed from crew output")
+_parse_failures = _metrics.counter("calendar_parse_failures_total", "Crew outputs without a JSON value")
+_invalid_events = _metrics.counter("calendar_invalid_events_total", "Proposed events dropped by validation")
+_flow_errors = _metrics.counter("calendar_flow_errors_total", "Calendar requests that raised")
+_output_tokens = _metrics.counter("calendar_llm_output_tokens_total", "Estimated crew output tokens by wire format")
+_repairs = _metrics.counter("calendar_json_repairs_total", "Local repairs of unparseable crew output by outcome")
+_repair_timer = _metrics.timer("calendar_json_repair_seconds", "Time spent repairing unparseable crew output")
+_crew_retries = _metrics.counter("calendar_crew_retries_total", "Crew re-runs after output could not be parsed or repaired")
+_first_event_timer = _metrics.timer(
+    "calendar_stream_first_event_seconds", "Time from kickoff to the first event yielded by a streaming flow"
+)
+
+# Queue marker: the streaming flow has finished
+_STREAM_DONE = object()
 
 
 class CalendarFlow(Flow[CalendarState]):
@@ -53,10 +104,16 @@ class CalendarFlow(Flow[CalendarState]):
     and creates calendar events using AI agents.
     """
 
+    # Set by stream_with_calendar_state(); receives crew output text as it is generated
+    on_chunk: Optional[Callable[[str], None]] = None
+    # Conflict check shared by the events of one stream
+    _conflict_stream: Optional[ConflictStream] = None
+
     @start()
     def new_conversation(self) -> None:
         """Initialize a new conversation flow."""
-        print("Starting new calendar conversation...")
+        with _step_timer.time(step="new_conversation"):
+            logger.debug("Starting new calendar conversation...")
 
     @listen(or_(new_conversation))
     def user_talks(self) -> None:
@@ -66,14 +123,15 @@ class CalendarFlow(Flow[CalendarState]):
         Raises:
             ValueError: If no user input is provided
         """
-        if not self.state.user_input.strip():
-            print("ERROR: No user input provided")
-            raise ValueError("User input is required")
-        
-        print(f"📝 Processing user input: {self.state.user_input[:100]}...")
+        with _step_timer.time(step="user_talks"):
+            if not self.state.user_input.strip():
+                logger.error("No user input provided")
+                raise ValueError("User input is required")
+
+            logger.info("📝 Processing user input: %s...", self.state.user_input[:100])
 
     @listen(user_talks)
-    def handle_calendar_request(self) -> List[Dict[str, Any]]:
+    async def handle_calendar_request(self) -> List[Dict[str, Any]]:
         """
         Process calendar request using AI crew and extract events.
         
@@ -83,26 +141,86 @@ class CalendarFlow(Flow[CalendarState]):
         Raises:
             Exception: If calendar processing fails
         """
-        print("📅 Processing calendar request...")
+        with _step_timer.time(step="handle_calendar_request"):
+            return await self._handle_calendar_request()
+
+    async def _handle_calendar_request(self) -> List[Dict[str, Any]]:
+        """Body of handle_calendar_request(), timed as one flow step."""
+        logger.debug("📅 Processing calendar request...")
         
         try:
+            # Answer simple single-event messages locally, skipping the LLM
+            if _fast_path_enabled():
+                fast_path = parse_simple_request(self.state.user_input, timezone=self.state.time_zone)
+                if fast_path.accepted:
+                    logger.info("⚡ Fast path parsed %d event(s)", len(fast_path.events))
+                    _requests.inc(path="fast_path")
+                    return await self._store_events(fast_path.events)
+
+            # Keep the chat history within its prompt token budget
+            history = compact_chat_history(
+                self.state.chat_history, history_budget_from_env(), recent_turns_from_env()
+            )
+            self.state.history_tokens_saved = history.tokens_saved_per_request
+            if history.tokens_saved:
+                logger.info("✂️ Compacted chat history: ~%d prompt tokens saved", history.tokens_saved_per_request)
+
+            # Only send the structured events that fall in the window the message refers to
+            existing_events = self.state.existing_events
+            if self.state.existing_event_list:
+                filter_started = time.perf_counter()
+                # Sorted once per calendar version, like the conflict index
+                store = await get_event_store_cache().get(
+                    self.state.existing_events_version,
+                    self.state.existing_event_list,
+                    self.state.time_zone,
+                    self.state.user_id,
+                )
+                relevant = store.relevant_to(self.state.user_input)
+                relevant_text = format_events_for_prompt(relevant, self.state.time_zone)
+                existing_events = "\n".join(part for part in (existing_events, relevant_text) if part)
+                logger.info(
+                    "🗂️ Sending %d/%d existing event(s) (~%d tokens), filtered in %.1fms",
+                    len(relevant), len(store), estimate_tokens(relevant_text),
+                    (time.perf_counter() - filter_started) * 1000,
+                )
+
             # Prepare input data for the crew
             crew_inputs = {
                 "user_input": self.state.user_input,
-                "chat_history": self.state.chat_history,
-                "existing_events": self.state.existing_events,
-                "current_date": get_current_date()
+                "chat_history": history.text,
+                "existing_events": existing_events,
+                "current_date": get_current_date(self.state.time_zone),
+                "time_zone": self.state.time_zone,
             }
+
+            # Serve resent or redelivered requests from the response cache
+            cache = get_response_cache()
+            cache_key = None
+            if cache is not None:
+                cache_key = cache.key_for(
+                    self.state.user_input,
+                    self.state.chat_history,
+                    existing_events,
+                    crew_inputs["current_date"],
+                    self.state.time_zone,
+                )
+                cached_events = cache.get(cache_key)
+                if cached_events is not None:
+                    logger.info("♻️ Cache hit: returning %d cached event(s)", len(cached_events))
+                    _requests.inc(path="cache")
+                    return await self._store_events(localize_events(cached_events, self.state.time_zone))
             
-            # Execute the calendar crew
-            result = (
-                CalendarCrew()
-                .crew()
-                .kickoff(inputs=crew_inputs)
-            )
-            
-            # Extract and parse events from crew response
-            json_data = extract_json_from_text(result.raw)
+            # Execute a pre-built crew from the shared pool, off the event loop,
+            # once admission control has a slot for it
+            admission = get_admission_controller()
+            async with admission.admit(self.state.priority) if admission else contextlib.nullcontext():
+                _requests.inc(path="crew")
+                cascade = get_model_cascade()
+                if cascade is None:
+                    json_data = await self._run_crew(get_crew_pool(), crew_inputs, self.on_chunk)
+                else:
+                    json_data = await self._run_cascade(cascade, crew_inputs)
             events_added = []
             
             if json_data:
@@ -111,24 +229,248 @@ class CalendarFlow(Flow[CalendarState]):
                 elif isinstance(json_data, dict):
                     events_added = [json_data]
                 
-                print(f"Successfully parsed {len(events_added)} event(s)")
+                logger.info("Successfully parsed %d event(s)", len(events_added))
+                _events_parsed.inc(len(events_added))
+                if cache_key is not None:
+                    cache.set(cache_key, events_added)
             else:
-                print("No events found in response")
+                logger.warning("No events found in response")
+                _parse_failures.inc()
             
-            # Store events in state
-            self.state.events_added = events_added
-            return events_added
+            # The crew writes naive local times; apply the user's UTC offsets here
+            return await self._store_events(localize_events(events_added, self.state.time_zone))
             
+        except OverloadedError:
+            # Shed by admission control; already logged and counted there
+            self.state.events_added = []
+            raise
         except Exception as e:
-            print(f"Error processing calendar request: {e}")
+            logger.error("Error processing calendar request: %s", e)
+            _flow_errors.inc()
             self.state.events_added = []
             raise
 
+    async def _run_crew(
+        self,
+        pool: CalendarCrewPool,
+        crew_inputs: Dict[str, Any],
+        on_chunk: Optional[Callable[[str], None]],
+        retries: Optional[int] = None,
+    ) -> Optional[Any]:
+        """
+        Run a crew from the pool and parse its answer, re-querying unparseable output.
+        
+        Unless the output is streamed, slow calls are hedged when
+        get_hedger() is enabled.
+        
+        Args:
+            pool: Pool to take the crew from
+            crew_inputs: Inputs for the crew
+            on_chunk: Receives crew output text as it is generated
+            retries: Re-runs after unparseable output, defaults to CALENDAR_CREW_RETRIES
+            
+        Returns:
+            The parsed list or dict, or None if the last attempt could not be parsed
+        """
+        # Two calls streaming into one client would interleave, so streamed calls are never hedged
+        hedger = get_hedger() if on_chunk is None else None
+        hedge_pool = get_crew_pool(hedger.model) if hedger is not None and hedger.model else pool
+        attempts = 1 + (_crew_retries_from_env() if retries is None else retries)
+        for attempt in range(1, attempts + 1):
+            if hedger is None:
+                json_data = await self._kickoff_and_parse(pool, crew_inputs, on_chunk)
+            else:
+                json_data = await hedger.run(
+                    lambda: self._kickoff_and_parse(pool, crew_inputs),
+                    lambda: self._hedge_kickoff(hedge_pool, crew_inputs),
+                    accept=lambda answer: answer is not None,
+                )
+            if json_data is not None or attempt == attempts:
+                break
+            # Only re-query the LLM when local repair could not recover the output
+            logger.warning("🔁 Unparseable crew output, retrying crew (%d/%d)", attempt, attempts - 1)
+            _crew_retries.inc()
+        return json_data
+
+    def _hedge_kickoff(self, pool: CalendarCrewPool, crew_inputs: Dict[str, Any]) -> Optional[Awaitable[Optional[Any]]]:
+        """Start a hedge on a crew that is free or can be built right now, or return None if there is none."""
+        call = pool.try_kickoff_async(crew_inputs)
+        if call is None:
+            return None
+        return self._parse_kickoff(call)
+
+    async def _kickoff_and_parse(
+        self,
+        pool: CalendarCrewPool,
+        crew_inputs: Dict[str, Any],
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> Optional[Any]:
+        """Run one crew call from the pool and parse its answer with _parse_crew_output()."""
+        return await self._parse_kickoff(pool.kickoff_async(crew_inputs, on_chunk=on_chunk))
+
+    async def _parse_kickoff(self, call: Awaitable[Any]) -> Optional[Any]:
+        """Await a crew call and parse its answer with _parse_crew_output()."""
+        result = await call
+        _output_tokens.inc(estimate_tokens(result.raw), format=output_format_from_env())
+        return self._parse_crew_output(result.raw)
+
+    async def _run_cascade(self, cascade: ModelCascade, crew_inputs: Dict[str, Any]) -> Optional[Any]:
+        """
+        Run the cascade's models cheapest first until one gives an answer that passes its check.
+        
+        An earlier tier's bad answer escalates instead of being retried, and
+        only the last tier streams, so no unchecked event reaches the client.
+        
+        Args:
+            cascade: Models to try and the check deciding escalation
+            crew_inputs: Inputs for the crew
+            
+        Returns:
+            The parsed answer of the first tier that passed, or the last tier's answer
+        """
+        last = len(cascade.models) - 1
+        for tier, model in enumerate(cascade.models):
+            started = time.perf_counter()
+            if tier == last:
+                json_data = await self._run_crew(get_crew_pool(model), crew_inputs, self.on_chunk)
+                escalation = None
+            else:
+                json_data = await self._run_crew(get_crew_pool(model), crew_inputs, None, retries=0)
+                escalation = cascade.check(json_data, self.state.user_input, self.state.time_zone)
+            cascade.record(model, time.perf_counter() - started, escalation)
+            if escalation is None:
+                logger.info("🪜 Answered by cascade tier %d (%s)", tier + 1, model)
+                return json_data
+            logger.info("⬆️ %s answer from %s, escalating to %s", escalation.capitalize(), model, cascade.models[tier + 1])
+        return None
+
+    def _parse_crew_output(self, raw: str) -> Optional[Any]:
+        """
+        Extract the JSON value from crew output, repairing it locally if needed.
+        
+        Compact rows are expanded into event dicts.
+        
+        Args:
+            raw: Raw crew output text
+            
+        Returns:
+            The parsed list or dict, or None if it could neither be extracted nor repaired
+        """
+        with _json_timer.time():
+            json_data = extract_json_from_text(raw)
+        if json_data is None and raw:
+            with _repair_timer.time():
+                json_data = repair_json(raw)
+            outcome = "failed" if json_data is None else "repaired"
+            _repairs.inc(outcome=outcome)
+            logger.info("🩹 Local JSON repair %s", outcome)
+        if is_compact(json_data):
+            json_data = expand_compact_events(json_data, self.state.time_zone)
+        return json_data
+
+    async def _store_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate proposed events, check them against the existing calendar and store them in state.
+        
+        Events are parsed once into CalendarEvents; invalid ones are dropped
+        and reported in state.event_errors. Duplicates and overlaps with
+        existing_event_list are handled according to CALENDAR_CONFLICT_POLICY
+        and recorded in state.conflicts. The conflict index comes from the
+        checker cache, keyed by state.user_id and state.existing_events_version.
+        
+        Args:
+            events: Events proposed by the fast path, cache or crew
+            
+        Returns:
+            The events that were kept, normalized to ISO 8601 times with UTC offsets
+        """
+        parsed, errors = validate_events(events, self.state.time_zone)
+        if errors:
+            self.state.event_errors = [error.as_dict() for error in errors]
+            _invalid_events.inc(len(events) - len(parsed))
+            for error in errors:
+                logger.warning("❌ Event %d: %s: %s", error.index, error.field or "event", error.message)
+
+        policy = conflict_policy_from_env()
+        if parsed and self.state.existing_event_list:
+            checker = await self._conflict_checker()
+            parsed, conflicts = checker.resolve(parsed, policy)
+            self.state.conflicts = [conflict.as_dict() for conflict in conflicts]
+            for conflict in conflicts:
+                action = "dropped" if conflict.dropped else "flagged"
+                logger.warning("⚠️ %s %s: %s", conflict.kind.capitalize(), action, conflict.event.summary)
+
+        events = [event.to_dict() for event in parsed]
+        self.state.events_added = events
+        return events
+
+    async def _conflict_checker(self) -> ConflictChecker:
+        """Return the conflict index of state.existing_event_list, cached by user and version."""
+        return await get_conflict_checker_cache().get(
+            self.state.existing_events_version,
+            self.state.existing_event_list,
+            self.state.time_zone,
+            self.state.user_id,
+        )
+
+    async def _accept_streamed_event(self, item: Any) -> Optional[Dict[str, Any]]:
+        """
+        Run one event parsed from streaming crew output through _store_events()'s checks.
+        
+        The event is expanded if compact, localized and validated; with an
+        existing calendar it is conflict-checked against it and against the
+        events accepted earlier in the stream. The conflict check is set up
+        on the first event and reused for the rest of the stream.
+        
+        Args:
+            item: Element of the crew's JSON array (event dict or compact row)
+            
+        Returns:
+            The event in Google Calendar dict format, or None if it is rejected
+        """
+        if is_compact(item):
+            events = expand_compact_events(item, self.state.time_zone)
+        elif isinstance(item, dict):
+            events = [item]
+        else:
+            return None
+        parsed, _ = validate_events(localize_events(events, self.state.time_zone), self.state.time_zone)
+        if not parsed:
+            return None
+
+        event = parsed[0]
+        if self.state.existing_event_list:
+            if self._conflict_stream is None:
+                self._conflict_stream = ConflictStream(await self._conflict_checker(), conflict_policy_from_env())
+            keep, _ = self._conflict_stream.resolve(event)
+            if not keep:
+                return None
+        return event.to_dict()
+
+
+def _flow_for_state(custom_state: CalendarState) -> CalendarFlow:
+    """Create a calendar flow whose state is copied from custom_state."""
+    calendar_flow = CalendarFlow()
+    calendar_flow.state.user_id = custom_state.user_id
+    calendar_flow.state.chat_history = custom_state.chat_history
+    calendar_flow.state.user_input = custom_state.user_input
+    calendar_flow.state.existing_events = custom_state.existing_events
+    calendar_flow.state.existing_event_list = custom_state.existing_event_list
+    calendar_flow.state.existing_events_version = custom_state.existing_events_version
+    calendar_flow.state.time_zone = custom_state.time_zone
+    calendar_flow.state.priority = custom_state.priority
+    return calendar_flow
+
 
 async def kickoff_with_calendar_state(custom_state: CalendarState) -> List[Dict[str, Any]]:
     """
     Create and execute a calendar flow with a custom state.
     
+    Identical requests (same user_id, user_input, recent chat history and
+    existing events) that arrive while one is running, or within
+    CALENDAR_DEDUPE_WINDOW seconds of it, share its flow and result instead
+    of starting their own; see single_flight.
+    
     Args:
         custom_state: Pre-configured CalendarState with conversation context
         
@@ -136,15 +478,29 @@ async def kickoff_with_calendar_state(custom_state: CalendarState) -> List[Dict[
         List of events that were successfully added to the calendar
         
     Raises:
+        OverloadedError: If admission control shed the request; retry later
         Exception: If flow execution fails
     """
+    single_flight = get_single_flight()
+    if single_flight is None:
+        return await _run_calendar_flow(custom_state)
+
+    context = "\x00".join((
+        history_context(custom_state.chat_history, custom_state.user_input),
+        custom_state.existing_events,
+        custom_state.existing_events_version
+        or json.dumps(custom_state.existing_event_list, sort_keys=True, default=str),
+    ))
+    key = request_key(
+        NAMESPACE_STATE, custom_state.user_id, custom_state.user_input, custom_state.time_zone, context
+    )
+    return await single_flight.do(key, lambda: _run_calendar_flow(custom_state))
+
+
+async def _run_calendar_flow(custom_state: CalendarState) -> List[Dict[str, Any]]:
+    """Body of kickoff_with_calendar_state(), without request coalescing."""
     try:
-        calendar_flow = CalendarFlow()
-        
-        # Set the custom state
-        calendar_flow.state.chat_history = custom_state.chat_history
-        calendar_flow.state.user_input = custom_state.user_input
-        calendar_flow.state.existing_events = custom_state.existing_events
+        calendar_flow = _flow_for_state(custom_state)
         
         # Execute the flow asynchronously
         await calendar_flow.kickoff_async()
@@ -152,9 +508,212 @@ async def kickoff_with_calendar_state(custom_state: CalendarState) -> List[Dict[
         # Return the events that were added
         return getattr(calendar_flow.state, 'events_added', [])
         
+    except OverloadedError:
+        raise
+    except Exception as e:
+        logger.error("❌ Error in kickoff_with_calendar_state: %s", e)
+        raise
+
+
+async def kickoff_for_user(
+    user_id: str,
+    user_input: str,
+    store: Optional[UserStateStore] = None,
+    priority: str = PRIORITY_INTERACTIVE,
+) -> List[Dict[str, Any]]:
+    """
+    Run a calendar flow for a user from their stored state.
+    
+    Chat history, existing events and time zone are loaded from the user
+    state store. Afterwards the exchange is appended to the user's history
+    and the added events to their calendar; both run on a worker thread.
+    Identical requests (same user,
+    message and recent chat history) are coalesced separately from
+    kickoff_with_calendar_state(), so a redelivered message is stored only
+    once.
+    
+    Args:
+        user_id: Stable identifier of the user, e.g. the WhatsApp number
+        user_input: The user's message
+        store: State store to use, defaults to get_state_store()
+        priority: Admission priority, "interactive" or "bulk"
+        
+    Returns:
+        List of events that were successfully added to the calendar
+        
+    Raises:
+        OverloadedError: If admission control shed the request; retry later
+        Exception: If flow execution fails (nothing is stored then)
+        
+    Example:
+        >>> await kickoff_for_user("+972501234567", "dentist tomorrow at 3pm")
+    """
+    # Opening, reading and writing the SQLite store block; keep them off the event loop
+    if store is None:
+        store = await asyncio.to_thread(get_state_store)
+    stored = await asyncio.to_thread(store.load, user_id)
+    state = CalendarState(
+        user_id=user_id,
+        user_input=user_input,
+        chat_history=stored.chat_history,
+        existing_event_list=stored.events,
+        existing_events_version=stored.events_version,
+        time_zone=stored.time_zone,
+        priority=priority,
+    )
+
+    def save(events: List[Dict[str, Any]]) -> None:
+        summary = "; ".join(f"{event['summary']} ({event['start']['dateTime']})" for event in events)
+        store.append_history(
+            user_id, f"User: {user_input}", f"Assistant: Added {summary}" if events else "Assistant: No new events"
+        )
+        store.append_events(user_id, events)
+
+    async def run_and_store() -> List[Dict[str, Any]]:
+        events = await _run_calendar_flow(state)
+        await asyncio.to_thread(save, events)
+        return events
+
+    single_flight = get_single_flight()
+    if single_flight is None:
+        return await run_and_store()
+    # The coalesced call runs the flow directly: nesting kickoff_with_calendar_state() would wait on itself
+    # Not the stored events: the first copy of a redelivered message may already have added to them
+    key = request_key(
+        NAMESPACE_USER, user_id, user_input, state.time_zone, history_context(state.chat_history, user_input)
+    )
+    return await single_flight.do(key, run_and_store)
+
+
+async def stream_with_calendar_state(custom_state: CalendarState) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of kickoff_with_calendar_state().
+    
+    The crew's output is parsed while the model is still writing it, and
+    each event is validated, conflict-checked and yielded as soon as its JSON
+    object closes, so a multi-event message shows its first event long before
+    the whole list has been generated. Events answered without the LLM (fast
+    path, response cache) are yielded when the flow finishes, as is anything
+    the incremental parser could not pick up; in total the iterator yields
+    the same events kickoff_with_calendar_state() returns.
+    
+    Args:
+        custom_state: Pre-configured CalendarState with conversation context
+        
+    Yields:
+        Events in Google Calendar dict format, in the order they are produced
+        
+    Raises:
+        Exception: If flow execution fails (after the events already yielded)
+        
+    Example:
+        >>> async for event in stream_with_calendar_state(state):
+        ...     print(event["summary"])
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+    scanner = JsonElementScanner()
+
+    def on_chunk(text: str) -> None:
+        # Runs on the crew's executor thread
+        for item in scanner.feed(text):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    calendar_flow = _flow_for_state(custom_state)
+    calendar_flow.on_chunk = on_chunk
+    started = time.perf_counter()
+    run = asyncio.ensure_future(calendar_flow.kickoff_async())
+    # Scheduled after any chunk callbacks the crew thread queued before returning
+    run.add_done_callback(lambda _: queue.put_nowait(_STREAM_DONE))
+
+    yielded: List[Dict[str, Any]] = []
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                break
+            event = await calendar_flow._accept_streamed_event(item)
+            if event is not None:
+                if not yielded:
+                    _first_event_timer.observe(time.perf_counter() - started)
+                yielded.append(event)
+                yield event
+
+        await run
+        for event in getattr(calendar_flow.state, 'events_added', []):
+            if event not in yielded:
+                if not yielded:
+                    _first_event_timer.observe(time.perf_counter() - started)
+                yielded.append(event)
+                yield event
+    except OverloadedError:
+        raise
     except Exception as e:
-        print(f"❌ Error in kickoff_with_calendar_state: {e}")
+        logger.error("❌ Error in stream_with_calendar_state: %s", e)
         raise
+    finally:
+        if not run.done():
+            run.cancel()
+
+
+async def kickoff_many(
+    states: Sequence[CalendarState],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[BatchItemResult]:
+    """
+    Run calendar flows for many states concurrently.
+    
+    At most max_concurrency flows run at once. A failing flow does not fail
+    the batch; its error is reported in the matching result instead.
+    
+    Args:
+        states: CalendarStates to process, e.g. one per incoming message
+        max_concurrency: Maximum number of flows running at the same time
+        
+    Returns:
+        List of BatchItemResult in the same order as states
+        
+    Raises:
+        ValueError: If max_concurrency is smaller than 1
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    _batch_stats.submitted += len(states)
+
+    async def run_one(index: int, state: CalendarState) -> BatchItemResult:
+        async with semaphore:
+            _batch_stats.in_flight += 1
+            started = time.perf_counter()
+            try:
+                events = await kickoff_with_calendar_state(state)
+                _batch_stats.succeeded += 1
+                return BatchItemResult(index=index, events_added=events,
+                                       duration_seconds=time.perf_counter() - started)
+            except Exception as e:
+                _batch_stats.failed += 1
+                return BatchItemResult(index=index, error=f"{type(e).__name__}: {e}",
+                                       duration_seconds=time.perf_counter() - started)
+            finally:
+                _batch_stats.in_flight -= 1
+
+    started = time.perf_counter()
+    try:
+        return list(await asyncio.gather(*(run_one(i, state) for i, state in enumerate(states))))
+    finally:
+        _batch_stats.busy_seconds += time.perf_counter() - started
+        logger.info("📦 Batch of %d finished in %.2fs", len(states), time.perf_counter() - started)
+
+
+def get_batch_stats() -> BatchStats:
+    """
+    Get a snapshot of the kickoff_many() throughput counters.
+    
+    Returns:
+        BatchStats: Copy of the cumulative counters
+    """
+    return _batch_stats.model_copy()
 
 
 def kickoff() -> None:
@@ -163,12 +722,13 @@ def kickoff() -> None:
     
     This is the main entry point for simple usage without custom state.
     """
+    configure_logging()
     try:
-        print("Starting calendar assistant...")
+        logger.info("Starting calendar assistant...")
         calendar_flow = CalendarFlow()
         calendar_flow.kickoff()
     except Exception as e:
-        print(f"Error in kickoff: {e}")
+        logger.error("Error in kickoff: %s", e)
         raise
 
 
@@ -178,17 +738,19 @@ def plot() -> None:
     
     Useful for understanding the flow diagram and debugging.
     """
+    configure_logging()
     try:
-        print("Generating flow diagram...")
+        logger.info("Generating flow diagram...")
         calendar_flow = CalendarFlow()
         calendar_flow.plot()
     except Exception as e:
-        print(f"Error generating plot: {e}")
+        logger.error("Error generating plot: %s", e)
         raise
 
 
 if __name__ == "__main__":
     # Allow direct execution of the module
-    print("Assistant Team Calendar Management")
-    print("Running default kickoff...")
+    configure_logging()
+    logger.info("Assistant Team Calendar Management")
+    logger.info("Running default kickoff...")
     kickoff()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+"""
+In-process metrics for the Assistant Team calendar flow.
+
+A small registry of counters and timers (histograms of durations) that the
+flow, crew pool and parsing code update on the hot path. The registry can be
+scraped in Prometheus text exposition format or dumped as JSON, and needs no
+third-party client library.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds) of the timer histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing count, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str = "") -> None:
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Label values of the series to increase
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Return the current value of one series (0 if never increased)."""
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self) -> List[Dict[str, Any]]:
+        """Return every series as {"labels", "value"} dicts."""
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+    def to_prometheus(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+    def reset(self) -> None:
+        """Zero every series; the counter stays registered and usable."""
+        with self._lock:
+            self._values.clear()
+
+
+class _TimerSeries:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Timer:
+    """
+    Histogram of durations in seconds, optionally split by labels.
+
+    Example:
+        >>> with get_metrics().timer("calendar_llm_call_seconds").time():
+        ...     crew.kickoff(inputs=crew_inputs)
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, _TimerSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, **labels: Any) -> None:
+        """
+        Record one duration.
+
+        Args:
+            seconds: Measured duration
+            **labels: Label values of the series to update
+        """
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _TimerSeries(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.count += 1
+            series.sum += seconds
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Context manager that observes the duration of its block, even on errors."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        """Return the number of observations of one series."""
+        series = self._series.get(_label_key(labels))
+        return series.count if series else 0
+
+    def samples(self) -> List[Dict[str, Any]]:
+        """Return every series as {"labels", "count", "sum", "buckets"} dicts with cumulative buckets."""
+        with self._lock:
+            snapshot = [(key, list(series.counts), series.count, series.sum) for key, series in self._series.items()]
+        samples = []
+        for key, counts, count, total in snapshot:
+            cumulative, running = {}, 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+            samples.append({"labels": dict(key), "count": count, "sum": total, "buckets": cumulative})
+        return samples
+
+    def to_prometheus(self) -> List[str]:
+        lines = []
+        for sample in self.samples():
+            key = _label_key(sample["labels"])
+            for bound, count in sample["buckets"].items():
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', bound))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(sample['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {sample['count']}")
+        return lines
+
+    def reset(self) -> None:
+        """Zero every series; the timer stays registered and usable."""
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Named collection of counters and timers.
+
+    Metrics are created on first use, so call sites simply ask for them by
+    name.
+
+    Example:
+        >>> metrics = get_metrics()
+        >>> metrics.counter("calendar_events_parsed_total", "Events parsed").inc(3)
+        >>> print(metrics.to_prometheus())
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, help_text: str, **kwargs: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help_text, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name!r} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        """
+        Get or create a counter.
+
+        Args:
+            name: Prometheus metric name, conventionally ending in _total
+            help_text: Description shown in the exposition output
+
+        Returns:
+            Counter: The registered counter
+
+        Raises:
+            ValueError: If the name is already used by a timer
+        """
+        return self._get_or_create(Counter, name, help_text)
+
+    def timer(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Timer:
+        """
+        Get or create a timer.
+
+        Args:
+            name: Prometheus metric name, conventionally ending in _seconds
+            help_text: Description shown in the exposition output
+            buckets: Histogram bucket upper bounds, used only on creation
+
+        Returns:
+            Timer: The registered timer
+
+        Raises:
+            ValueError: If the name is already used by a counter
+        """
+        return self._get_or_create(Timer, name, help_text, buckets=buckets)
+
+    def to_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format (0.0.4).
+
+        Returns:
+            str: Exposition text ending in a newline
+        """
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.to_prometheus())
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-friendly dict keyed by metric name."""
+        return {
+            name: {"type": metric.kind, "help": metric.help, "samples": metric.samples()}
+            for name, metric in sorted(self._metrics.items())
+        }
+
+    def to_json(self) -> str:
+        """Return as_dict() serialized as JSON."""
+        return json.dumps(self.as_dict(), indent=2)
+
+    def reset(self) -> None:
+        """
+        Zero all metrics in place.
+
+        Metrics are kept registered, so Counter and Timer objects that
+        modules hold at import time keep reporting through the registry.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry: The shared registry
+    """
+    return _default_registry
@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+"""
+Client-side rate limiting and adaptive concurrency for LLM provider calls.
+
+Without client-side limits every flow calls the provider as soon as it can.
+When the account quota runs out, all in-flight calls get 429s at once and
+the agent retries them at once too. ``ProviderLimiter`` sits in front of
+each call (see RateLimitedLLM) and combines three things:
+
+- Token buckets for requests per minute and tokens per minute. A call
+  reserves its estimated prompt plus output tokens up front and settles
+  the difference once the response is known.
+- AIMD adaptive concurrency. The number of concurrent calls grows by one
+  per window of successful calls and is halved on a 429 or a latency spike,
+  at most once per cooldown, so a burst of simultaneous 429s backs off once.
+- Retries of rate-limited calls after a jittered exponential backoff that
+  respects the provider's Retry-After, so callers do not retry in lockstep.
+
+LLM calls run on crew executor threads, so everything here blocks with
+threading primitives rather than asyncio.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from .log import get_logger
+from .metrics import get_metrics
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_MIN_CONCURRENCY = 1
+# Output tokens reserved per call before the response length is known
+DEFAULT_OUTPUT_TOKENS = 512
+DEFAULT_MAX_RETRIES = 4
+# Base of the exponential backoff between retries of a rate-limited call, in seconds
+DEFAULT_RETRY_BASE = 0.5
+# A call slower than this multiple of the latency baseline counts as a spike
+DEFAULT_LATENCY_SPIKE = 2.5
+
+_rate_limited = get_metrics().counter("calendar_llm_rate_limited_total", "Provider calls rejected with a 429")
+_limit_decreases = get_metrics().counter(
+    "calendar_llm_concurrency_decreases_total", "Adaptive concurrency back-offs by trigger"
+)
+_limiter_wait = get_metrics().timer(
+    "calendar_llm_limiter_wait_seconds", "Time LLM calls waited for the client-side limiter"
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an exception raised by an LLM client means "rate limited".
+
+    Recognizes HTTP 429 status codes (litellm, openai, httpx) and exception
+    classes named like RateLimitError.
+
+    Args:
+        error: Exception raised by an LLM call
+
+    Returns:
+        bool: True for rate-limit errors
+    """
+    for candidate in (error, getattr(error, "response", None)):
+        if getattr(candidate, "status_code", None) == 429:
+            return True
+    return "ratelimit" in type(error).__name__.lower()
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked to wait before retrying, if it said so."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    reserve() never refuses: it takes the tokens, possibly going into debt,
+    and returns how long the caller has to wait for them. Callers therefore
+    proceed in the order they reserved.
+
+    Example:
+        >>> requests = TokenBucket(per_minute=500)
+        >>> time.sleep(requests.reserve(1))
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Largest burst, defaults to one second's worth (at least 1)
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If per_minute is not positive
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket; negative while reservations are outstanding."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens and return the seconds to wait until they are covered.
+
+        Args:
+            amount: Tokens needed
+
+        Returns:
+            float: Seconds to wait, 0 if the tokens are available now
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens taken by a reservation that turned out too large (negative to charge more)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on concurrent calls.
+
+    Every successful call adds 1/limit (one slot per window of calls); a
+    429 or a latency spike multiplies the limit by ``backoff``. Decreases
+    are spaced by a cooldown of one baseline latency, so the calls that
+    were already in flight when the provider started refusing do not halve
+    the limit again each.
+
+    Example:
+        >>> concurrency = AdaptiveConcurrency(initial=4, maximum=32)
+        >>> with concurrency.slot() as call:
+        ...     response = llm.call(messages)
+        ...     call.succeeded()
+    """
+
+    def __init__(
+        self,
+        initial: float = DEFAULT_MAX_CONCURRENCY / 2,
+        minimum: float = DEFAULT_MIN_CONCURRENCY,
+        maximum: float = DEFAULT_MAX_CONCURRENCY,
+        backoff: float = 0.5,
+        latency_spike: float = DEFAULT_LATENCY_SPIKE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            initial: Starting limit
+            minimum: Lowest limit backoff goes to
+            maximum: Highest limit additive increase goes to
+            backoff: Factor applied to the limit on a 429 or a latency spike
+            latency_spike: Multiple of the latency baseline that counts as a spike, 0 to ignore latency
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If the bounds are inconsistent or backoff is not in (0, 1)
+        """
+        if not 1 <= minimum <= maximum or not 0 < backoff < 1:
+            raise ValueError("Need 1 <= minimum <= maximum and 0 < backoff < 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_spike = latency_spike
+        self.limit = min(max(initial, minimum), maximum)
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a call may start."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: Optional[float] = None, rate_limited: bool = False) -> None:
+        """
+        End a call and adapt the limit to how it went.
+
+        Args:
+            latency: Seconds the call took if it returned, None if it failed otherwise
+            rate_limited: Whether the provider answered 429
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self._decrease("rate_limited")
+            elif latency is not None:
+                if self.latency_spike and self.baseline is not None and latency > self.latency_spike * self.baseline:
+                    self._decrease("latency")
+                else:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                # Slow moving average, so a spike only nudges the baseline
+                self.baseline = latency if self.baseline is None else 0.9 * self.baseline + 0.1 * latency
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator["_CallOutcome"]:
+        """
+        Hold a slot for one call; report how it went on the yielded outcome.
+
+        Yields:
+            Outcome whose succeeded() / rate_limited() feed the limit; neither
+            (e.g. another error) releases without adapting
+        """
+        self.acquire()
+        outcome = _CallOutcome(self._clock())
+        try:
+            yield outcome
+        finally:
+            latency = self._clock() - outcome.started if outcome.ok else None
+            self.release(latency, outcome.throttled)
+
+    def _decrease(self, reason: str) -> None:
+        """Multiplicative decrease, at most once per cooldown. Caller holds the lock."""
+        now = self._clock()
+        if now - self._last_decrease < (self.baseline or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.backoff)
+        _limit_decreases.inc(reason=reason)
+        logger.info("📉 LLM concurrency limit down to %d (%s)", int(self.limit), reason)
+
+
+@dataclass
+class _CallOutcome:
+    started: float
+    ok: bool = False
+    throttled: bool = False
+
+    def succeeded(self) -> None:
+        self.ok = True
+
+    def rate_limited(self) -> None:
+        self.throttled = True
+
+
+@dataclass
+class LimiterStats:
+    """
+    Snapshot of a ProviderLimiter.
+
+    Attributes:
+        concurrency_limit: Current adaptive concurrency limit
+        in_flight: Calls currently running
+        rate_limited: 429s seen
+        retries: Calls retried after a 429
+        waited_seconds: Total time calls waited for a slot or for rate budget
+    """
+    concurrency_limit: int
+    in_flight: int
+    rate_limited: int
+    retries: int
+    waited_seconds: float
+
+
+class ProviderLimiter:
+    """
+    Rate limits, adaptive concurrency and 429 retries for one provider account.
+
+    Share one instance between every LLM client that uses the same quota.
+
+    Example:
+        >>> limiter = ProviderLimiter(requests_per_minute=500, tokens_per_minute=200_000)
+        >>> response = limiter.call(lambda: llm.call(messages), prompt_tokens=850)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        output_tokens: int = DEFAULT_OUTPUT_TOKENS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_base: float = DEFAULT_RETRY_BASE,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            requests_per_minute: Request quota, 0 for none
+            tokens_per_minute: Token quota (prompt plus output), 0 for none
+            concurrency: Adaptive limit, defaults to AdaptiveConcurrency()
+            output_tokens: Output tokens reserved per call until the response is known
+            max_retries: Retries of a rate-limited call before its 429 is raised
+            retry_base: Base of the exponential retry backoff in seconds
+            seed: Seed for the backoff jitter
+            sleep: Blocking sleep function
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = (
+            TokenBucket(tokens_per_minute, capacity=max(tokens_per_minute / 60.0, 4 * output_tokens))
+            if tokens_per_minute > 0 else None
+        )
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.output_tokens = output_tokens
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._rate_limited = 0
+        self._retries = 0
+        self._waited = 0.0
+
+    def stats(self) -> LimiterStats:
+        """Return a snapshot of the limiter's state and counters."""
+        with self._lock:
+            return LimiterStats(int(self.concurrency.limit), self.concurrency.in_flight,
+                                self._rate_limited, self._retries, self._waited)
+
+    def call(self, fn: Callable[[], str], prompt_tokens: int = 0,
+             count_tokens: Optional[Callable[[str], int]] = None) -> str:
+        """
+        Run one provider call within the limits, retrying it on 429s.
+
+        Args:
+            fn: Makes the call and returns the response text
+            prompt_tokens: Estimated prompt tokens, charged to the token bucket
+            count_tokens: Counts the response's output tokens to settle the reservation
+
+        Returns:
+            str: The response
+
+        Raises:
+            Exception: The last 429 after max_retries retries, or any other error from fn
+        """
+        for attempt in range(self.max_retries + 1):
+            reserved = prompt_tokens + self.output_tokens
+            started = time.perf_counter()
+            self._wait_for_budget(reserved)
+            with self.concurrency.slot() as outcome:
+                self._record_wait(time.perf_counter() - started)
+                try:
+                    response = fn()
+                except Exception as e:
+                    if not is_rate_limit_error(e):
+                        raise
+                    outcome.rate_limited()
+                    error = e
+                else:
+                    outcome.succeeded()
+                    if self.tokens is not None and count_tokens is not None and isinstance(response, str):
+                        self.tokens.refund(reserved - prompt_tokens - count_tokens(response))
+                    return response
+
+            _rate_limited.inc()
+            with self._lock:
+                self._rate_limited += 1
+            if attempt == self.max_retries:
+                break
+            # Full jitter, but never sooner than the provider asked for
+            delay = max(retry_after(error) or 0.0,
+                        self._random.uniform(0, self.retry_base * 2 ** attempt))
+            logger.warning("⏳ LLM provider rate limited, retrying in %.2fs (%d/%d)",
+                           delay, attempt + 1, self.max_retries)
+            with self._lock:
+                self._retries += 1
+            self._sleep(delay)
+        raise error
+
+    def _wait_for_budget(self, tokens: int) -> None:
+        """Reserve one request and `tokens` tokens and sleep until both are covered."""
+        delay = 0.0
+        if self.requests is not None:
+            delay = self.requests.reserve(1)
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+        if delay > 0:
+            self._sleep(delay)
+
+    def _record_wait(self, waited: float) -> None:
+        _limiter_wait.observe(waited)
+        with self._lock:
+            self._waited += waited
+
+
+_default_limiter: Optional[ProviderLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_provider_limiter() -> Optional[ProviderLimiter]:
+    """
+    Get the process-wide provider limiter, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_LLM_LIMITER: "on" (default) or "off"
+        CALENDAR_LLM_RPM: Requests per minute quota, 0 for none (default 0)
+        CALENDAR_LLM_TPM: Tokens per minute quota, 0 for none (default 0)
+        CALENDAR_LLM_MAX_CONCURRENCY: Upper bound of the adaptive limit (default 16)
+        CALENDAR_LLM_MIN_CONCURRENCY: Lower bound of the adaptive limit (default 1)
+        CALENDAR_LLM_MAX_RETRIES: Retries of a rate-limited call (default 4)
+
+    Returns:
+        Optional[ProviderLimiter]: The shared limiter, or None when disabled
+    """
+    global _default_limiter
+    if os.getenv("CALENDAR_LLM_LIMITER", "on").strip().lower() in ("off", "0", "false", "no"):
+        return None
+
+    if _default_limiter is None:
+        with _default_limiter_lock:
+            if _default_limiter is None:
+                maximum = float(os.getenv("CALENDAR_LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+                minimum = float(os.getenv("CALENDAR_LLM_MIN_CONCURRENCY", DEFAULT_MIN_CONCURRENCY))
+                _default_limiter = ProviderLimiter(
+                    requests_per_minute=float(os.getenv("CALENDAR_LLM_RPM", 0)),
+                    tokens_per_minute=float(os.getenv("CALENDAR_LLM_TPM", 0)),
+                    concurrency=AdaptiveConcurrency(initial=maximum / 2, minimum=minimum, maximum=maximum),
+                    max_retries=int(os.getenv("CALENDAR_LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                )
+    return _default_limiter
+
+
+def set_provider_limiter(limiter: Optional[ProviderLimiter]) -> None:
+    """
+    Replace the process-wide provider limiter.
+
+    Crews built afterwards use it. Passing None makes the next
+    get_provider_limiter() call build one from the environment again.
+
+    Args:
+        limiter: Limiter to install, or None to reset
+    """
+    global _default_limiter
+    with _default_limiter_lock:
+        _default_limiter = limiter
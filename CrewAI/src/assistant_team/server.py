@@ -0,0 +1,668 @@
+#!/usr/bin/env python
+"""
+Multi-process worker server for the calendar assistant.
+
+The in-process entry points run every flow on one core, so scaling used to
+mean running more copies of the whole host application. ``WorkerPool``
+starts worker processes that import CrewAI and build their crews once, up
+front, and then take jobs from their own multiprocessing queue and send
+the added events back. Jobs of one user always go to the same worker, so
+its single-flight layer and user state LRU keep working.
+
+``assistant_team serve`` puts a pool behind a Unix socket speaking
+newline-delimited JSON, one object per request and response::
+
+    {"id": 1, "state": {"user_id": "...", "user_input": "...", ...}}
+    {"id": 2, "user_id": "...", "user_input": "...", "priority": "bulk"}
+    {"id": 1, "events": [...]}
+    {"id": 2, "error": "...", "overloaded": true}
+
+A request with ``state`` runs kickoff_with_calendar_state() on those
+CalendarState fields; one with only ``user_id`` and ``user_input`` runs
+kickoff_for_user() against the worker's state store; ``priority`` is
+optional. Responses carry the request's ``id`` and may arrive out of order.
+``overloaded`` marks requests shed by a worker's admission control. ``WorkerClient`` speaks this
+protocol for async hosts.
+
+This module does not import CrewAI; only the workers do.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib import import_module
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .admission import PRIORITY_INTERACTIVE, OverloadedError
+from .log import configure_logging, get_logger
+from .metrics import get_metrics
+
+logger = get_logger(__name__)
+
+DEFAULT_SOCKET_PATH = "assistant_team.sock"
+# Flows each worker runs at the same time; matches the crew pool default
+DEFAULT_WORKER_CONCURRENCY = 4
+# Seconds start() waits for every worker to import CrewAI and build its crews
+DEFAULT_START_TIMEOUT = 120.0
+
+# Seconds between checks that the workers are still alive, however busy the results queue is
+_LIVENESS_INTERVAL = 0.5
+
+# Longest request or response line; a CalendarState with a large event list is one line
+_LINE_LIMIT = 2 ** 24
+
+# Job kinds
+_JOB_STATE = "state"
+_JOB_USER = "user"
+
+# Messages from workers
+_READY = "ready"
+_DONE = "done"
+_FAILED = "failed"
+_SHED = "shed"
+
+_jobs = get_metrics().counter("calendar_worker_jobs_total", "Worker pool jobs by outcome")
+_job_timer = get_metrics().timer("calendar_worker_job_seconds", "Time from submitting a job to its result")
+_restarts = get_metrics().counter("calendar_worker_restarts_total", "Worker processes restarted after exiting")
+
+
+class WorkerError(RuntimeError):
+    """A job failed in a worker, or its worker exited before answering."""
+
+
+def default_workers() -> int:
+    """Read the worker count from CALENDAR_WORKERS, defaulting to the number of CPUs."""
+    try:
+        return max(1, int(os.getenv("CALENDAR_WORKERS", "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def _worker_main(index: int, jobs: Any, results: Any, concurrency: int, quiet: bool) -> None:
+    """Entry point of a worker process: warm up, report ready, then serve jobs until None arrives."""
+    if quiet:
+        # Crews are verbose; keep their console output out of the server's stdout
+        sys.stdout = open(os.devnull, "w")
+    # Ctrl+C reaches the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Spawned workers start with a fresh interpreter, so set up logging like the parent did
+    configure_logging()
+
+    # Pay for importing the flow and building the crews before taking jobs
+    import_module(".main", __package__)
+    from .crews.calendar_crew.crew_pool import get_crew_pool
+    from .hedge import get_hedger
+    get_crew_pool().warm_up()
+    hedger = get_hedger()
+    if hedger is not None and hedger.model:
+        # Hedges only take a crew that is free right now, so have them ready too
+        get_crew_pool(hedger.model).warm_up()
+    results.put((_READY, index, None))
+    asyncio.run(_serve_jobs(jobs, results, concurrency))
+
+
+async def _serve_jobs(jobs: Any, results: Any, concurrency: int) -> None:
+    """Run up to `concurrency` jobs at a time, reading the queue on a helper thread."""
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    running: set = set()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="calendar-jobs") as reader:
+        while True:
+            await slots.acquire()
+            job = await loop.run_in_executor(reader, jobs.get)
+            if job is None:
+                break
+            task = loop.create_task(_run_job(job, results, slots))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running)
+
+
+async def _run_job(job: Tuple[int, str, Dict[str, Any]], results: Any, slots: asyncio.Semaphore) -> None:
+    """Run one job in the worker and put its outcome on the results queue."""
+    from .main import CalendarState, kickoff_for_user, kickoff_with_calendar_state
+
+    job_id, kind, payload = job
+    try:
+        if kind == _JOB_USER:
+            events = await kickoff_for_user(payload["user_id"], payload["user_input"], priority=payload["priority"])
+        else:
+            events = await kickoff_with_calendar_state(CalendarState(**payload))
+        results.put((_DONE, job_id, events))
+    except OverloadedError as e:
+        results.put((_SHED, job_id, str(e)))
+    except Exception as e:
+        results.put((_FAILED, job_id, f"{type(e).__name__}: {e}"))
+    finally:
+        slots.release()
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, index: int, process: Any, jobs: Any) -> None:
+        self.index = index
+        self.process = process
+        self.jobs = jobs
+        self.pending: Dict[int, Tuple[Future, float]] = {}
+        self.ready = threading.Event()
+        self.spawned = time.perf_counter()
+        self.startup_seconds = 0.0
+
+
+class WorkerPool:
+    """
+    Pool of pre-warmed worker processes running calendar flows.
+
+    Each worker builds its crew pool before it reports ready and runs up
+    to ``concurrency`` flows at a time. A worker that exits is restarted;
+    the jobs it had not answered fail with WorkerError.
+
+    Example:
+        >>> with WorkerPool(workers=4) as pool:
+        ...     events = await pool.kickoff({"user_id": "+972501234567", "user_input": "gym at 6pm"})
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        concurrency: int = DEFAULT_WORKER_CONCURRENCY,
+        quiet: bool = False,
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            workers: Number of worker processes, defaults to default_workers()
+            concurrency: Flows each worker runs at the same time
+            quiet: Discard the workers' stdout (CrewAI's verbose console output)
+            start_timeout: Seconds start() waits for the workers to be ready
+
+        Raises:
+            ValueError: If workers or concurrency is smaller than 1
+        """
+        workers = default_workers() if workers is None else workers
+        if workers < 1 or concurrency < 1:
+            raise ValueError("workers and concurrency must be at least 1")
+        self.size = workers
+        self.concurrency = concurrency
+        self.quiet = quiet
+        self.start_timeout = start_timeout
+        # Workers start from a fresh interpreter; forking a process with live threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._results: Any = None
+        self._workers: List[_Worker] = []
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Start the worker processes and wait until all of them are warm.
+
+        Raises:
+            WorkerError: If a worker exits while starting, e.g. on an import error
+            TimeoutError: If a worker is not ready within start_timeout
+        """
+        started = time.perf_counter()
+        self._results = self._context.Queue()
+        self._workers = [self._spawn(index) for index in range(self.size)]
+        self._dispatcher = threading.Thread(target=self._dispatch, name="calendar-worker-results", daemon=True)
+        self._dispatcher.start()
+
+        deadline = time.monotonic() + self.start_timeout
+        for worker in self._workers:
+            while not worker.ready.wait(0.1):
+                if not worker.process.is_alive():
+                    self.close()
+                    raise WorkerError(f"Calendar worker {worker.index} exited with code "
+                                      f"{worker.process.exitcode} while starting")
+                if time.monotonic() > deadline:
+                    self.close()
+                    raise TimeoutError(f"Calendar worker {worker.index} not ready after {self.start_timeout}s")
+        logger.info("🏭 %d calendar worker(s) ready in %.1fs", self.size, time.perf_counter() - started)
+
+    @property
+    def startup_seconds(self) -> List[float]:
+        """Seconds each worker took from spawning to ready: interpreter start, imports and crew builds."""
+        return [worker.startup_seconds for worker in self._workers]
+
+    def submit(self, state: Mapping[str, Any]) -> "Future[List[Dict[str, Any]]]":
+        """
+        Queue a kickoff_with_calendar_state() job.
+
+        Args:
+            state: CalendarState fields, e.g. user_id, user_input, chat_history
+
+        Returns:
+            Future resolving to the added events
+
+        Raises:
+            RuntimeError: If the pool is not running
+        """
+        return self._submit(_JOB_STATE, dict(state), str(state.get("user_id", "")))
+
+    def submit_for_user(
+        self, user_id: str, user_input: str, priority: str = PRIORITY_INTERACTIVE
+    ) -> "Future[List[Dict[str, Any]]]":
+        """
+        Queue a kickoff_for_user() job.
+
+        Args:
+            user_id: Stable identifier of the user
+            user_input: The user's message
+            priority: Admission priority, "interactive" or "bulk"
+
+        Returns:
+            Future resolving to the added events
+
+        Raises:
+            RuntimeError: If the pool is not running
+        """
+        payload = {"user_id": user_id, "user_input": user_input, "priority": priority}
+        return self._submit(_JOB_USER, payload, user_id)
+
+    async def kickoff(self, state: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run kickoff_with_calendar_state() in a worker.
+
+        Args:
+            state: CalendarState fields
+
+        Returns:
+            List of events that were successfully added
+
+        Raises:
+            OverloadedError: If the worker's admission control shed the request
+            WorkerError: If the flow failed or its worker exited
+        """
+        return await asyncio.wrap_future(self.submit(state))
+
+    async def kickoff_for_user(
+        self, user_id: str, user_input: str, priority: str = PRIORITY_INTERACTIVE
+    ) -> List[Dict[str, Any]]:
+        """
+        Run kickoff_for_user() in a worker.
+
+        Args:
+            user_id: Stable identifier of the user
+            user_input: The user's message
+            priority: Admission priority, "interactive" or "bulk"
+
+        Returns:
+            List of events that were successfully added
+
+        Raises:
+            OverloadedError: If the worker's admission control shed the request
+            WorkerError: If the flow failed or its worker exited
+        """
+        return await asyncio.wrap_future(self.submit_for_user(user_id, user_input, priority))
+
+    def close(self, timeout: float = 30.0) -> None:
+        """
+        Let the workers finish the jobs already queued, then stop them.
+
+        Jobs a worker has not answered when it stops fail with WorkerError.
+
+        Args:
+            timeout: Seconds to wait for each worker before terminating it
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.jobs.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        for worker in workers:
+            self._fail_pending(worker, "calendar worker pool closed")
+
+    def _submit(self, kind: str, payload: Dict[str, Any], user_id: str) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed or not self._workers:
+                raise RuntimeError("Calendar worker pool is not running")
+            worker = self._route(user_id)
+            job_id = next(self._job_ids)
+            worker.pending[job_id] = (future, time.perf_counter())
+            worker.jobs.put((job_id, kind, payload))
+        return future
+
+    def _route(self, user_id: str) -> _Worker:
+        """Pick the worker for a job: by user for stable affinity, else the least busy. Caller holds the lock."""
+        if user_id:
+            return self._workers[zlib.crc32(user_id.encode("utf-8")) % len(self._workers)]
+        return min(self._workers, key=lambda worker: len(worker.pending))
+
+    def _spawn(self, index: int) -> _Worker:
+        jobs = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, jobs, self._results, self.concurrency, self.quiet),
+            name=f"calendar-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        return _Worker(index, process, jobs)
+
+    def _dispatch(self) -> None:
+        """Resolve futures from worker messages and restart workers that exited."""
+        next_check = time.monotonic() + _LIVENESS_INTERVAL
+        while True:
+            try:
+                message = self._results.get(timeout=_LIVENESS_INTERVAL)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                self._handle(*message)
+
+            # On a timer rather than only when the queue goes quiet, so a busy pool notices a dead worker too
+            now = time.monotonic()
+            if message is None or now >= next_check:
+                next_check = now + _LIVENESS_INTERVAL
+                if not self._check_workers() and message is None:
+                    return
+
+    def _handle(self, kind: str, key: Any, value: Any) -> None:
+        """Apply one worker message: mark a worker ready or resolve a job's future."""
+        with self._lock:
+            if kind == _READY:
+                worker = self._workers[key]
+                worker.startup_seconds = time.perf_counter() - worker.spawned
+                worker.ready.set()
+                return
+            entry = None
+            for worker in self._workers:
+                entry = worker.pending.pop(key, None)
+                if entry is not None:
+                    break
+        if entry is None:
+            return
+        future, submitted = entry
+        _job_timer.observe(time.perf_counter() - submitted)
+        if kind == _DONE:
+            _jobs.inc(outcome="ok")
+            future.set_result(value)
+        elif kind == _SHED:
+            _jobs.inc(outcome="shed")
+            future.set_exception(OverloadedError(value))
+        else:
+            _jobs.inc(outcome="error")
+            future.set_exception(WorkerError(value))
+
+    def _check_workers(self) -> bool:
+        """Restart exited workers; return False once the pool is closed and all workers are gone."""
+        with self._lock:
+            if self._closed:
+                return any(worker.process.is_alive() for worker in self._workers)
+            # Workers that never got ready are left to start(), so a broken install does not respawn forever
+            exited = [worker for worker in self._workers
+                      if worker.ready.is_set() and not worker.process.is_alive()]
+        if not exited:
+            return True
+
+        # Results a worker sent before exiting may still be queued; apply them while it is still in the pool
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._handle(*message)
+        with self._lock:
+            for worker in exited:
+                logger.warning("⚠️ Calendar worker %d exited with code %s, restarting",
+                               worker.index, worker.process.exitcode)
+                _restarts.inc()
+                self._workers[worker.index] = self._spawn(worker.index)
+        for worker in exited:
+            # Its jobs may already have written to the user store, so they are failed rather than resent
+            self._fail_pending(worker, f"calendar worker {worker.index} exited with code {worker.process.exitcode}")
+        return True
+
+    def _fail_pending(self, worker: _Worker, reason: str) -> None:
+        with self._lock:
+            pending, worker.pending = worker.pending, {}
+        for future, _ in pending.values():
+            _jobs.inc(outcome="lost")
+            future.set_exception(WorkerError(reason))
+
+
+async def _handle_connection(pool: WorkerPool, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve one client connection; requests on it may be answered out of order."""
+    write_lock = asyncio.Lock()
+    running: set = set()
+
+    async def answer(request: Dict[str, Any]) -> None:
+        response: Dict[str, Any] = {"id": request.get("id")}
+        try:
+            if "state" in request:
+                response["events"] = await pool.kickoff(request["state"])
+            else:
+                response["events"] = await pool.kickoff_for_user(
+                    request["user_id"], request["user_input"], request.get("priority", PRIORITY_INTERACTIVE)
+                )
+        except KeyError as e:
+            response["error"] = f"Missing field {e}"
+        except OverloadedError as e:
+            response["error"] = str(e)
+            response["overloaded"] = True
+        except Exception as e:
+            response["error"] = str(e)
+        async with write_lock:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                async with write_lock:
+                    writer.write(json.dumps({"id": None, "error": f"Bad request: {e}"}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                continue
+            task = asyncio.create_task(answer(request))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        writer.close()
+        with contextlib.suppress(Exception):
+            await writer.wait_closed()
+
+
+async def serve(pool: WorkerPool, socket_path: str = DEFAULT_SOCKET_PATH,
+                stop: Optional[asyncio.Event] = None) -> None:
+    """
+    Accept requests on a Unix socket and run them on a started pool.
+
+    Args:
+        pool: Running WorkerPool
+        socket_path: Path of the Unix socket, replaced if it exists
+        stop: Event that ends serving when set; serves forever without one
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: _handle_connection(pool, reader, writer), path=socket_path, limit=_LINE_LIMIT
+    )
+    logger.info("🔌 Calendar server listening on %s", socket_path)
+    try:
+        async with server:
+            if stop is None:
+                await server.serve_forever()
+            else:
+                await stop.wait()
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+
+
+class WorkerClient:
+    """
+    Async client for ``assistant_team serve``.
+
+    One connection carries any number of concurrent requests.
+
+    Example:
+        >>> client = await WorkerClient.connect("assistant_team.sock")
+        >>> events = await client.kickoff_for_user("+972501234567", "gym at 6pm")
+        >>> await client.close()
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting: Dict[int, "asyncio.Future[List[Dict[str, Any]]]"] = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, socket_path: str = DEFAULT_SOCKET_PATH) -> "WorkerClient":
+        """Open a connection to a running server."""
+        reader, writer = await asyncio.open_unix_connection(socket_path, limit=_LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def kickoff(self, state: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run kickoff_with_calendar_state() on the server.
+
+        Args:
+            state: CalendarState fields
+
+        Returns:
+            List of events that were successfully added
+
+        Raises:
+            OverloadedError: If the server shed the request
+            WorkerError: If the flow failed or the connection was lost
+        """
+        return await self._request({"state": dict(state)})
+
+    async def kickoff_for_user(
+        self, user_id: str, user_input: str, priority: str = PRIORITY_INTERACTIVE
+    ) -> List[Dict[str, Any]]:
+        """
+        Run kickoff_for_user() on the server.
+
+        Args:
+            user_id: Stable identifier of the user
+            user_input: The user's message
+            priority: Admission priority, "interactive" or "bulk"
+
+        Returns:
+            List of events that were successfully added
+
+        Raises:
+            OverloadedError: If the server shed the request
+            WorkerError: If the flow failed or the connection was lost
+        """
+        return await self._request({"user_id": user_id, "user_input": user_input, "priority": priority})
+
+    async def close(self) -> None:
+        """Close the connection; requests still waiting fail with WorkerError."""
+        self._writer.close()
+        with contextlib.suppress(Exception):
+            await self._writer.wait_closed()
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def _request(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        request["id"] = request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def _receive(self) -> None:
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if response.get("overloaded"):
+                    future.set_exception(OverloadedError(response["error"]))
+                elif "error" in response:
+                    future.set_exception(WorkerError(response["error"]))
+                else:
+                    future.set_result(response["events"])
+        finally:
+            waiting, self._waiting = self._waiting, {}
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(WorkerError("Connection to calendar server closed"))
+
+
+def _run_server(socket_path: str, workers: Optional[int], concurrency: int, quiet: bool) -> None:
+    """Start a pool, serve until SIGINT/SIGTERM, then drain the workers."""
+    async def run(pool: WorkerPool) -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await serve(pool, socket_path, stop)
+        logger.info("🛑 Calendar server stopping")
+
+    with WorkerPool(workers, concurrency=concurrency, quiet=quiet) as pool:
+        asyncio.run(run(pool))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command-line entry point: ``assistant_team serve``.
+
+    Args:
+        argv: Arguments, defaults to sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(prog="assistant_team", description="Assistant Team calendar assistant")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Run pre-warmed worker processes behind a Unix socket")
+    serve_parser.add_argument("--socket", default=os.getenv("CALENDAR_SERVER_SOCKET", DEFAULT_SOCKET_PATH),
+                              help="Unix socket path (default: CALENDAR_SERVER_SOCKET or assistant_team.sock)")
+    serve_parser.add_argument("--workers", type=int, default=None,
+                              help="Worker processes (default: CALENDAR_WORKERS or the CPU count)")
+    serve_parser.add_argument("--concurrency", type=int,
+                              default=int(os.getenv("CALENDAR_WORKER_CONCURRENCY", DEFAULT_WORKER_CONCURRENCY)),
+                              help="Flows per worker at the same time (default: CALENDAR_WORKER_CONCURRENCY or 4)")
+    serve_parser.add_argument("--quiet", action="store_true", help="Discard CrewAI's verbose console output")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    _run_server(args.socket, args.workers, args.concurrency, args.quiet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+"""
+Single-flight coalescing of identical calendar requests.
+
+WhatsApp webhook retries and user double-sends deliver the same message
+while the first copy is still being processed. Without coordination every
+copy starts its own flow and LLM call and can write the same events twice.
+``SingleFlight`` lets the first request for a key run and hands its result
+to every identical request that arrives while it is in flight or within the
+dedupe window after it started.
+
+Failures are shared with the requests already waiting but are not kept, so
+the next identical request runs again. If the request doing the work is
+cancelled, one of those waiting runs it instead.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from .cache import normalize_user_input
+from .metrics import get_metrics
+
+DEFAULT_DEDUPE_WINDOW = 10.0  # seconds
+
+_single_flight = get_metrics().counter(
+    "calendar_single_flight_total", "Calendar requests that ran (leader) or joined an identical one (shared)"
+)
+
+
+# Key namespaces of the entry points, so they never share each other's calls
+NAMESPACE_STATE = "state"
+NAMESPACE_USER = "user"
+
+# History lines before the message that take part in the key
+DEFAULT_CONTEXT_TURNS = 4
+
+
+def request_key(namespace: str, user_id: str, user_input: str, time_zone: str = "", context: str = "") -> str:
+    """
+    Build the coalescing key of a request.
+
+    Requests match on the entry point, the user, the normalized message and
+    the conversation context, so the same words sent after a different
+    exchange, or passed in with different events, are never merged.
+
+    Args:
+        namespace: Entry point the request came through, e.g. NAMESPACE_USER
+        user_id: Stable identifier of the user, e.g. the WhatsApp number
+        user_input: Current user request
+        time_zone: IANA zone of the user
+        context: Digest source of the chat history and existing events, see history_context()
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+    for part in (namespace, user_id, normalize_user_input(user_input), time_zone, context):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def history_context(chat_history: str, user_input: str, turns: int = DEFAULT_CONTEXT_TURNS) -> str:
+    """
+    Return the part of the chat history that identifies a request.
+
+    A redelivered message can arrive after the first copy stored its
+    exchange; that exchange is left out so the copy still matches. Only the
+    last turns count, so trimming old history does not change the key.
+
+    Args:
+        chat_history: One turn per line, "User: ..." and "Assistant: ..."
+        user_input: Current user request
+        turns: History lines before the message to keep
+
+    Returns:
+        str: The last `turns` lines before the message
+    """
+    lines = chat_history.splitlines()
+    if (
+        len(lines) >= 2
+        and lines[-1].startswith("Assistant: ")
+        and lines[-2].startswith("User: ")
+        and normalize_user_input(lines[-2][len("User: "):]) == normalize_user_input(user_input)
+    ):
+        lines = lines[:-2]
+    return "\n".join(lines[-turns:]) if turns > 0 else ""
+
+
+class _LeaderCancelled(Exception):
+    """Set on a call whose leader was cancelled, so a waiting caller takes over."""
+
+
+@dataclass
+class _Call:
+    loop: asyncio.AbstractEventLoop
+    future: "asyncio.Future[Any]"
+    started: float
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    Callers that join an execution receive a deep copy of its result, so
+    they can modify it freely.
+
+    Example:
+        >>> flights = SingleFlight(window=10.0)
+        >>> key = request_key(NAMESPACE_USER, user_id, text, zone, history_context(history, text))
+        >>> events = await flights.do(key, lambda: run_flow(state))
+    """
+
+    def __init__(self, window: float = DEFAULT_DEDUPE_WINDOW, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            window: Seconds after a call started during which identical calls share
+                its result; 0 shares only while the call is in flight
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If window is negative
+        """
+        if window < 0:
+            raise ValueError("Dedupe window must not be negative")
+        self.window = window
+        self._clock = clock
+        self._calls: "OrderedDict[str, _Call]" = OrderedDict()
+        self.leaders = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn, or share the result of an identical call already made.
+
+        Args:
+            key: Identifies identical calls, see request_key()
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of fn, or a copy of the shared result
+
+        Raises:
+            Exception: Whatever fn raised, for the caller that ran it and those waiting on it
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            now = self._clock()
+            self._evict(now)
+
+            call = self._calls.get(key)
+            if call is None or call.loop is not loop or (call.future.done() and now - call.started > self.window):
+                break
+            try:
+                # A waiter being cancelled must not cancel the shared execution
+                await asyncio.shield(call.future)
+            except _LeaderCancelled:
+                # The leader's caller went away; the first waiter to wake up runs fn instead
+                continue
+            except Exception:
+                pass
+            self.shared += 1
+            _single_flight.inc(outcome="shared")
+            return copy.deepcopy(call.future.result())
+
+        call = _Call(loop, loop.create_future(), now)
+        self._calls[key] = call
+        self._calls.move_to_end(key)
+        self.leaders += 1
+        _single_flight.inc(outcome="leader")
+        try:
+            result = await fn()
+        except BaseException as e:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            # Cancelling the future would raise CancelledError in callers that were not cancelled
+            call.future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # Mark retrieved: there may be nobody waiting
+            call.future.exception()
+            raise
+        call.future.set_result(result)
+        if self.window == 0 and self._calls.get(key) is call:
+            del self._calls[key]
+        return result
+
+    def _evict(self, now: float) -> None:
+        """Drop finished calls whose window has passed, oldest first."""
+        while self._calls:
+            key, call = next(iter(self._calls.items()))
+            if not call.future.done() or now - call.started <= self.window:
+                break
+            del self._calls[key]
+
+
+_default_single_flight: Optional[SingleFlight] = None
+_default_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Get the process-wide single-flight layer, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_SINGLE_FLIGHT: "on" (default) or "off"
+        CALENDAR_DEDUPE_WINDOW: Seconds identical requests share a result (default 10)
+
+    Returns:
+        Optional[SingleFlight]: The shared instance, or None when disabled
+    """
+    global _default_single_flight
+    if os.getenv("CALENDAR_SINGLE_FLIGHT", "on").strip().lower() in ("off", "0", "false", "no"):
+        return None
+
+    if _default_single_flight is None:
+        with _default_single_flight_lock:
+            if _default_single_flight is None:
+                window = float(os.getenv("CALENDAR_DEDUPE_WINDOW", DEFAULT_DEDUPE_WINDOW))
+                _default_single_flight = SingleFlight(window=window)
+    return _default_single_flight
+
+
+def set_single_flight(single_flight: Optional[SingleFlight]) -> None:
+    """
+    Replace the process-wide single-flight layer.
+
+    Passing None makes the next get_single_flight() call build a default
+    instance again.
+
+    Args:
+        single_flight: Instance to install, or None to reset
+    """
+    global _default_single_flight
+    with _default_single_flight_lock:
+        _default_single_flight = single_flight
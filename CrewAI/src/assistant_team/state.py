@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+State models for the Assistant Team calendar management system.
+
+These models only depend on pydantic and the package's light helper
+modules, so they can be imported without pulling in CrewAI.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+from typing import List, Dict, Any, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from .admission import PRIORITIES, PRIORITY_INTERACTIVE
+from .fast_path import DEFAULT_TIMEZONE
+from .timezones import is_valid_timezone
+
+
+class CalendarState(BaseModel):
+    """
+    State model for calendar conversations.
+    
+    Attributes:
+        user_id: Stable identifier of the user (e.g. WhatsApp number), empty if unknown
+        user_input: Current user request/input
+        existing_event_list: Structured existing events, filtered by date before prompting
+        existing_events_version: Identifies the contents of existing_event_list (e.g. a sync
+            token) so its event store and conflict index are reused across requests; empty if unknown
+        events_added: List of newly created events from the conversation
+        history_tokens_saved: Prompt tokens saved by compacting chat_history
+        conflicts: Duplicates and overlaps with existing_event_list found in events_added
+        event_errors: Validation errors of proposed events that were left out of events_added
+        time_zone: IANA timezone of the user; event times are resolved in it
+        priority: "interactive" or "bulk"; decides who waits when crew calls are saturated
+    """
+    user_id: str = Field(default="", description="Stable identifier of the user")
+    chat_history: str = Field(default="", description="Previous conversation context")
+    user_input: str = Field(default="", description="Current user request")
+    existing_events: str = Field(default="", description="Current calendar events")
+    existing_event_list: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Current calendar events as structured dicts; only those relevant to user_input reach the prompt",
+    )
+    existing_events_version: str = Field(
+        default="", description="Changes whenever existing_event_list changes; empty disables index reuse"
+    )
+    events_added: List[Dict[str, Any]] = Field(default_factory=list, description="Newly created events")
+    history_tokens_saved: int = Field(default=0, description="Prompt tokens saved by compacting chat_history")
+    conflicts: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Duplicates and overlaps found in events_added"
+    )
+    event_errors: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Validation errors of proposed events that were dropped"
+    )
+    time_zone: str = Field(default=DEFAULT_TIMEZONE, description="IANA timezone of the user")
+    priority: str = Field(default=PRIORITY_INTERACTIVE, description="Admission priority: interactive or bulk")
+
+    @field_validator("time_zone")
+    @classmethod
+    def _check_time_zone(cls, value: str) -> str:
+        if not is_valid_timezone(value):
+            raise ValueError(f"Unknown IANA timezone: {value!r}")
+        return value
+
+    @field_validator("priority")
+    @classmethod
+    def _check_priority(cls, value: str) -> str:
+        if value not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {value!r}")
+        return value
+
+
+class BatchItemResult(BaseModel):
+    """
+    Outcome of one state in a kickoff_many() batch.
+    
+    Attributes:
+        index: Position of the state in the input sequence
+        events_added: Events created for the state (empty on error)
+        error: Error message if the flow failed, None on success
+        duration_seconds: Wall time spent running the flow
+    """
+    index: int = Field(description="Position of the state in the input batch")
+    events_added: List[Dict[str, Any]] = Field(default_factory=list, description="Newly created events")
+    error: Optional[str] = Field(default=None, description="Error message if the flow failed")
+    duration_seconds: float = Field(default=0.0, description="Wall time spent running the flow")
+
+    @property
+    def ok(self) -> bool:
+        """Whether the flow for this state succeeded."""
+        return self.error is None
+
+
+class BatchStats(BaseModel):
+    """
+    Cumulative throughput counters for kickoff_many().
+    
+    Attributes:
+        submitted: States handed to kickoff_many()
+        succeeded: Flows that completed successfully
+        failed: Flows that raised an error
+        in_flight: Flows currently running
+        busy_seconds: Summed wall time of all batches
+    """
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        """Flows that finished, successfully or not."""
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed flows per second of batch wall time."""
+        return self.completed / self.busy_seconds if self.busy_seconds else 0.0
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Local timezone-offset resolution for calendar events.
+
+The crew outputs naive local wall-clock times; the correct UTC offset for the
+user's IANA zone is applied here instead of asking the model to work out
+daylight saving time. Offsets are looked up in a cached per-date table: on
+the vast majority of days a zone has a single offset, so an event only pays
+for a dict lookup, and only days with a DST transition fall back to a full
+zoneinfo resolution of the exact time.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+from datetime import date, datetime, time, timedelta, timezone as fixed_timezone
+from functools import lru_cache
+from typing import Any, List, Optional
+from zoneinfo import ZoneInfo
+
+from .fast_path import DEFAULT_TIMEZONE
+
+# Number of (zone, date) offsets kept in the table
+OFFSET_TABLE_SIZE = 8192
+
+
+@lru_cache(maxsize=OFFSET_TABLE_SIZE)
+def day_offset(zone: str, day: date) -> Optional[timedelta]:
+    """
+    Return the UTC offset a zone uses for a whole day.
+
+    Args:
+        zone: IANA timezone name
+        day: Local calendar date
+
+    Returns:
+        Optional[timedelta]: The offset, or None if it changes during the day
+
+    Raises:
+        zoneinfo.ZoneInfoNotFoundError: If the zone is unknown
+    """
+    tz = ZoneInfo(zone)
+    first = datetime.combine(day, time(0, 0), tz).utcoffset()
+    last = datetime.combine(day, time(23, 59, 59), tz).utcoffset()
+    return first if first == last else None
+
+
+@lru_cache(maxsize=64)
+def _fixed_offset(offset: timedelta) -> fixed_timezone:
+    return fixed_timezone(offset)
+
+
+def precompute_offsets(zone: str, start: date, days: int = 366) -> None:
+    """
+    Fill the offset table for a range of dates ahead of time.
+
+    Args:
+        zone: IANA timezone name
+        start: First date to compute
+        days: Number of consecutive dates
+    """
+    for i in range(days):
+        day_offset(zone, start + timedelta(days=i))
+
+
+def localize(local: datetime, zone: str = DEFAULT_TIMEZONE) -> datetime:
+    """
+    Attach the correct UTC offset to a naive local wall-clock time.
+
+    Args:
+        local: Naive datetime in the zone's local time
+        zone: IANA timezone name
+
+    Returns:
+        datetime: Aware datetime with a fixed UTC offset
+
+    Raises:
+        zoneinfo.ZoneInfoNotFoundError: If the zone is unknown
+    """
+    offset = day_offset(zone, local.date())
+    if offset is None:
+        # DST transition day: resolve the exact time
+        offset = local.replace(tzinfo=ZoneInfo(zone)).utcoffset()
+    return local.replace(tzinfo=_fixed_offset(offset))
+
+
+def parse_local_time(value: str) -> Optional[datetime]:
+    """
+    Parse a model-produced dateTime as a naive local wall-clock time.
+
+    Any offset or "Z" suffix is discarded: the model is asked for local
+    times, and when it adds an offset anyway that offset is the part it
+    tends to get wrong.
+
+    Args:
+        value: ISO 8601 date-time string
+
+    Returns:
+        Optional[datetime]: Naive datetime, or None if it cannot be parsed
+    """
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if text.endswith(("Z", "z")):
+        text = text[:-1]
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=None)
+
+
+def localize_events(events: List[Any], zone: str = DEFAULT_TIMEZONE) -> List[Any]:
+    """
+    Apply the user's zone to the start and end times of crew output.
+
+    Each dateTime is read as a local wall-clock time in ``zone`` and
+    rewritten as ISO 8601 with the correct offset; timeZone is set to
+    ``zone``. Values that cannot be parsed are left untouched for the
+    validator to report.
+
+    Args:
+        events: Events in Google Calendar dict format
+        zone: IANA timezone of the user
+
+    Returns:
+        List of events with localized start and end (input is not modified)
+
+    Example:
+        >>> localize_events([{"start": {"dateTime": "2025-07-01T18:00:00"}, ...}], "Asia/Jerusalem")
+        [{'start': {'dateTime': '2025-07-01T18:00:00+03:00', 'timeZone': 'Asia/Jerusalem'}, ...}]
+    """
+    localized = []
+    for event in events:
+        if not isinstance(event, dict):
+            localized.append(event)
+            continue
+        event = dict(event)
+        for field in ("start", "end"):
+            value = event.get(field)
+            if not isinstance(value, dict):
+                continue
+            local = parse_local_time(value.get("dateTime"))
+            if local is not None:
+                event[field] = {**value, "dateTime": localize(local, zone).isoformat(), "timeZone": zone}
+        localized.append(event)
+    return localized
+
+
+def is_valid_timezone(zone: str) -> bool:
+    """Check whether a string names an IANA timezone available on this system."""
+    try:
+        ZoneInfo(zone)
+    except (KeyError, TypeError, ValueError):
+        return False
+    return True
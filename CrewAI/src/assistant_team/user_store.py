@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""
+Persistent per-user conversation state for the calendar assistant.
+
+A CalendarState only lives for one flow run, so the host server used to
+rebuild and pass in the whole chat history and calendar on every message.
+``UserStateStore`` keeps them in a local SQLite database keyed by user ID,
+behind an in-memory LRU of hot users. History turns and events are stored
+one row each, so appending a message or an event is a single INSERT and
+never re-serializes what is already stored.
+
+Events that ended more than CALENDAR_STATE_KEEP_PAST_HOURS ago are deleted
+when a user is loaded or appended to, so a long-time user's state stays the
+size of their upcoming calendar.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import itertools
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .cache import CacheStats
+from .event_store import parse_event_datetime
+from .fast_path import DEFAULT_TIMEZONE
+
+DEFAULT_STATE_PATH = "calendar_state.sqlite3"
+DEFAULT_HOT_USERS = 1024
+# Most recent turns loaded per user; compact_chat_history() trims further for the prompt
+DEFAULT_HISTORY_LIMIT = 200
+# Hours after their end that past events are kept, e.g. for "move yesterday's meeting"
+DEFAULT_KEEP_PAST_HOURS = 24.0
+
+
+@dataclass
+class UserState:
+    """
+    Stored conversation state of one user.
+
+    Attributes:
+        user_id: Stable identifier of the user
+        history: Most recent chat turns, oldest first, one line each
+        events: The user's calendar events in Google Calendar dict format
+        time_zone: IANA timezone of the user
+        events_version: Changes whenever events change, for CalendarState.existing_events_version
+    """
+    user_id: str
+    history: List[str] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    time_zone: str = DEFAULT_TIMEZONE
+    events_version: str = ""
+
+    @property
+    def chat_history(self) -> str:
+        """History in the one-turn-per-line format CalendarState.chat_history uses."""
+        return "\n".join(self.history)
+
+    def copy(self) -> "UserState":
+        """Return a copy whose lists can be modified without touching the store."""
+        return UserState(self.user_id, list(self.history), list(self.events), self.time_zone, self.events_version)
+
+
+def _sql_end(end: float) -> Optional[float]:
+    """End time as stored in events.ends_at; NULL for events that are never pruned."""
+    return None if math.isinf(end) else end
+
+
+def _one_line(turn: str) -> str:
+    return " ".join(turn.split())
+
+
+def _event_end(event: Dict[str, Any], time_zone: str) -> float:
+    """Unix time an event ends (or starts, without an end); inf if neither parses, so it is never pruned."""
+    for key in ("end", "start"):
+        parsed = parse_event_datetime(event.get(key), time_zone) if isinstance(event, dict) else None
+        if parsed is not None:
+            return parsed.timestamp()
+    return math.inf
+
+
+class UserStateStore:
+    """
+    SQLite-backed store of per-user state with an in-memory LRU front.
+
+    Thread-safe. Each process keeps its own hot users, so all messages of
+    one user should be handled by the same process.
+
+    Example:
+        >>> store = UserStateStore("calendar_state.sqlite3")
+        >>> store.append_history("+972501234567", "User: dentist tomorrow at 3pm")
+        >>> store.append_events("+972501234567", events_added)
+        >>> store.load("+972501234567").chat_history
+        'User: dentist tomorrow at 3pm'
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_STATE_PATH,
+        hot_users: int = DEFAULT_HOT_USERS,
+        history_limit: int = DEFAULT_HISTORY_LIMIT,
+        keep_past_hours: Optional[float] = DEFAULT_KEEP_PAST_HOURS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            path: SQLite file, or ":memory:" for a process-local store
+            hot_users: Number of users kept in memory
+            history_limit: Most recent turns kept per user in memory and loaded from disk
+            keep_past_hours: Hours after their end that events are kept, None to keep them forever
+            clock: Wall-clock time source in Unix seconds
+
+        Raises:
+            ValueError: If hot_users or history_limit is smaller than 1, or keep_past_hours is negative
+        """
+        if hot_users < 1 or history_limit < 1:
+            raise ValueError("hot_users and history_limit must be at least 1")
+        if keep_past_hours is not None and keep_past_hours < 0:
+            raise ValueError("keep_past_hours must not be negative")
+        self.path = path
+        self.hot_users = hot_users
+        self.history_limit = history_limit
+        self.keep_past_hours = keep_past_hours
+        self.stats = CacheStats()
+        self._clock = clock
+        self._hot: "OrderedDict[str, UserState]" = OrderedDict()
+        # End times of each hot user's events, in the order of UserState.events
+        self._ends: Dict[str, List[float]] = {}
+        # Event versions are unique per store instance, so a reloaded or recreated user never reuses one
+        self._version_prefix = uuid.uuid4().hex[:8]
+        self._versions = itertools.count()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Durable across process crashes; an OS crash may lose the last appends
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS users ("
+            " user_id TEXT PRIMARY KEY,"
+            " time_zone TEXT NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS history ("
+            " user_id TEXT NOT NULL,"
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " turn TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS history_user ON history (user_id, seq);"
+            "CREATE TABLE IF NOT EXISTS events ("
+            " user_id TEXT NOT NULL,"
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " event TEXT NOT NULL,"
+            " ends_at REAL);"
+            "CREATE INDEX IF NOT EXISTS events_user ON events (user_id, seq);"
+        )
+        self._add_event_ends()
+
+    def load(self, user_id: str) -> UserState:
+        """
+        Return a copy of a user's state, empty for unknown users.
+
+        Args:
+            user_id: Stable identifier of the user
+
+        Returns:
+            UserState: The user's history, events and time zone
+        """
+        with self._lock:
+            return self._get(user_id).copy()
+
+    def append_history(self, user_id: str, *turns: str) -> None:
+        """
+        Append chat turns to a user's history.
+
+        Newlines inside a turn are collapsed, since history is one turn per line.
+
+        Args:
+            user_id: Stable identifier of the user
+            *turns: Turns such as "User: ..." and "Assistant: ..."
+        """
+        lines = [_one_line(turn) for turn in turns if turn and turn.strip()]
+        if not lines:
+            return
+        with self._lock:
+            state = self._get(user_id)
+            self._write(
+                user_id, state,
+                "INSERT INTO history (user_id, turn) VALUES (?, ?)",
+                [(user_id, line) for line in lines],
+            )
+            state.history.extend(lines)
+            del state.history[:-self.history_limit]
+
+    def append_events(self, user_id: str, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append events to a user's calendar.
+
+        Args:
+            user_id: Stable identifier of the user
+            events: Events in Google Calendar dict format (JSON serializable)
+        """
+        events = list(events)
+        if not events:
+            return
+        with self._lock:
+            state = self._get(user_id)
+            ends = [_event_end(event, state.time_zone) for event in events]
+            self._write(
+                user_id, state,
+                "INSERT INTO events (user_id, event, ends_at) VALUES (?, ?, ?)",
+                [(user_id, json.dumps(event), _sql_end(end)) for event, end in zip(events, ends)],
+            )
+            state.events.extend(events)
+            self._ends.setdefault(user_id, []).extend(ends)
+            state.events_version = self._next_version()
+
+    def set_time_zone(self, user_id: str, time_zone: str) -> None:
+        """
+        Set a user's IANA time zone.
+
+        Args:
+            user_id: Stable identifier of the user
+            time_zone: IANA timezone name
+        """
+        with self._lock:
+            state = self._get(user_id)
+            state.time_zone = time_zone
+            self._write(user_id, state)
+
+    def delete(self, user_id: str) -> None:
+        """Forget everything stored about a user."""
+        with self._lock:
+            self._hot.pop(user_id, None)
+            self._ends.pop(user_id, None)
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for table in ("users", "history", "events"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        """Number of users with stored state."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def _get(self, user_id: str) -> UserState:
+        """Return the hot entry for a user, loading it from disk on a miss. Caller holds the lock."""
+        state = self._hot.get(user_id)
+        if state is not None:
+            self._hot.move_to_end(user_id)
+            self.stats.hits += 1
+            self._prune(user_id, state)
+            return state
+
+        self.stats.misses += 1
+        row = self._conn.execute("SELECT time_zone FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        state = UserState(user_id, time_zone=row[0] if row else DEFAULT_TIMEZONE)
+        if row:
+            turns = self._conn.execute(
+                "SELECT turn FROM history WHERE user_id = ? ORDER BY seq DESC LIMIT ?",
+                (user_id, self.history_limit),
+            ).fetchall()
+            state.history = [turn for (turn,) in reversed(turns)]
+            cutoff = self._cutoff()
+            if cutoff is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM events WHERE user_id = ? AND ends_at < ?", (user_id, cutoff))
+            rows = self._conn.execute(
+                "SELECT event, ends_at FROM events WHERE user_id = ? ORDER BY seq", (user_id,)
+            ).fetchall()
+            state.events = [json.loads(event) for event, _ in rows]
+            self._ends[user_id] = [math.inf if end is None else end for _, end in rows]
+
+        state.events_version = self._next_version()
+        self._hot[user_id] = state
+        while len(self._hot) > self.hot_users:
+            evicted, _ = self._hot.popitem(last=False)
+            self._ends.pop(evicted, None)
+            self.stats.evictions += 1
+        return state
+
+    def _cutoff(self) -> Optional[float]:
+        """Unix time before which ended events are pruned, None if they are kept."""
+        if self.keep_past_hours is None:
+            return None
+        return self._clock() - self.keep_past_hours * 3600
+
+    def _prune(self, user_id: str, state: UserState) -> None:
+        """Drop a hot user's events that ended before the cutoff. Caller holds the lock."""
+        ends = self._ends.get(user_id)
+        cutoff = self._cutoff()
+        if not ends or cutoff is None or min(ends) >= cutoff:
+            return
+        keep = [i for i, end in enumerate(ends) if end >= cutoff]
+        state.events = [state.events[i] for i in keep]
+        self._ends[user_id] = [ends[i] for i in keep]
+        with self._conn:
+            self._conn.execute("DELETE FROM events WHERE user_id = ? AND ends_at < ?", (user_id, cutoff))
+        state.events_version = self._next_version()
+
+    def _add_event_ends(self) -> None:
+        """Add and fill the events.ends_at column in databases created before it existed."""
+        columns = {name for _, name, *_ in self._conn.execute("PRAGMA table_info(events)")}
+        if "ends_at" in columns:
+            return
+        rows = self._conn.execute(
+            "SELECT seq, event, COALESCE(time_zone, ?) FROM events LEFT JOIN users USING (user_id)",
+            (DEFAULT_TIMEZONE,),
+        ).fetchall()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("ALTER TABLE events ADD COLUMN ends_at REAL")
+            self._conn.executemany(
+                "UPDATE events SET ends_at = ? WHERE seq = ?",
+                [(_sql_end(_event_end(json.loads(event), zone)), seq) for seq, event, zone in rows],
+            )
+
+    def _next_version(self) -> str:
+        return f"{self._version_prefix}-{next(self._versions)}"
+
+    def _write(self, user_id: str, state: UserState, sql: Optional[str] = None, rows: Iterable[Any] = ()) -> None:
+        """Upsert the user row and run an append in one transaction. Caller holds the lock."""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO users (user_id, time_zone, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET time_zone = excluded.time_zone, updated_at = excluded.updated_at",
+                (user_id, state.time_zone, time.time()),
+            )
+            if sql is not None:
+                self._conn.executemany(sql, rows)
+
+
+_default_store: Optional[UserStateStore] = None
+_default_store_lock = threading.Lock()
+
+
+def _keep_past_hours_from_env() -> Optional[float]:
+    value = os.getenv("CALENDAR_STATE_KEEP_PAST_HOURS", "").strip().lower()
+    if value in ("forever", "off", "none"):
+        return None
+    return float(value) if value else DEFAULT_KEEP_PAST_HOURS
+
+
+def get_state_store() -> UserStateStore:
+    """
+    Get the process-wide user state store, creating it on first use.
+
+    Configured through environment variables:
+        CALENDAR_STATE_PATH: SQLite file (default calendar_state.sqlite3, ":memory:" for none)
+        CALENDAR_STATE_HOT_USERS: Users kept in memory (default 1024)
+        CALENDAR_STATE_HISTORY_LIMIT: Most recent turns kept per user (default 200)
+        CALENDAR_STATE_KEEP_PAST_HOURS: Hours ended events are kept (default 24, "forever" to never prune)
+
+    Returns:
+        UserStateStore: The shared store
+    """
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = UserStateStore(
+                    os.getenv("CALENDAR_STATE_PATH", DEFAULT_STATE_PATH),
+                    hot_users=int(os.getenv("CALENDAR_STATE_HOT_USERS", DEFAULT_HOT_USERS)),
+                    history_limit=int(os.getenv("CALENDAR_STATE_HISTORY_LIMIT", DEFAULT_HISTORY_LIMIT)),
+                    keep_past_hours=_keep_past_hours_from_env(),
+                )
+    return _default_store
+
+
+def set_state_store(store: Optional[UserStateStore]) -> None:
+    """
+    Replace the process-wide user state store.
+
+    Passing None makes the next get_state_store() call open the configured
+    store again.
+
+    Args:
+        store: Store to install, or None to reset
+    """
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
@@ -13,12 +13,43 @@ import re
 import json
 from datetime import datetime
 from typing import Union, Dict, List, Any, Optional
+from zoneinfo import ZoneInfo
 
+from .log import get_logger
+from .wire_format import is_compact
 
-def get_current_date() -> str:
+logger = get_logger(__name__)
+
+# Fenced ```json blocks are what the model is told to answer in
+_JSON_FENCE = re.compile(r"```json[ \t]*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """
+    Load environment variables from a .env file, once per process.
+    
+    Called on first real use (flow module import, crew construction) rather
+    than at package import time, so light imports stay cheap.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def get_current_date(timezone: Optional[str] = None) -> str:
     """
     Get the current date and time in a formatted string.
     
+    Args:
+        timezone: IANA zone to report the time in, defaults to the server's local time
+        
     Returns:
         str: Current date and time in format "day: X, month: Y, year: Z, time: HH:MM AM/PM"
         
@@ -27,23 +58,315 @@ def get_current_date() -> str:
         'day: 15, month: 3, year: 2024, time: 02:30 PM'
     """
     try:
-        now = datetime.now()
+        now = datetime.now(ZoneInfo(timezone)) if timezone else datetime.now()
         return f"day: {now.day}, month: {now.month}, year: {now.year}, time: {now.strftime('%I:%M %p')}"
     except Exception as e:
         # Fallback to ISO format if formatting fails
-        print(f"⚠️ Warning: Error formatting date, using ISO format: {e}")
+        logger.warning("⚠️ Error formatting date, using ISO format: %s", e)
         return datetime.now().isoformat()
 
 
+class JsonStreamScanner:
+    """
+    Single-pass, bracket- and string-aware scanner for JSON embedded in text.
+
+    A top-level ``[`` or ``{`` not followed by something a JSON value can
+    start with (prose such as "[note]") is skipped at once. Otherwise the C
+    JSON decoder parses a value in place; a candidate it rejects before the
+    end of the text is dropped. Only a value that has not fully arrived yet
+    is walked, once, tracking bracket depth and whether it is inside a JSON
+    string, and decoded again when it closes. Prose,
+    markdown fences and inline backticks around the JSON are skipped. Text can
+    be fed in chunks, for example as tokens arrive from the LLM.
+
+    Example:
+        >>> scanner = JsonStreamScanner()
+        >>> scanner.feed('Sure! [{"summary": "Gym", "start": {"dateTime": ')
+        []
+        >>> scanner.feed('"2025-03-04T18:00:00+02:00"}}] Done.')
+        [[{'summary': 'Gym', 'start': {'dateTime': '2025-03-04T18:00:00+02:00'}}]]
+    """
+
+    _OPENERS = {"[": "]", "{": "}"}
+    _TO_CLOSERS = str.maketrans(_OPENERS)
+    _NEXT_OPENER = re.compile(r"[\[{]")
+    # What may follow an opener in JSON; rules out prose such as "[user's]" or "{carefully}"
+    _VALUE_START = re.compile(r'\[\s*(?:["\[{\]\-\d]|true|false|null)|\{\s*["}]')
+    _ONLY_SPACE = re.compile(r"\s*$")
+    # Runs of openers are pushed in one step
+    _NEXT_STRUCTURAL = re.compile(r'[\[{]+|[\]}"]')
+    _NEXT_STRING_END = re.compile(r'["\\]')
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._start = -1          # Buffer index of the open top-level value
+        self._tried_end = 0       # Buffer length when the open value was last decoded
+        self._closers: List[str] = []
+        self._in_string = False
+
+    @property
+    def pending(self) -> bool:
+        """Whether a top-level value has been opened but not yet closed."""
+        return self._start >= 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Scan the next chunk of text.
+
+        Every character is looked at a bounded number of times: an opener
+        that cannot start JSON is skipped after a short lookahead, and a
+        candidate the decoder rejects before the end of the text is dropped
+        without being walked or decoded again.
+
+        Args:
+            chunk: Next piece of the text
+
+        Returns:
+            List of JSON values (lists or dicts) completed within this chunk
+        """
+        self._buffer += chunk
+        values = []
+        buffer = self._buffer
+        pos = self._pos
+        end = len(buffer)
+
+        while pos < end:
+            if self._start < 0:
+                match = self._NEXT_OPENER.search(buffer, pos)
+                if not match:
+                    pos = end
+                    break
+                pos = match.start()
+                if not self._VALUE_START.match(buffer, pos):
+                    if self._ONLY_SPACE.match(buffer, pos + 1):
+                        # The opener's first token has not arrived yet
+                        break
+                    pos += 1
+                    continue
+                try:
+                    value, pos = self._decoder.raw_decode(buffer, pos)
+                    values.append(value)
+                    continue
+                except json.JSONDecodeError as e:
+                    if e.pos < end and not e.msg.startswith("Unterminated string"):
+                        # Invalid before the end of the text, so more text cannot fix it
+                        pos += 1
+                        continue
+                except RecursionError:
+                    pass
+                # Incomplete so far: scan this candidate bracket by bracket
+                self._start = pos
+                self._tried_end = end
+                self._closers = [self._OPENERS[buffer[pos]]]
+                pos += 1
+                continue
+
+            if self._in_string:
+                match = self._NEXT_STRING_END.search(buffer, pos)
+                if not match:
+                    pos = end
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    if pos >= end:
+                        # Escape split across chunks; resume on the backslash
+                        pos -= 1
+                        break
+                    pos += 1
+                else:
+                    self._in_string = False
+                continue
+
+            match = self._NEXT_STRUCTURAL.search(buffer, pos)
+            if not match:
+                pos = end
+                break
+            token = match.group()
+            pos = match.end()
+
+            if token == '"':
+                self._in_string = True
+            elif token[0] in self._OPENERS:
+                self._closers.extend(token.translate(self._TO_CLOSERS))
+            elif token != self._closers.pop():
+                # Mismatched bracket: not JSON, look for the next opener
+                self._start = -1
+                self._closers = []
+            elif not self._closers:
+                candidate = buffer[self._start:pos]
+                self._start = -1
+                # A span that was complete when decoded already failed once
+                if pos > self._tried_end:
+                    try:
+                        values.append(json.loads(candidate))
+                    except json.JSONDecodeError:
+                        pass
+
+        # Drop text that can no longer be part of a value
+        keep_from = self._start if self._start >= 0 else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._start >= 0:
+            self._start = 0
+            self._tried_end -= keep_from
+        return values
+
+
+class JsonElementScanner:
+    """
+    Incremental scanner that emits the elements of a JSON array as each one closes.
+
+    Where JsonStreamScanner waits for a whole top-level value, this scanner
+    tracks bracket depth and string state as text arrives and decodes every
+    object or array directly inside the first top-level array as soon as its
+    closing bracket is seen, so callers can act on the first event while the
+    model is still writing the rest. A top-level object, or an array without
+    nested elements (such as one compact row), is emitted whole when it
+    closes. Like extract_json_from_text, the first JSON value that looks like
+    events counts: arrays of scalars such as a "[1]" footnote in prose are
+    skipped, and once an answer has closed, further text is ignored.
+
+    Example:
+        >>> scanner = JsonElementScanner()
+        >>> scanner.feed('Final Answer: [{"summary": "Gym"}, {"summ')
+        [{'summary': 'Gym'}]
+        >>> scanner.feed('ary": "Dentist"}]')
+        [{'summary': 'Dentist'}]
+        >>> scanner.done
+        True
+    """
+
+    _OPENERS = {"[": "]", "{": "}"}
+    _NEXT_OPENER = re.compile(r"[\[{]")
+    _NEXT_STRUCTURAL = re.compile(r'[\[\]{}"]')
+    _NEXT_STRING_END = re.compile(r'["\\]')
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._start = -1          # Buffer index of the open top-level value
+        self._element_start = -1  # Buffer index of the open array element
+        self._closers: List[str] = []
+        self._in_string = False
+        self._emitted = 0         # Elements emitted from the open top-level value
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Scan the next chunk of text.
+
+        Args:
+            chunk: Next piece of the text, e.g. an LLM stream chunk
+
+        Returns:
+            List of values completed within this chunk, in order
+        """
+        if self.done:
+            return []
+        self._buffer += chunk
+        values = []
+        buffer = self._buffer
+        pos = self._pos
+        end = len(buffer)
+
+        while pos < end and not self.done:
+            if self._start < 0:
+                match = self._NEXT_OPENER.search(buffer, pos)
+                if not match:
+                    pos = end
+                    break
+                self._start = match.start()
+                self._closers = [self._OPENERS[match.group()]]
+                self._emitted = 0
+                pos = match.end()
+                continue
+
+            if self._in_string:
+                match = self._NEXT_STRING_END.search(buffer, pos)
+                if not match:
+                    pos = end
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    if pos >= end:
+                        # Escape split across chunks; resume on the backslash
+                        pos -= 1
+                        break
+                    pos += 1
+                else:
+                    self._in_string = False
+                continue
+
+            match = self._NEXT_STRUCTURAL.search(buffer, pos)
+            if not match:
+                pos = end
+                break
+            char = match.group()
+            pos = match.end()
+
+            if char == '"':
+                self._in_string = True
+            elif char in self._OPENERS:
+                if len(self._closers) == 1 and self._closers[0] == "]":
+                    self._element_start = match.start()
+                self._closers.append(self._OPENERS[char])
+            elif char != self._closers.pop():
+                # Mismatched bracket: not JSON, look for the next opener
+                self._start = self._element_start = -1
+                self._closers = []
+            elif self._closers:
+                if len(self._closers) == 1 and self._element_start >= 0:
+                    try:
+                        values.append(json.loads(buffer[self._element_start:pos]))
+                        self._emitted += 1
+                    except json.JSONDecodeError:
+                        pass
+                    self._element_start = -1
+            else:
+                # Top-level value closed
+                if self._emitted:
+                    self.done = True
+                else:
+                    try:
+                        value = json.loads(buffer[self._start:pos])
+                    except json.JSONDecodeError:
+                        # Prose such as "[note]"; keep looking
+                        pass
+                    else:
+                        # Prose such as "see [1]" parses too; only events end the scan
+                        if _looks_like_events(value):
+                            if value:
+                                values.append(value)
+                            self.done = True
+                self._start = -1
+
+        # Drop text that can no longer be part of a value
+        keep_from = self._start if self._start >= 0 else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._start >= 0:
+            self._start = 0
+            if self._element_start >= 0:
+                self._element_start -= keep_from
+        return values
+
+
 def extract_json_from_text(text: str) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
     """
     Extract and parse JSON data from text that may contain code blocks or raw JSON.
     
-    This function handles various formats:
-    - JSON wrapped in ```json code blocks
+    The text is scanned once with JsonStreamScanner. Values inside fenced
+    ```json blocks win over the rest of the text, and among the candidates
+    the first object or array of event objects (or compact rows) wins over
+    arrays of scalars, so a "[1]" footnote in prose is not taken for the
+    answer. This handles:
+    - JSON wrapped in ```json code blocks or inline backticks
     - Raw JSON strings
-    - JSON arrays and objects
-    - Malformed JSON with trailing characters
+    - JSON arrays and objects, including nested objects such as start/end
+    - Surrounding commentary and trailing characters
     
     Args:
         text (str): Text that may contain JSON data
@@ -57,101 +380,38 @@ def extract_json_from_text(text: str) -> Optional[Union[Dict[str, Any], List[Dic
         
         >>> extract_json_from_text('[{"event": "meeting"}]')
         [{'event': 'meeting'}]
+
+        >>> extract_json_from_text('See [1] below: [{"event": "meeting"}]')
+        [{'event': 'meeting'}]
     """
     if not text or not isinstance(text, str):
-        print("⚠️ Warning: Invalid input text for JSON extraction")
+        logger.warning("⚠️ Invalid input text for JSON extraction")
         return None
     
-    # Clean up the text
-    text = text.strip()
-    
-    # Try different extraction strategies
-    extraction_strategies = [
-        _extract_from_code_block,
-        _extract_from_json_array,
-        _extract_from_json_object,
-        _extract_raw_json
-    ]
-    
-    for strategy in extraction_strategies:
-        try:
-            result = strategy(text)
-            if result is not None:
-                return result
-        except Exception as e:
-            continue  # Try next strategy
-    
-    print("❌ extract_json_from_text(): Failed to parse JSON with all strategies")
-    return None
-
-
-def _extract_from_code_block(text: str) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
-    """Extract JSON from markdown code blocks."""
-    # Try to find JSON in code blocks
-    patterns = [
-        r'```json\s*\n(.*?)\n\s*```',  # Standard JSON code block
-        r'```\s*\n(.*?)\n\s*```',      # Generic code block
-        r'`([^`]+)`'                    # Inline code
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            json_str = match.group(1).strip()
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                continue
+    fenced = [value for block in _JSON_FENCE.findall(text) for value in JsonStreamScanner().feed(block)]
+    value = _preferred_json_value(fenced)
+    if value is None:
+        value = _preferred_json_value(JsonStreamScanner().feed(text))
+    if value is not None:
+        return value
     
+    logger.warning("❌ extract_json_from_text(): No complete JSON value found in text")
     return None
 
 
-def _extract_from_json_array(text: str) -> Optional[List[Dict[str, Any]]]:
-    """Extract JSON array starting with [."""
-    if text.startswith('['):
-        # Clean trailing characters
-        text = text.rstrip('`').rstrip()
-        try:
-            result = json.loads(text)
-            if isinstance(result, list):
-                return result
-        except json.JSONDecodeError:
-            pass
-    
-    return None
+def _looks_like_events(value: Any) -> bool:
+    """Whether a JSON value can be the model's answer: an object, or an array of objects or compact rows."""
+    if isinstance(value, dict):
+        return True
+    return isinstance(value, list) and (all(isinstance(item, dict) for item in value) or is_compact(value))
 
 
-def _extract_from_json_object(text: str) -> Optional[Dict[str, Any]]:
-    """Extract JSON object starting with {."""
-    if text.startswith('{'):
-        # Clean trailing characters
-        text = text.rstrip('`').rstrip()
-        try:
-            result = json.loads(text)
-            if isinstance(result, dict):
-                return result
-        except json.JSONDecodeError:
-            pass
-    
-    return None
-
-
-def _extract_raw_json(text: str) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
-    """Try to parse the entire text as JSON."""
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # Try to find JSON-like content with regex
-        json_pattern = r'(\[.*?\]|\{.*?\})'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-    
-    return None
+def _preferred_json_value(values: List[Any]) -> Optional[Any]:
+    """Return the first value that looks like events, else the first value, else None."""
+    for value in values:
+        if _looks_like_events(value):
+            return value
+    return values[0] if values else None
 
 
 def validate_calendar_event(event: Dict[str, Any]) -> bool:
@@ -172,14 +432,14 @@ def validate_calendar_event(event: Dict[str, Any]) -> bool:
     # Check if all required fields are present
     for field in required_fields:
         if field not in event:
-            print(f"❌ Missing required field: {field}")
+            logger.warning("❌ Missing required field: %s", field)
             return False
     
     # Validate start and end datetime structure
     for time_field in ['start', 'end']:
         time_data = event[time_field]
         if not isinstance(time_data, dict) or 'dateTime' not in time_data:
-            print(f"❌ Invalid {time_field} format")
+            logger.warning("❌ Invalid %s format", time_field)
             return False
     
     return True
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Compact wire format for calendar events emitted by the model.
+
+The full output format repeats five keys and two nested start/end objects
+with a timeZone per event, and output tokens dominate generation latency.
+In compact mode (CALENDAR_OUTPUT_FORMAT=compact) the model emits one
+positional array per event instead:
+
+    [["Dentist", "2025-03-04T15:00", "2025-03-04T16:00", "Clinic", ""]]
+
+i.e. summary, local start, local end, and optional location and
+description. ``expand_compact_events`` turns these rows back into the usual
+Google Calendar dicts before localization and validation, so everything
+downstream of the crew is unchanged.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List
+
+from .fast_path import DEFAULT_TIMEZONE
+
+OUTPUT_FULL = "full"
+OUTPUT_COMPACT = "compact"
+OUTPUT_FORMATS = (OUTPUT_FULL, OUTPUT_COMPACT)
+
+COMPACT_FIELDS = ("summary", "start", "end", "location", "description")
+
+_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+
+def output_format_from_env() -> str:
+    """Read the crew output format (CALENDAR_OUTPUT_FORMAT, "full" or "compact", default full)."""
+    value = os.getenv("CALENDAR_OUTPUT_FORMAT", OUTPUT_FULL).strip().lower()
+    return value if value in OUTPUT_FORMATS else OUTPUT_FULL
+
+
+def _is_row(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and 3 <= len(value) <= len(COMPACT_FIELDS)
+        and isinstance(value[1], str)
+        and _DATETIME_RE.match(value[1]) is not None
+    )
+
+
+def is_compact(data: Any) -> bool:
+    """
+    Check whether parsed model output is in the compact wire format.
+
+    Accepts a list of rows as well as a single bare row.
+
+    Args:
+        data: Value returned by extract_json_from_text()
+
+    Returns:
+        bool: True for compact rows, False for full event dicts or anything else
+    """
+    if not isinstance(data, list) or not data:
+        return False
+    return _is_row(data) or all(_is_row(row) for row in data)
+
+
+def _expand_time(value: Any, zone: str) -> Dict[str, Any]:
+    text = str(value).strip().replace(" ", "T", 1)
+    if len(text) == 16:
+        # Minutes precision on the wire
+        text += ":00"
+    return {"dateTime": text, "timeZone": zone}
+
+
+def expand_compact_events(data: List[Any], zone: str = DEFAULT_TIMEZONE) -> List[Dict[str, Any]]:
+    """
+    Expand compact rows into Google Calendar event dicts.
+
+    Times stay naive local times; run the result through
+    ``localize_events`` to apply UTC offsets. Rows that are not arrays are
+    passed through unchanged so the validator reports them.
+
+    Args:
+        data: A list of compact rows, or one bare row
+        zone: IANA timezone written to start/end timeZone
+
+    Returns:
+        List of event dicts with summary, start, end, location and description
+
+    Example:
+        >>> expand_compact_events([["Gym", "2025-03-04T18:00", "2025-03-04T19:30"]])
+        [{'summary': 'Gym', 'start': {'dateTime': '2025-03-04T18:00:00', 'timeZone': 'Asia/Jerusalem'}, ...}]
+    """
+    rows = [data] if _is_row(data) else data
+    events: List[Dict[str, Any]] = []
+    for row in rows:
+        if not isinstance(row, list):
+            events.append(row)
+            continue
+        padded = list(row[:len(COMPACT_FIELDS)]) + [""] * (len(COMPACT_FIELDS) - len(row))
+        summary, start, end, location, description = padded
+        events.append({
+            "summary": summary,
+            "start": _expand_time(start, zone),
+            "end": _expand_time(end, zone),
+            "location": location or "",
+            "description": description or "",
+        })
+    return events
+
+
+def to_compact(events: List[Dict[str, Any]]) -> str:
+    """
+    Serialize event dicts to the compact wire format.
+
+    Used to build recordings and to compare output sizes; empty trailing
+    location and description are dropped as the model is told to do.
+
+    Args:
+        events: Events in Google Calendar dict format
+
+    Returns:
+        str: Compact JSON text
+    """
+    rows = []
+    for event in events:
+        row = [
+            event.get("summary", ""),
+            str(event.get("start", {}).get("dateTime", ""))[:16],
+            str(event.get("end", {}).get("dateTime", ""))[:16],
+            event.get("location") or "",
+            event.get("description") or "",
+        ]
+        while len(row) > 3 and not row[-1]:
+            row.pop()
+        rows.append(row)
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,16 @@
+"""
+Shared test setup.
+
+Tests run without network access, telemetry or a real API key; crews are
+backed by local replay LLMs where one is needed.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import os
+
+os.environ.setdefault("CREWAI_TESTING", "true")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,125 @@
+"""
+Tests that crew kickoffs run off the event loop.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+
+from assistant_team.crews.calendar_crew.crew_pool import CalendarCrewPool, get_crew_pool, set_crew_pool
+from assistant_team.hedge import Hedger, set_hedger
+from assistant_team.main import CalendarState, kickoff_with_calendar_state
+
+LATENCY = 0.3
+
+_EVENT = {
+    "summary": "Stub event",
+    "start": {"dateTime": "2030-03-04T18:00:00+02:00", "timeZone": "Asia/Jerusalem"},
+    "end": {"dateTime": "2030-03-04T19:00:00+02:00", "timeZone": "Asia/Jerusalem"},
+    "location": "",
+    "description": "",
+}
+
+
+class SleepingCrew:
+    """Stand-in crew whose kickoff blocks like a real LLM round trip."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.tasks: list = []
+        self.agents: list = []
+
+    def kickoff(self, inputs: Dict[str, Any]) -> Any:
+        time.sleep(self.latency)
+        return SimpleNamespace(raw=json.dumps([_EVENT]))
+
+
+@pytest.fixture
+def crew_only(monkeypatch):
+    # Every request must reach the crew
+    monkeypatch.setenv("CALENDAR_FAST_PATH", "0")
+    monkeypatch.setenv("CALENDAR_CACHE", "off")
+    monkeypatch.setenv("CALENDAR_SINGLE_FLIGHT", "off")
+    monkeypatch.setenv("CALENDAR_ADMISSION", "off")
+
+
+@pytest.fixture
+def sleeping_crews(crew_only):
+    previous = get_crew_pool()
+    pool = CalendarCrewPool(size=4, factory=lambda: SleepingCrew(LATENCY))
+    pool.warm_up()
+    set_crew_pool(pool)
+    yield pool
+    set_crew_pool(previous)
+    pool.shutdown()
+
+
+def _state() -> CalendarState:
+    # A fresh message each time, so no cache or coalescing layer can answer it
+    return CalendarState(user_input=f"stub meeting {uuid.uuid4().hex}")
+
+
+def test_event_loop_keeps_running_during_a_kickoff(sleeping_crews):
+    async def scenario():
+        ticks = []
+        flow = asyncio.ensure_future(kickoff_with_calendar_state(_state()))
+        while not flow.done():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+        return await flow, ticks
+
+    events, ticks = asyncio.run(scenario())
+
+    assert [event["summary"] for event in events] == ["Stub event"]
+    assert ticks[-1] - ticks[0] >= LATENCY * 0.9
+    # A blocked loop would show one gap as long as the crew call
+    assert max(later - earlier for earlier, later in zip(ticks, ticks[1:])) < LATENCY / 3
+
+
+def test_concurrent_kickoffs_overlap(sleeping_crews):
+    async def scenario():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(kickoff_with_calendar_state(_state()) for _ in range(sleeping_crews.size)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(scenario())
+
+    assert all(len(events) == 1 for events in results)
+    assert elapsed < 2 * LATENCY
+
+
+def test_hedge_on_a_cold_pool_beats_a_slow_primary(crew_only):
+    slow = CalendarCrewPool(size=1, factory=lambda: SleepingCrew(1.0))
+    slow.warm_up()
+    # Nothing warms the hedge model's pool; the hedge has to build its crew
+    fast = CalendarCrewPool(size=1, factory=lambda: SleepingCrew(0.05))
+    hedger = Hedger(delay=0.1, budget=1.0, model="fast")
+    previous = get_crew_pool()
+    set_crew_pool(slow)
+    set_crew_pool(fast, "fast")
+    set_hedger(hedger)
+    try:
+        started = time.perf_counter()
+        events = asyncio.run(kickoff_with_calendar_state(_state()))
+        elapsed = time.perf_counter() - started
+    finally:
+        set_hedger(None)
+        set_crew_pool(None, "fast")
+        set_crew_pool(previous)
+
+    stats = hedger.stats()
+    assert [event["summary"] for event in events] == ["Stub event"]
+    assert (stats.hedged, stats.hedge_wins, stats.unavailable) == (1, 1, 0)
+    assert elapsed < 0.6
+    # The loser's crew call keeps running on its thread until it returns
+    slow.shutdown()
+    fast.shutdown()
+    assert slow.acquire(timeout=0) is not None
@@ -0,0 +1,34 @@
+"""
+Tests for the conflict checker cache.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+
+from assistant_team.conflicts import ConflictCheckerCache
+
+
+def _event(summary: str, start: str, end: str) -> dict:
+    return {"summary": summary, "start": {"dateTime": start}, "end": {"dateTime": end}}
+
+
+def test_users_sharing_a_version_string_get_their_own_checkers():
+    cache = ConflictCheckerCache(max_entries=8)
+    alice = [_event("Dentist", "2030-03-04T10:00:00+02:00", "2030-03-04T11:00:00+02:00")]
+    bob = [_event("Gym", "2030-03-04T18:00:00+02:00", "2030-03-04T19:00:00+02:00")]
+    proposed = [_event("Call", "2030-03-04T10:30:00+02:00", "2030-03-04T10:45:00+02:00")]
+
+    async def scenario():
+        alice_checker = await cache.get("1", alice, "Asia/Jerusalem", "alice")
+        bob_checker = await cache.get("1", bob, "Asia/Jerusalem", "bob")
+        return alice_checker, bob_checker, await cache.get("1", alice, "Asia/Jerusalem", "alice")
+
+    alice_checker, bob_checker, again = asyncio.run(scenario())
+
+    assert alice_checker is not bob_checker
+    assert again is alice_checker
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert [existing["summary"] for conflict in alice_checker.find(proposed) for existing in conflict.existing] == ["Dentist"]
+    assert bob_checker.find(proposed) == []
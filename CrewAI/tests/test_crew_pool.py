@@ -0,0 +1,57 @@
+"""
+Tests for the calendar crew pool.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import threading
+import time
+
+import pytest
+
+from assistant_team.crews.calendar_crew.crew_pool import DEFAULT_POOL_SIZE, CalendarCrewPool, get_crew_pool, set_crew_pool
+
+
+class BrokenResetCrew:
+    """Crew whose tasks cannot be reset, so the pool drops it on release."""
+
+    agents: list = []
+
+    @property
+    def tasks(self):
+        raise RuntimeError("cannot reset")
+
+
+def test_waiter_builds_a_replacement_when_a_crew_is_dropped():
+    built = []
+
+    def factory():
+        crew = BrokenResetCrew() if not built else object()
+        built.append(crew)
+        return crew
+
+    pool = CalendarCrewPool(size=1, factory=factory)
+    crew = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    # Wait until the waiter is blocked on the idle queue
+    while not pool._waiting:
+        time.sleep(0.001)
+
+    pool.release(crew)
+    waiter.join(timeout=5)
+
+    assert acquired == [built[1]]
+    assert pool.created == 1
+
+
+@pytest.mark.parametrize("value, size", [("", DEFAULT_POOL_SIZE), ("2", 2), ("two", DEFAULT_POOL_SIZE), ("0", DEFAULT_POOL_SIZE)])
+def test_pool_size_falls_back_on_bad_values(monkeypatch, value, size):
+    monkeypatch.setenv("CALENDAR_CREW_POOL_SIZE", value)
+    try:
+        # Pools build their crews lazily, so this builds nothing
+        assert get_crew_pool("size-test").size == size
+    finally:
+        set_crew_pool(None, "size-test")
@@ -0,0 +1,50 @@
+"""
+Tests for rendering and filtering existing events for the prompt.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+from assistant_team.event_store import EventStoreCache, format_events_for_prompt
+
+
+def test_prompt_times_are_shown_in_the_users_zone():
+    events = [
+        # 22:30 UTC is already the next day in Jerusalem
+        {"summary": "Late call", "start": {"dateTime": "2030-03-04T22:30:00Z"}, "end": {"dateTime": "2030-03-04T23:00:00Z"}},
+        {"summary": "Gym", "start": {"dateTime": "2030-03-05T18:00:00+02:00"}, "end": {"dateTime": "2030-03-05T19:30:00+02:00"},
+         "location": "Tel Aviv"},
+        {"summary": "Holiday", "start": {"date": "2030-03-06"}, "end": {"date": "2030-03-07"}},
+    ]
+
+    assert format_events_for_prompt(events, "Asia/Jerusalem").splitlines() == [
+        "5/3/2030 00:30-01:00: Late call",
+        "5/3/2030 18:00-19:30: Gym (Tel Aviv)",
+        "6/3/2030 00:00-00:00: Holiday",
+    ]
+
+
+def test_stores_are_cached_per_user_and_version():
+    cache = EventStoreCache(max_entries=8)
+    alice = [{"summary": "Dentist", "start": {"dateTime": "2030-03-04T10:00:00+02:00"}}]
+    bob = [{"summary": "Gym", "start": {"dateTime": "2030-03-04T18:00:00+02:00"}}]
+
+    async def scenario():
+        return (
+            await cache.get("1", alice, "Asia/Jerusalem", "alice"),
+            await cache.get("1", bob, "Asia/Jerusalem", "bob"),
+            await cache.get("1", alice, "Asia/Jerusalem", "alice"),
+            await cache.get("", alice, "Asia/Jerusalem", "alice"),
+        )
+
+    alice_store, bob_store, again, unversioned = asyncio.run(scenario())
+
+    assert again is alice_store
+    assert bob_store is not alice_store
+    assert bob_store.between(datetime(2030, 1, 1, tzinfo=timezone.utc), datetime(2031, 1, 1, tzinfo=timezone.utc)) == bob
+    # Without a version the store is built fresh and not kept
+    assert unversioned is not alice_store
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
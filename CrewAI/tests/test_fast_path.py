@@ -0,0 +1,94 @@
+"""
+Tests for the rule-based fast path: what it parses and what it must hand to the crew.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from assistant_team.fast_path import FAST_PATH_MIN_CONFIDENCE, parse_simple_request
+
+TZ = "Asia/Jerusalem"
+# A Wednesday morning
+NOW = datetime(2026, 10, 14, 10, 0, tzinfo=ZoneInfo(TZ))
+
+
+@pytest.mark.parametrize(
+    "message, summary, start, end",
+    [
+        ("dentist tomorrow at 3pm", "Dentist", "2026-10-15T15:00:00+03:00", "2026-10-15T16:00:00+03:00"),
+        ("gym 4/3 18:00-19:30", "Gym", "2027-03-04T18:00:00+02:00", "2027-03-04T19:30:00+02:00"),
+        ("call with Dana friday at 10am for 30 minutes", "Call with Dana",
+         "2026-10-16T10:00:00+03:00", "2026-10-16T10:30:00+03:00"),
+        ("dinner tonight at 8", "Dinner", "2026-10-14T20:00:00+03:00", "2026-10-14T21:00:00+03:00"),
+        ("haircut in 3 days at 17:30 for 2 hours", "Haircut",
+         "2026-10-17T17:30:00+03:00", "2026-10-17T19:30:00+03:00"),
+        ("party 1/1/27 at 21:00", "Party", "2027-01-01T21:00:00+02:00", "2027-01-01T22:00:00+02:00"),
+        ("dentist today at 11am", "Dentist", "2026-10-14T11:00:00+03:00", "2026-10-14T12:00:00+03:00"),
+    ],
+)
+def test_parses_simple_requests(message, summary, start, end):
+    result = parse_simple_request(message, now=NOW, timezone=TZ)
+
+    assert result.accepted, result.reason
+    [event] = result.events
+    assert event["summary"] == summary
+    assert event["start"] == {"dateTime": start, "timeZone": TZ}
+    assert event["end"] == {"dateTime": end, "timeZone": TZ}
+    assert set(event) == {"summary", "start", "end", "location", "description"}
+
+
+def test_bare_time_today_is_less_confident():
+    result = parse_simple_request("lunch at noon", now=NOW, timezone=TZ)
+
+    assert result.accepted
+    assert FAST_PATH_MIN_CONFIDENCE <= result.confidence < 1.0
+    assert result.events[0]["start"]["dateTime"] == "2026-10-14T12:00:00+03:00"
+
+
+def test_weekday_that_already_passed_today_means_next_week():
+    result = parse_simple_request("standup wednesday at 9am", now=NOW, timezone=TZ)
+
+    assert result.accepted
+    assert result.events[0]["start"]["dateTime"] == "2026-10-21T09:00:00+03:00"
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "",
+        "cancel the dentist tomorrow",
+        "move gym to friday at 6pm",
+        "gym every monday at 6pm",
+        "when is my dentist?",
+        "meeting tomorrow morning",
+        "lunch tomorrow at 12 and dinner at 8pm",
+        "tomorrow at 3pm",
+        "dentist tomorrow",
+        "dentist tomorrow at 3pm until 4pm for 2 hours",
+        "call tomorrow at 3pm for 0 minutes",
+        "dentist today at 9am",
+        "lunch at 8am",
+        "reunion 1/1/2020 at 12:00",
+        "party 1/1/99 at 21:00",
+        "meeting 31/2 at 10:00",
+        "gym tomorrow at 25:00",
+    ],
+)
+def test_hands_unsure_requests_to_the_crew(message):
+    result = parse_simple_request(message, now=NOW, timezone=TZ)
+
+    assert not result.accepted
+    assert result.events == []
+    assert result.reason
+
+
+def test_next_weekday_is_too_ambiguous_to_accept():
+    result = parse_simple_request("dentist next friday at 10am", now=NOW, timezone=TZ)
+
+    assert result.events
+    assert not result.accepted
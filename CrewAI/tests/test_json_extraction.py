@@ -0,0 +1,51 @@
+"""
+Tests for extracting the model's JSON answer from surrounding prose.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import pytest
+
+from assistant_team.utils import JsonElementScanner, extract_json_from_text
+
+_EVENTS = '[{"summary": "x"}]'
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        f"Note [1] below:\n```json\n{_EVENTS}\n```",
+        f"Note [1] below: {_EVENTS}",
+        f"Options [1, 2] and {{}} aside, here you go:\n```json\n{_EVENTS}\n```\nSee [3].",
+        f"```\n[1]\n```\n```json\n{_EVENTS}\n```",
+        f"{_EVENTS} as per [1]",
+    ],
+)
+def test_events_win_over_bracketed_prose(text):
+    assert extract_json_from_text(text) == [{"summary": "x"}]
+
+
+def test_fenced_json_wins_over_events_outside_the_fence():
+    text = '[{"summary": "draft"}]\nFinal:\n```json\n[{"summary": "final"}]\n```'
+
+    assert extract_json_from_text(text) == [{"summary": "final"}]
+
+
+def test_compact_rows_and_empty_answers_are_kept():
+    rows = [["Gym", "2025-03-04T18:00", "2025-03-04T19:00"]]
+
+    assert extract_json_from_text('See [1]: [["Gym", "2025-03-04T18:00", "2025-03-04T19:00"]]') == rows
+    assert extract_json_from_text("No events, see [1]: []") == []
+
+
+def test_scalar_array_is_returned_when_nothing_else_is_there():
+    assert extract_json_from_text("Only [1, 2] here") == [1, 2]
+
+
+def test_stream_scanner_skips_bracketed_prose():
+    scanner = JsonElementScanner()
+
+    assert scanner.feed("Note [1] below: [") == []
+    assert scanner.feed(_EVENTS[1:]) == [{"summary": "x"}]
+    assert scanner.done
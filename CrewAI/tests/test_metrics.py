@@ -0,0 +1,27 @@
+"""
+Tests for the in-process metrics registry.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+from assistant_team.metrics import MetricsRegistry
+
+
+def test_reset_zeroes_metrics_held_by_modules():
+    registry = MetricsRegistry()
+    # Modules keep these from import time
+    requests = registry.counter("test_requests_total")
+    latency = registry.timer("test_latency_seconds")
+    requests.inc(path="crew")
+    latency.observe(0.2)
+
+    registry.reset()
+
+    assert requests.value(path="crew") == 0
+    assert latency.count() == 0
+    requests.inc(path="crew")
+    latency.observe(0.1)
+    assert registry.counter("test_requests_total") is requests
+    assert 'test_requests_total{path="crew"} 1' in registry.to_prometheus()
+    assert registry.as_dict()["test_latency_seconds"]["samples"][0]["count"] == 1
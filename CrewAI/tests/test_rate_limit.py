@@ -0,0 +1,229 @@
+"""
+Tests for the client-side LLM rate limiter under fake clocks and 429s.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import threading
+
+import pytest
+
+from assistant_team.rate_limit import AdaptiveConcurrency, ProviderLimiter, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to; also usable as the limiter's sleep."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    """Provider 429, optionally with a Retry-After."""
+
+    status_code = 429
+
+    def __init__(self, retry_after=None) -> None:
+        super().__init__("429 Too Many Requests")
+        self.retry_after = retry_after
+
+
+def flaky(responses):
+    """Call that raises or returns the given responses in turn."""
+    calls = []
+
+    def call():
+        calls.append(1)
+        response = responses[len(calls) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return call, calls
+
+
+# Token bucket
+
+def test_bucket_serves_its_capacity_then_charges_waits():
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=60, clock=clock)
+
+    assert bucket.capacity == 1
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+
+
+def test_bucket_refills_with_time_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=600, capacity=5, clock=clock)
+    bucket.reserve(5)
+
+    clock.now += 0.3
+    assert bucket.available == pytest.approx(3.0)
+    clock.now += 60
+    assert bucket.available == pytest.approx(5.0)
+
+
+def test_bucket_refund_settles_overestimated_reservations():
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=6000, capacity=100, clock=clock)
+
+    assert bucket.reserve(150) == pytest.approx(0.5)
+    bucket.refund(40)
+    assert bucket.available == pytest.approx(-10.0)
+    assert bucket.reserve(0) == pytest.approx(0.1)
+
+
+def test_bucket_rejects_a_zero_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(per_minute=0)
+
+
+# AIMD concurrency
+
+def test_successes_add_about_one_slot_per_window():
+    concurrency = AdaptiveConcurrency(initial=4, maximum=8, clock=FakeClock())
+
+    for _ in range(4):
+        concurrency.acquire()
+        concurrency.release(latency=1.0)
+
+    assert 4.8 < concurrency.limit < 5.0
+    for _ in range(100):
+        concurrency.acquire()
+        concurrency.release(latency=1.0)
+    assert concurrency.limit == 8
+
+
+def test_burst_of_429s_halves_the_limit_once_per_cooldown():
+    clock = FakeClock()
+    concurrency = AdaptiveConcurrency(initial=8, maximum=16, clock=clock)
+    concurrency.acquire()
+    concurrency.release(latency=1.0)
+    limit = concurrency.limit
+
+    for _ in range(4):
+        concurrency.acquire()
+    for _ in range(4):
+        concurrency.release(rate_limited=True)
+    assert concurrency.limit == pytest.approx(limit / 2)
+
+    # The cooldown is one baseline latency
+    clock.now += 1.0
+    concurrency.acquire()
+    concurrency.release(rate_limited=True)
+    assert concurrency.limit == pytest.approx(limit / 4)
+
+
+def test_latency_spike_backs_off_and_limit_stays_above_minimum():
+    clock = FakeClock()
+    concurrency = AdaptiveConcurrency(initial=2, minimum=1, clock=clock)
+    concurrency.acquire()
+    concurrency.release(latency=1.0)
+    assert concurrency.limit == pytest.approx(2.5)
+
+    clock.now += 10
+    concurrency.acquire()
+    concurrency.release(latency=5.0)
+    assert concurrency.limit == pytest.approx(1.25)
+
+    clock.now += 10
+    concurrency.acquire()
+    concurrency.release(latency=5.0)
+    assert concurrency.limit == 1
+
+
+def test_acquire_blocks_at_the_limit_until_a_slot_is_released():
+    concurrency = AdaptiveConcurrency(initial=2, clock=FakeClock())
+    concurrency.acquire()
+    concurrency.acquire()
+    entered = threading.Event()
+    waiter = threading.Thread(target=lambda: (concurrency.acquire(), entered.set()), daemon=True)
+    waiter.start()
+
+    assert not entered.wait(0.1)
+    concurrency.release(latency=1.0)
+    assert entered.wait(1.0)
+    waiter.join(1.0)
+    assert concurrency.in_flight == 2
+
+
+# Provider limiter
+
+def test_limiter_retries_429s_with_backoff():
+    clock = FakeClock()
+    limiter = ProviderLimiter(concurrency=AdaptiveConcurrency(clock=clock), retry_base=0.5, seed=1,
+                              sleep=clock.sleep)
+    call, calls = flaky([RateLimitError(), RateLimitError(), "ok"])
+
+    assert limiter.call(call) == "ok"
+
+    assert len(calls) == 3
+    assert len(clock.sleeps) == 2
+    assert all(0 <= delay <= 0.5 * 2 ** attempt for attempt, delay in enumerate(clock.sleeps))
+    stats = limiter.stats()
+    assert (stats.rate_limited, stats.retries, stats.in_flight) == (2, 2, 0)
+
+
+def test_limiter_waits_at_least_retry_after():
+    clock = FakeClock()
+    limiter = ProviderLimiter(concurrency=AdaptiveConcurrency(clock=clock), seed=1, sleep=clock.sleep)
+    call, _ = flaky([RateLimitError(retry_after=7), "ok"])
+
+    assert limiter.call(call) == "ok"
+    assert clock.sleeps == [7.0]
+
+
+def test_limiter_gives_up_after_max_retries():
+    clock = FakeClock()
+    limiter = ProviderLimiter(concurrency=AdaptiveConcurrency(clock=clock), max_retries=2, seed=1,
+                              sleep=clock.sleep)
+    call, calls = flaky([RateLimitError()] * 3)
+
+    with pytest.raises(RateLimitError):
+        limiter.call(call)
+    assert len(calls) == 3
+    assert limiter.stats().in_flight == 0
+
+
+def test_limiter_does_not_retry_other_errors():
+    clock = FakeClock()
+    limiter = ProviderLimiter(concurrency=AdaptiveConcurrency(clock=clock), sleep=clock.sleep)
+    call, calls = flaky([ValueError("bad request")])
+
+    with pytest.raises(ValueError):
+        limiter.call(call)
+    assert len(calls) == 1
+    assert clock.sleeps == []
+
+
+def test_limiter_429s_shrink_concurrency():
+    clock = FakeClock()
+    concurrency = AdaptiveConcurrency(initial=8, clock=clock)
+    limiter = ProviderLimiter(concurrency=concurrency, seed=1, sleep=clock.sleep)
+    call, _ = flaky([RateLimitError(), "ok"])
+
+    limiter.call(call)
+
+    assert concurrency.limit < 8
+
+
+def test_limiter_paces_calls_to_the_request_quota():
+    sleeps = []
+    limiter = ProviderLimiter(requests_per_minute=60, sleep=sleeps.append)
+
+    limiter.call(lambda: "first")
+    limiter.call(lambda: "second")
+
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(1.0, abs=0.05)
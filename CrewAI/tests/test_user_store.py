@@ -0,0 +1,81 @@
+"""
+Tests for pruning past events from the user state store.
+
+Author: Assistant Team Developer
+License: MIT
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from assistant_team.user_store import UserStateStore
+
+NOW = datetime(2030, 3, 4, 12, 0, tzinfo=timezone.utc)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = NOW.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def event(summary, ends_in_hours):
+    end = NOW + timedelta(hours=ends_in_hours)
+    return {
+        "summary": summary,
+        "start": {"dateTime": (end - timedelta(hours=1)).isoformat()},
+        "end": {"dateTime": end.isoformat()},
+    }
+
+
+def summaries(state):
+    return [e["summary"] for e in state.events]
+
+
+def test_events_past_the_retention_are_pruned_and_the_version_changes(tmp_path):
+    clock = Clock()
+    store = UserStateStore(str(tmp_path / "state.sqlite3"), keep_past_hours=24, clock=clock)
+    store.append_events("u", [event("old", -30), event("yesterday", -5), event("soon", 5), event("later", 50)])
+
+    first = store.load("u")
+    assert summaries(first) == ["yesterday", "soon", "later"]
+    assert store.load("u").events_version == first.events_version
+
+    clock.now += 40 * 3600
+    second = store.load("u")
+    assert summaries(second) == ["later"]
+    assert second.events_version != first.events_version
+
+    reopened = UserStateStore(str(tmp_path / "state.sqlite3"), keep_past_hours=None, clock=clock)
+    assert summaries(reopened.load("u")) == ["later"]
+
+
+def test_events_without_times_are_kept_and_pruning_can_be_disabled(tmp_path):
+    store = UserStateStore(str(tmp_path / "state.sqlite3"), keep_past_hours=None, clock=Clock())
+    store.append_events("u", [event("old", -1000), {"summary": "no times"}])
+
+    assert summaries(store.load("u")) == ["old", "no times"]
+
+    pruning = UserStateStore(str(tmp_path / "state.sqlite3"), keep_past_hours=0, clock=Clock())
+    assert summaries(pruning.load("u")) == ["no times"]
+
+
+def test_databases_without_end_times_are_migrated(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE users (user_id TEXT PRIMARY KEY, time_zone TEXT NOT NULL, updated_at REAL NOT NULL);"
+        "CREATE TABLE events (user_id TEXT NOT NULL, seq INTEGER PRIMARY KEY AUTOINCREMENT, event TEXT NOT NULL);"
+    )
+    conn.execute("INSERT INTO users VALUES ('u', 'Asia/Jerusalem', 0)")
+    for old in (event("old", -48), event("soon", 5)):
+        conn.execute("INSERT INTO events (user_id, event) VALUES ('u', ?)", (json.dumps(old),))
+    conn.commit()
+    conn.close()
+
+    store = UserStateStore(path, clock=Clock())
+
+    assert summaries(store.load("u")) == ["soon"]